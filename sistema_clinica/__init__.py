@@ -0,0 +1,41 @@
+from importlib import import_module
+
+from .entidades import (DIAS_SEMANA, DURACION_TURNO, AgendaMedico, Especialidad, HistoriaClinica, Medico, Paciente,
+                        Receta, ResultadoLote, Turno, VistaConcatenada, VistaSoloLectura)
+from .nucleo import (Clinica, ClinicaException, EstadisticasClinica, IndiceBusqueda, IndiceMedicamentos,
+                     RepositorioClinica, RepositorioMemoria)
+
+# Los componentes que arrastran dependencias pesadas (sqlite3, asyncio, csv, mmap, multiprocessing, NumPy) se cargan
+# al primer uso
+_PEREZOSOS = {
+    "ArchivoTurnos": "archivo",
+    "VistaArchivo": "archivo",
+    "RepositorioSQLite": "repositorio_sqlite",
+    "PersistenciaClinica": "persistencia",
+    "ResumenTransferencia": "persistencia",
+    "DiarioOperaciones": "diario",
+    "AnaliticaClinica": "analitica",
+    "ServicioClinica": "servicio",
+    "ProcesadorLotes": "lotes",
+    "ClinicaFragmentada": "fragmentos",
+    "CacheRender": "cli",
+    "ClinicaCLI": "cli",
+}
+
+__all__ = ["DIAS_SEMANA", "DURACION_TURNO", "AgendaMedico", "Especialidad", "HistoriaClinica", "Medico", "Paciente",
+           "Receta", "ResultadoLote", "Turno", "VistaConcatenada", "VistaSoloLectura", "Clinica", "ClinicaException",
+           "EstadisticasClinica", "IndiceBusqueda", "IndiceMedicamentos", "RepositorioClinica", "RepositorioMemoria",
+           *_PEREZOSOS]
+
+
+def __getattr__(nombre: str):
+    modulo = _PEREZOSOS.get(nombre)
+    if modulo is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {nombre!r}")
+    valor = getattr(import_module(f".{modulo}", __name__), nombre)
+    globals()[nombre] = valor
+    return valor
+
+
+def __dir__():
+    return sorted(__all__)
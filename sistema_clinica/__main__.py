@@ -0,0 +1,164 @@
+import sys
+
+from .nucleo import Clinica
+from .cli import CacheRender, ClinicaCLI
+
+
+def main():
+    # Cada modo importa solo lo que necesita para que el arranque de la CLI siga siendo liviano
+    if len(sys.argv) > 1 and sys.argv[1] == "test":
+        import unittest
+        from . import pruebas
+        print("🧪 Ejecutando pruebas unitarias...")
+        print("=" * 60)
+        
+        unittest.main(module=pruebas, argv=[''], exit=False, verbosity=2)
+        
+        print("\n" + "=" * 60)
+        print("✅ Pruebas completadas")
+        return
+    
+    if len(sys.argv) > 2 and sys.argv[1] == "bench" and sys.argv[2] == "--json":
+        # bench --json [salida.json] [--comparar anterior.json]
+        import json
+        from .benchmarks import comparar_benchmarks, suite_benchmarks
+        argumentos = sys.argv[3:]
+        anterior = None
+        if len(argumentos) >= 2 and argumentos[-2] == "--comparar":
+            with open(argumentos[-1], encoding="utf-8") as archivo:
+                anterior = json.load(archivo)
+            argumentos = argumentos[:-2]
+        
+        resultado = suite_benchmarks()
+        texto = json.dumps(resultado, ensure_ascii=False, indent=2)
+        if argumentos:
+            with open(argumentos[0], "w", encoding="utf-8") as archivo:
+                archivo.write(texto + "\n")
+        else:
+            print(texto)
+        
+        if anterior is not None:
+            regresiones = comparar_benchmarks(anterior, resultado)
+            for regresion in regresiones:
+                print(f"Regresión en {regresion['operacion']} ({regresion['escala']}): "
+                      f"{regresion['anterior']} µs -> {regresion['actual']} µs (x{regresion['factor']})",
+                      file=sys.stderr)
+            sys.exit(1 if regresiones else 0)
+        return
+    
+    if len(sys.argv) > 1 and sys.argv[1] == "bench":
+        from .benchmarks import (benchmark_agendar_turno, benchmark_analitica, benchmark_archivo,
+                                 benchmark_busqueda_horarios, benchmark_busqueda_pacientes, benchmark_cache_render,
+                                 benchmark_cancelacion, benchmark_carga_masiva, benchmark_concurrencia,
+                                 benchmark_diario, benchmark_estadisticas, benchmark_fragmentos,
+                                 benchmark_indice_medicamentos, benchmark_lotes, benchmark_memoria,
+                                 benchmark_persistencia, benchmark_series, benchmark_servicio, benchmark_superposicion)
+        print("⏱️ Ejecutando benchmarks...")
+        print("=" * 60)
+        
+        benchmark_agendar_turno()
+        benchmark_carga_masiva()
+        benchmark_persistencia()
+        benchmark_memoria()
+        benchmark_concurrencia()
+        benchmark_servicio()
+        benchmark_diario()
+        benchmark_archivo()
+        benchmark_analitica()
+        benchmark_busqueda_horarios()
+        benchmark_busqueda_pacientes()
+        benchmark_cache_render()
+        benchmark_estadisticas()
+        benchmark_lotes()
+        benchmark_fragmentos()
+        benchmark_cancelacion()
+        benchmark_superposicion()
+        benchmark_series()
+        benchmark_indice_medicamentos()
+        return
+    
+    if len(sys.argv) > 1 and sys.argv[1] == "servir":
+        # servir [puerto] [--fragmentos N]
+        import asyncio
+        from .servicio import ServicioClinica
+        argumentos = sys.argv[2:]
+        clinica = None
+        if len(argumentos) >= 2 and argumentos[-2] == "--fragmentos":
+            from .fragmentos import ClinicaFragmentada
+            clinica = ClinicaFragmentada(int(argumentos[-1]))
+            argumentos = argumentos[:-2]
+        puerto = int(argumentos[0]) if argumentos else 8765
+        
+        async def servir():
+            # Con fragmentos, cada operación espera a su proceso en un hilo y el loop sigue atendiendo
+            servidor = await ServicioClinica(clinica, en_hilos=clinica is not None).servir(puerto=puerto)
+            print(f"🏥 Servicio de clínica escuchando en 127.0.0.1:{puerto}")
+            async with servidor:
+                await servidor.serve_forever()
+        
+        try:
+            asyncio.run(servir())
+        except KeyboardInterrupt:
+            print("\n👋 Servicio detenido.")
+        finally:
+            if clinica is not None:
+                clinica.cerrar()
+        return
+    
+    if len(sys.argv) > 1 and sys.argv[1] == "lote":
+        # lote [archivo|-] [--solo-errores] [--db ruta | --diario directorio]
+        from .lotes import ProcesadorLotes
+        argumentos = sys.argv[2:]
+        solo_errores = "--solo-errores" in argumentos
+        if solo_errores:
+            argumentos.remove("--solo-errores")
+        if len(argumentos) >= 2 and argumentos[-2] == "--db":
+            from .repositorio_sqlite import RepositorioSQLite
+            clinica = Clinica(RepositorioSQLite(argumentos[-1]))
+            argumentos = argumentos[:-2]
+        elif len(argumentos) >= 2 and argumentos[-2] == "--diario":
+            from .diario import DiarioOperaciones
+            clinica = Clinica.restaurar(DiarioOperaciones(argumentos[-1], operaciones_por_instantanea=100_000))
+            argumentos = argumentos[:-2]
+        else:
+            clinica = Clinica()
+        
+        try:
+            procesador = ProcesadorLotes(clinica, solo_errores=solo_errores)
+            resumen = procesador.procesar_archivo(argumentos[0] if argumentos else "-")
+        finally:
+            clinica.cerrar()
+        print(f"{resumen} - Errores: {procesador.errores}", file=sys.stderr)
+        sys.exit(1 if procesador.errores else 0)
+    
+    # [--db ruta | --diario directorio] [--cache N]: N es la capacidad de la caché de vistas
+    argumentos = sys.argv[1:]
+    capacidad_cache = CacheRender.CAPACIDAD
+    if len(argumentos) >= 2 and argumentos[-2] == "--cache":
+        capacidad_cache = int(argumentos[-1])
+        argumentos = argumentos[:-2]
+    
+    if len(argumentos) > 1 and argumentos[0] == "--db":
+        from .repositorio_sqlite import RepositorioSQLite
+        clinica = Clinica(RepositorioSQLite(argumentos[1]))
+        try:
+            ClinicaCLI(clinica, capacidad_cache=capacidad_cache).ejecutar()
+        finally:
+            clinica.cerrar()
+        return
+    
+    if len(argumentos) > 1 and argumentos[0] == "--diario":
+        from .diario import DiarioOperaciones
+        clinica = Clinica.restaurar(DiarioOperaciones(argumentos[1], operaciones_por_instantanea=10_000))
+        try:
+            ClinicaCLI(clinica, capacidad_cache=capacidad_cache).ejecutar()
+        finally:
+            clinica.cerrar()
+        return
+    
+    cli = ClinicaCLI(capacidad_cache=capacidad_cache)
+    cli.ejecutar()
+
+
+if __name__ == "__main__":
+    main()
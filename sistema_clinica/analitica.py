@@ -0,0 +1,130 @@
+from datetime import timedelta
+from typing import List, Dict, Optional, Tuple
+
+try:
+    import numpy as np
+except ImportError:  # NumPy solo es necesario para el módulo de análisis
+    np = None
+
+from .entidades import DURACION_TURNO
+from .nucleo import Clinica
+from .archivo import ArchivoTurnos
+
+
+class AnaliticaClinica:
+    # Columnas NumPy construidas una sola vez; cada reporte es un group-by vectorizado sobre ellas
+    MICROSEGUNDOS_POR_DIA = 86_400 * 10 ** 6
+    
+    def __init__(self, marcas, medicos, especialidades, matriculas: List[str], tipos: List[str],
+                 medicamentos=None, nombres_medicamentos: Optional[List[str]] = None, duraciones=None):
+        if np is None:
+            raise ImportError("El módulo de análisis requiere NumPy")
+        marcas = np.asarray(marcas, dtype=np.int64)
+        medicos = np.asarray(medicos, dtype=np.int32)
+        # Se ordena una sola vez por (médico, fecha): los reportes ya no necesitan ordenar
+        orden = self._ordenar_por_medico_y_fecha(marcas, medicos)
+        self.__marcas = marcas[orden]
+        self.__medicos = medicos[orden]
+        self.__especialidades = np.asarray(especialidades, dtype=np.int32)[orden]
+        # Duración de cada turno en microsegundos; sin la columna todos duran lo que un turno por defecto
+        if duraciones is None:
+            self.__duraciones = np.full(len(marcas), DURACION_TURNO // ArchivoTurnos.MICROSEGUNDO, dtype=np.int64)
+        else:
+            self.__duraciones = np.asarray(duraciones, dtype=np.int64)[orden]
+        self.__dias = self.__marcas // self.MICROSEGUNDOS_POR_DIA
+        self.__matriculas = list(matriculas)
+        self.__tipos = list(tipos)
+        self.__medicamentos = np.asarray(medicamentos if medicamentos is not None else [], dtype=np.int32)
+        self.__nombres_medicamentos = list(nombres_medicamentos or [])
+    
+    @classmethod
+    def desde_clinica(cls, clinica: Clinica) -> 'AnaliticaClinica':
+        if np is None:
+            raise ImportError("El módulo de análisis requiere NumPy")
+        turnos = clinica.obtener_turnos()
+        id_matricula = {}
+        id_tipo = {}
+        marcas = np.fromiter(((turno.fecha_hora - ArchivoTurnos.EPOCA) // ArchivoTurnos.MICROSEGUNDO
+                              for turno in turnos), dtype=np.int64, count=len(turnos))
+        medicos = np.fromiter((id_matricula.setdefault(turno.medico.obtener_matricula(), len(id_matricula))
+                               for turno in turnos), dtype=np.int32, count=len(turnos))
+        especialidades = np.fromiter((id_tipo.setdefault(turno.especialidad, len(id_tipo)) for turno in turnos),
+                                     dtype=np.int32, count=len(turnos))
+        duraciones = np.fromiter((turno.duracion // ArchivoTurnos.MICROSEGUNDO for turno in turnos), dtype=np.int64,
+                                 count=len(turnos))
+        
+        id_medicamento = {}
+        medicamentos = np.fromiter(
+            (id_medicamento.setdefault(medicamento, len(id_medicamento))
+             for paciente in clinica.obtener_pacientes()
+             for receta in clinica.obtener_historia_clinica(paciente.obtener_dni()).obtener_recetas()
+             for medicamento in receta.medicamentos),
+            dtype=np.int32,
+        )
+        return cls(marcas, medicos, especialidades, list(id_matricula), list(id_tipo),
+                   medicamentos, list(id_medicamento), duraciones)
+    
+    def ocupacion_por_medico_y_dia(self) -> Dict[str, Tuple[int, ...]]:
+        # El 1/1/1970 fue jueves: (días + 3) % 7 da el día de la semana con lunes = 0
+        dias_semana = (self.__dias + 3) % 7
+        conteo = np.bincount(self.__medicos * 7 + dias_semana, minlength=len(self.__matriculas) * 7).reshape(-1, 7)
+        return {matricula: tuple(conteo[i].tolist()) for i, matricula in enumerate(self.__matriculas)}
+    
+    def turnos_por_especialidad_y_mes(self) -> Dict[Tuple[str, str], int]:
+        if not len(self.__marcas):
+            return {}
+        # Tabla día -> mes para el rango de fechas presente: evita convertir cada turno a datetime64
+        primer_dia = int(self.__dias.min())
+        tabla_meses = np.arange(primer_dia, int(self.__dias.max()) + 1).astype("datetime64[D]")
+        meses = tabla_meses.astype("datetime64[M]").astype(np.int64)[self.__dias - primer_dia]
+        primer_mes = int(meses.min())
+        cantidad_meses = int(meses.max()) - primer_mes + 1
+        conteo = np.bincount(self.__especialidades.astype(np.int64) * cantidad_meses + (meses - primer_mes),
+                             minlength=len(self.__tipos) * cantidad_meses).reshape(-1, cantidad_meses)
+        
+        resultado = {}
+        for tipo, mes in zip(*np.nonzero(conteo)):
+            anio, numero_mes = divmod(primer_mes + int(mes), 12)
+            resultado[(self.__tipos[tipo], f"{1970 + anio:04d}-{numero_mes + 1:02d}")] = int(conteo[tipo, mes])
+        return resultado
+    
+    def huecos_por_medico(self, intervalo: Optional[timedelta] = None) -> Dict[str, Tuple[int, timedelta]]:
+        # Huecos entre el final de un turno y el comienzo del siguiente, del mismo médico y el mismo día; con
+        # intervalo se supone que todos los turnos duran eso en lugar de su duración propia
+        medicos = self.__medicos
+        dias = self.__dias
+        if intervalo is None:
+            finales = self.__marcas[:-1] + self.__duraciones[:-1]
+        else:
+            finales = self.__marcas[:-1] + intervalo // ArchivoTurnos.MICROSEGUNDO
+        libres = self.__marcas[1:] - finales
+        huecos = (medicos[1:] == medicos[:-1]) & (dias[1:] == dias[:-1]) & (libres > 0)
+        
+        medicos_con_hueco = medicos[1:][huecos]
+        cantidades = np.bincount(medicos_con_hueco, minlength=len(self.__matriculas))
+        tiempo_libre = np.bincount(medicos_con_hueco, weights=libres[huecos], minlength=len(self.__matriculas))
+        return {matricula: (int(cantidades[i]), timedelta(microseconds=int(tiempo_libre[i])))
+                for i, matricula in enumerate(self.__matriculas)}
+    
+    def medicamentos_mas_recetados(self, cantidad: int = 10) -> List[Tuple[str, int]]:
+        conteo = np.bincount(self.__medicamentos, minlength=len(self.__nombres_medicamentos))
+        mas_recetados = np.argsort(-conteo, kind="stable")[:cantidad]
+        return [(self.__nombres_medicamentos[i], int(conteo[i])) for i in mas_recetados if conteo[i]]
+    
+    def __len__(self) -> int:
+        return len(self.__marcas)
+    
+    @staticmethod
+    def _ordenar_por_medico_y_fecha(marcas, medicos):
+        if not len(marcas):
+            return np.arange(0)
+        desplazadas = marcas - marcas.min()
+        rango = int(desplazadas.max()) + 1
+        if rango * (int(medicos.max()) + 1) >= 2 ** 63:
+            return np.lexsort((marcas, medicos))
+        # Una sola clave int64 se ordena mucho más rápido que lexsort sobre dos columnas
+        return np.argsort(medicos.astype(np.int64) * rango + desplazadas)
+    
+    def __str__(self) -> str:
+        return (f"Análisis de la clínica - Turnos: {len(self.__marcas)}, "
+                f"Medicamentos recetados: {len(self.__medicamentos)}")
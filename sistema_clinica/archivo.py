@@ -0,0 +1,249 @@
+from array import array
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+from datetime import datetime, timedelta
+from typing import List, Dict, Optional, Iterable, Tuple
+import json
+import mmap
+import os
+import sys
+
+from .entidades import Turno, VistaSoloLectura
+
+
+class ArchivoTurnos:
+    # Formato columnar: encabezado, columnas de ancho fijo alineadas a 8 bytes y una tabla de cadenas en JSON.
+    # La versión 2 agrega al final la columna de ids de turno; los archivos de la versión 1 se siguen leyendo
+    MAGICO = b"TURNOS02"
+    MAGICO_SIN_IDS = b"TURNOS01"
+    ENCABEZADO = 8 + 8 * 5
+    EPOCA = datetime(1970, 1, 1)
+    MICROSEGUNDO = timedelta(microseconds=1)
+    
+    def __init__(self, ruta: str, obtener_paciente, obtener_medico):
+        self.__obtener_paciente = obtener_paciente
+        self.__obtener_medico = obtener_medico
+        with open(ruta, "rb") as archivo:
+            self.__mapa = mmap.mmap(archivo.fileno(), 0, access=mmap.ACCESS_READ)
+        
+        datos = memoryview(self.__mapa)
+        if datos[:8] not in (self.MAGICO, self.MAGICO_SIN_IDS):
+            raise ValueError(f"{ruta} no es un archivo de turnos")
+        con_ids = datos[:8] == self.MAGICO
+        cantidad, pacientes, medicos, especialidades, largo_tabla = datos[8:self.ENCABEZADO].cast("q")
+        self.__cantidad = cantidad
+        
+        columnas = {}
+        fin_columnas = self.ENCABEZADO
+        for nombre, (inicio, formato, largo) in self._disposicion(cantidad, pacientes, medicos, con_ids).items():
+            fin_columnas = inicio + largo * array(formato).itemsize
+            columnas[nombre] = datos[inicio:fin_columnas].cast(formato)
+        self.__fechas = columnas["fechas"]
+        self.__pacientes = columnas["pacientes"]
+        self.__medicos = columnas["medicos"]
+        self.__especialidades = columnas["especialidades"]
+        self.__por_medico = columnas["por_medico"]
+        self.__inicio_medico = columnas["inicio_medico"]
+        self.__por_paciente = columnas["por_paciente"]
+        self.__inicio_paciente = columnas["inicio_paciente"]
+        self.__ids = columnas.get("ids")
+        
+        # Las cadenas se cargan una sola vez: su cantidad depende de pacientes y médicos, no de los turnos
+        tabla = json.loads(bytes(datos[fin_columnas:fin_columnas + largo_tabla]).decode("utf-8"))
+        self.__dnis, self.__matriculas, self.__tipos = tabla
+        self.__tipos = [sys.intern(tipo) for tipo in self.__tipos]
+    
+    @classmethod
+    def escribir(cls, ruta: str, filas: List[Tuple[str, str, str, datetime, Optional[int]]],
+                 anterior: Optional['ArchivoTurnos'] = None):
+        # Los turnos de un archivo anterior van primero y se copian columna por columna, traduciendo solo los índices
+        # de las tablas de cadenas, sin armar una tupla por cada fila ya archivada
+        dnis = sorted({fila[0] for fila in filas}.union(anterior.__dnis if anterior else ()))
+        matriculas = sorted({fila[1] for fila in filas}.union(anterior.__matriculas if anterior else ()))
+        tipos = sorted({fila[2] for fila in filas}.union(anterior.__tipos if anterior else ()))
+        id_dni = {dni: i for i, dni in enumerate(dnis)}
+        id_matricula = {matricula: i for i, matricula in enumerate(matriculas)}
+        id_tipo = {tipo: i for i, tipo in enumerate(tipos)}
+        
+        columnas = {nombre: array(formato) for nombre, formato in
+                    (("fechas", "q"), ("pacientes", "i"), ("medicos", "i"), ("especialidades", "i"), ("ids", "q"))}
+        if anterior is not None:
+            columnas["fechas"].frombytes(anterior.__fechas.cast("B"))
+            for nombre, origen, tabla, indices in (
+                    ("pacientes", anterior.__pacientes, anterior.__dnis, id_dni),
+                    ("medicos", anterior.__medicos, anterior.__matriculas, id_matricula),
+                    ("especialidades", anterior.__especialidades, anterior.__tipos, id_tipo)):
+                columnas[nombre].extend(map([indices[cadena] for cadena in tabla].__getitem__, origen))
+            if anterior.__ids is None:
+                columnas["ids"].frombytes(bytes(8 * anterior.__cantidad))
+            else:
+                columnas["ids"].frombytes(anterior.__ids.cast("B"))
+        columnas["fechas"].extend((fila[3] - cls.EPOCA) // cls.MICROSEGUNDO for fila in filas)
+        columnas["pacientes"].extend(id_dni[fila[0]] for fila in filas)
+        columnas["medicos"].extend(id_matricula[fila[1]] for fila in filas)
+        columnas["especialidades"].extend(id_tipo[fila[2]] for fila in filas)
+        columnas["ids"].extend(fila[4] or 0 for fila in filas)
+        cantidad = len(columnas["fechas"])
+        fechas, medicos, pacientes = columnas["fechas"], columnas["medicos"], columnas["pacientes"]
+        columnas["por_medico"] = array("i", sorted(range(cantidad), key=lambda i: (medicos[i], fechas[i])))
+        columnas["inicio_medico"] = cls._inicios(medicos, len(matriculas))
+        columnas["por_paciente"] = array("i", sorted(range(cantidad), key=pacientes.__getitem__))
+        columnas["inicio_paciente"] = cls._inicios(pacientes, len(dnis))
+        
+        tabla = json.dumps([dnis, matriculas, tipos], ensure_ascii=False).encode("utf-8")
+        with open(ruta, "wb") as archivo:
+            archivo.write(cls.MAGICO)
+            archivo.write(array("q", (cantidad, len(dnis), len(matriculas), len(tipos), len(tabla))).tobytes())
+            for nombre, (inicio, _, _) in cls._disposicion(cantidad, len(dnis), len(matriculas), True).items():
+                archivo.write(b"\0" * (inicio - archivo.tell()))
+                archivo.write(columnas[nombre].tobytes())
+            archivo.write(tabla)
+            archivo.flush()
+            os.fsync(archivo.fileno())
+    
+    def turnos(self) -> 'VistaArchivo':
+        return VistaArchivo(self, None, 0, self.__cantidad)
+    
+    def turnos_medico(self, matricula: str) -> 'VistaArchivo':
+        return self._vista_por_id(self.__matriculas, matricula, self.__por_medico, self.__inicio_medico)
+    
+    def turnos_paciente(self, dni: str) -> 'VistaArchivo':
+        return self._vista_por_id(self.__dnis, dni, self.__por_paciente, self.__inicio_paciente)
+    
+    def filas(self) -> Iterable[Tuple[str, str, str, datetime, Optional[int]]]:
+        for fila in range(self.__cantidad):
+            yield (self.__dnis[self.__pacientes[fila]], self.__matriculas[self.__medicos[fila]],
+                   self.__tipos[self.__especialidades[fila]], self.fecha(fila), self.id_turno(fila))
+    
+    def fecha(self, fila: int) -> datetime:
+        return self.EPOCA + timedelta(microseconds=self.__fechas[fila])
+    
+    def marca(self, fila: int) -> int:
+        return self.__fechas[fila]
+    
+    def id_turno(self, fila: int) -> Optional[int]:
+        if self.__ids is None:
+            return None
+        return self.__ids[fila] or None
+    
+    def turno(self, fila: int) -> Turno:
+        return Turno(self.__obtener_paciente(self.__dnis[self.__pacientes[fila]]),
+                     self.__obtener_medico(self.__matriculas[self.__medicos[fila]]),
+                     self.fecha(fila), self.__tipos[self.__especialidades[fila]], self.id_turno(fila))
+    
+    def cerrar(self):
+        for columna in (self.__fechas, self.__pacientes, self.__medicos, self.__especialidades,
+                        self.__por_medico, self.__inicio_medico, self.__por_paciente, self.__inicio_paciente,
+                        self.__ids):
+            if columna is not None:
+                columna.release()
+        self.__mapa.close()
+    
+    def __len__(self) -> int:
+        return self.__cantidad
+    
+    def __str__(self) -> str:
+        return f"Archivo de turnos - Turnos: {self.__cantidad}, Médicos: {len(self.__matriculas)}"
+    
+    @property
+    def dnis(self) -> Sequence:
+        return VistaSoloLectura(self.__dnis)
+    
+    @property
+    def matriculas(self) -> Sequence:
+        return VistaSoloLectura(self.__matriculas)
+    
+    def _vista_por_id(self, claves: List[str], clave: str, indices, inicios) -> 'VistaArchivo':
+        posicion = bisect_left(claves, clave)
+        if posicion == len(claves) or claves[posicion] != clave:
+            return VistaArchivo(self, indices, 0, 0)
+        return VistaArchivo(self, indices, inicios[posicion], inicios[posicion + 1])
+    
+    @staticmethod
+    def _inicios(ids: array, cantidad_ids: int) -> array:
+        inicios = array("q", bytes(8 * (cantidad_ids + 1)))
+        for identificador in ids:
+            inicios[identificador + 1] += 1
+        for i in range(cantidad_ids):
+            inicios[i + 1] += inicios[i]
+        return inicios
+    
+    @classmethod
+    def _disposicion(cls, cantidad: int, pacientes: int, medicos: int,
+                     con_ids: bool) -> Dict[str, Tuple[int, str, int]]:
+        disposicion = {}
+        posicion = cls.ENCABEZADO
+        columnas = [("fechas", "q", cantidad), ("pacientes", "i", cantidad), ("medicos", "i", cantidad),
+                    ("especialidades", "i", cantidad), ("por_medico", "i", cantidad),
+                    ("inicio_medico", "q", medicos + 1), ("por_paciente", "i", cantidad),
+                    ("inicio_paciente", "q", pacientes + 1)]
+        if con_ids:
+            columnas.append(("ids", "q", cantidad))
+        for nombre, formato, largo in columnas:
+            posicion = -(-posicion // 8) * 8
+            disposicion[nombre] = (posicion, formato, largo)
+            posicion += largo * array(formato).itemsize
+        return disposicion
+
+
+class VistaArchivo(Sequence):
+    # Filas del archivo leídas directamente del mapa en memoria; cada Turno se construye solo al accederlo
+    __slots__ = ("__archivo", "__indices", "__inicio", "__fin")
+    
+    def __init__(self, archivo: ArchivoTurnos, indices, inicio: int, fin: int):
+        self.__archivo = archivo
+        self.__indices = indices
+        self.__inicio = inicio
+        self.__fin = fin
+    
+    def se_superpone(self, inicio: datetime, fin: datetime) -> bool:
+        # Solo válido en vistas ordenadas por fecha; la duración sale de la especialidad al construir el Turno
+        posicion = self._buscar(fin) if fin > inicio else self._buscar(inicio, bisect_right)
+        return posicion > 0 and self[posicion - 1].fin > inicio
+    
+    def entre(self, desde: Optional[datetime] = None, hasta: Optional[datetime] = None) -> 'VistaArchivo':
+        # Solo válido en vistas ordenadas por fecha, como las de un médico
+        inicio = 0 if desde is None else self._buscar(desde)
+        fin = len(self) if hasta is None else self._buscar(hasta)
+        return self[inicio:max(inicio, fin)]
+    
+    def __len__(self) -> int:
+        return self.__fin - self.__inicio
+    
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            inicio, fin, paso = indice.indices(len(self))
+            if paso != 1:
+                return tuple(self[i] for i in range(inicio, fin, paso))
+            return VistaArchivo(self.__archivo, self.__indices, self.__inicio + inicio,
+                                self.__inicio + max(inicio, fin))
+        
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError("Índice fuera de rango")
+        return self.__archivo.turno(self._fila(indice))
+    
+    def __iter__(self):
+        return map(self.__getitem__, range(len(self)))
+    
+    def __eq__(self, otro) -> bool:
+        if isinstance(otro, Sequence) and not isinstance(otro, str):
+            return len(self) == len(otro) and all(a == b for a, b in zip(self, otro))
+        return NotImplemented
+    
+    __hash__ = None
+    
+    def _fila(self, indice: int) -> int:
+        posicion = self.__inicio + indice
+        return posicion if self.__indices is None else self.__indices[posicion]
+    
+    def _filas(self) -> Sequence:
+        if self.__indices is None:
+            return range(self.__inicio, self.__fin)
+        return self.__indices[self.__inicio:self.__fin]
+    
+    def _buscar(self, fecha_hora: datetime, buscar=bisect_left) -> int:
+        # Búsqueda binaria sobre las marcas de tiempo crudas: no se construye ningún Turno
+        marca = (fecha_hora - ArchivoTurnos.EPOCA) // ArchivoTurnos.MICROSEGUNDO
+        return buscar(self._filas(), marca, key=self.__archivo.marca)
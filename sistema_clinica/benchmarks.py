@@ -0,0 +1,816 @@
+from datetime import datetime, timedelta
+from itertools import accumulate
+from typing import List, Tuple
+import asyncio
+import json
+import os
+import platform
+import random
+import threading
+import time
+
+from .entidades import DIAS_SEMANA, DURACION_TURNO, Especialidad, HistoriaClinica, Medico, Paciente, Receta, Turno
+from .nucleo import Clinica
+from .archivo import ArchivoTurnos
+from .persistencia import PersistenciaClinica
+from .diario import DiarioOperaciones
+from .analitica import AnaliticaClinica, np
+from .servicio import ServicioClinica
+from .lotes import ProcesadorLotes
+from .cli import CacheRender
+from .fragmentos import ClinicaFragmentada
+
+
+# ===================== SUITE REPRODUCIBLE =====================
+
+class GeneradorClinica:
+    # Especialidades con los días en que suelen atenderse; cada médico toma uno o dos de estos perfiles
+    ESPECIALIDADES = (
+        ("Clínica Médica", ("lunes", "martes", "miércoles", "jueves", "viernes")),
+        ("Pediatría", ("lunes", "miércoles", "viernes")),
+        ("Cardiología", ("martes", "jueves")),
+        ("Dermatología", ("lunes", "jueves")),
+        ("Traumatología", ("martes", "miércoles", "viernes")),
+        ("Ginecología", ("lunes", "martes", "jueves")),
+        ("Oftalmología", ("miércoles", "sábado")),
+    )
+    MEDICAMENTOS = ("Amoxicilina 500mg", "Ibuprofeno 400mg", "Paracetamol 1g", "Omeprazol 20mg", "Enalapril 10mg",
+                    "Metformina 850mg", "Atorvastatina 20mg", "Loratadina 10mg", "Salbutamol", "Levotiroxina 50mcg",
+                    "Aspirina 100mg", "Vitamina D", "Diclofenac 75mg", "Losartán 50mg", "Clonazepam 0.5mg")
+    INICIO = datetime(2024, 1, 1, 8, 0)
+    APERTURA = 8
+    CIERRE = 18
+    DURACION = timedelta(minutes=30)
+    
+    def __init__(self, pacientes: int, medicos: int, semilla: int = 0):
+        self.__azar = random.Random(semilla)
+        self.__dnis = [f"{30_000_000 + i:08d}" for i in range(pacientes)]
+        self.__medicos = []
+        for i in range(medicos):
+            medico = Medico(f"Dr. Sintético {i}", f"MS{i:06d}")
+            for tipo, dias in self.__azar.sample(self.ESPECIALIDADES, self.__azar.choice((1, 1, 2))):
+                medico.agregar_especialidad(Especialidad(tipo, list(dias)))
+            self.__medicos.append(medico)
+        # Próximo horario candidato de cada médico; avanza de a un turno dentro del horario de atención
+        self.__cursores = [self.INICIO] * medicos
+    
+    def construir(self, turnos: int = 0, recetas: int = 0) -> Clinica:
+        clinica = Clinica()
+        clinica.agregar_medicos_bulk(self.__medicos)
+        clinica.agregar_pacientes_bulk(Paciente(f"Paciente Sintético {i}", dni, "01/01/1990")
+                                       for i, dni in enumerate(self.__dnis))
+        clinica.agendar_turnos_bulk(self.proximo_turno() for _ in range(turnos))
+        for _ in range(recetas):
+            clinica.emitir_receta(*self.proxima_receta())
+        return clinica
+    
+    def proximo_turno(self) -> Tuple[str, str, str, datetime]:
+        indice = self.__azar.randrange(len(self.__medicos))
+        medico = self.__medicos[indice]
+        fecha_hora = self.__cursores[indice]
+        especialidades = medico.obtener_especialidades_para_dia_semana(fecha_hora.weekday())
+        while fecha_hora.hour >= self.CIERRE or not especialidades:
+            dia = fecha_hora.date() + timedelta(days=1)
+            fecha_hora = datetime(dia.year, dia.month, dia.day, self.APERTURA)
+            especialidades = medico.obtener_especialidades_para_dia_semana(fecha_hora.weekday())
+        self.__cursores[indice] = fecha_hora + self.DURACION
+        return (self.__azar.choice(self.__dnis), medico.obtener_matricula(), self.__azar.choice(especialidades),
+                fecha_hora)
+    
+    def proxima_receta(self) -> Tuple[str, str, List[str]]:
+        return (self.__azar.choice(self.__dnis), self.__azar.choice(self.__medicos).obtener_matricula(),
+                self.__azar.sample(self.MEDICAMENTOS, self.__azar.randint(1, 3)))
+    
+    def dni_al_azar(self) -> str:
+        return self.__azar.choice(self.__dnis)
+    
+    def turno_existente(self, clinica: Clinica) -> Tuple[Medico, datetime]:
+        turno = self.__azar.choice(clinica.obtener_turnos())
+        return turno.medico, turno.fecha_hora
+
+
+def _medir(operacion, argumentos: list) -> dict:
+    tiempos = []
+    for argumento in argumentos:
+        comienzo = time.perf_counter_ns()
+        operacion(*argumento)
+        tiempos.append(time.perf_counter_ns() - comienzo)
+    tiempos.sort()
+    return {"muestras": len(tiempos),
+            "us_media": round(sum(tiempos) / len(tiempos) / 1e3, 3),
+            "us_p50": round(tiempos[len(tiempos) // 2] / 1e3, 3),
+            "us_p99": round(tiempos[min(len(tiempos) - 1, len(tiempos) * 99 // 100)] / 1e3, 3)}
+
+
+def _medir_escala(escala: int, muestras: int, semilla: int) -> List[dict]:
+    # La escala es la cantidad de turnos previos; pacientes, médicos y recetas crecen en proporción
+    generador = GeneradorClinica(pacientes=max(escala // 4, 10), medicos=max(escala // 500, 5), semilla=semilla)
+    clinica = generador.construir(turnos=escala, recetas=escala // 2)
+    
+    mediciones = {
+        "agendar_turno": (clinica.agendar_turno, [generador.proximo_turno() for _ in range(muestras)]),
+        "emitir_receta": (clinica.emitir_receta, [generador.proxima_receta() for _ in range(muestras)]),
+        "obtener_historia_clinica": (clinica.obtener_historia_clinica,
+                                     [(generador.dni_al_azar(),) for _ in range(muestras)]),
+        "obtener_pacientes": (clinica.obtener_pacientes, [()] * muestras),
+        "obtener_medicos": (clinica.obtener_medicos, [()] * muestras),
+        "obtener_turnos_pagina": (clinica.obtener_turnos, [(i * 20, 20) for i in range(muestras)]),
+        "verificar_turno_duplicado": (clinica.validar_turno_no_duplicado,
+                                      [generador.turno_existente(clinica) for _ in range(muestras)]),
+    }
+    return [{"escala": escala, "operacion": operacion, **_medir(funcion, argumentos)}
+            for operacion, (funcion, argumentos) in mediciones.items()]
+
+
+def suite_benchmarks(escalas=(1_000, 10_000, 100_000), muestras: int = 1_000, semilla: int = 0) -> dict:
+    # Una pasada de calentamiento sobre la escala más chica, descartada, estabiliza las primeras mediciones
+    _medir_escala(min(escalas), muestras, semilla)
+    resultados = []
+    for escala in escalas:
+        resultados.extend(_medir_escala(escala, muestras, semilla))
+    
+    return {"semilla": semilla, "escalas": list(escalas), "python": platform.python_version(),
+            "plataforma": platform.platform(), "fecha": datetime.now().isoformat(timespec="seconds"),
+            "resultados": resultados}
+
+
+def comparar_benchmarks(anterior: dict, actual: dict, tolerancia: float = 0.25,
+                        minimo_us: float = 1.0) -> List[dict]:
+    # Regresiones: operaciones cuya mediana empeoró más que la tolerancia respecto de la corrida anterior.
+    # La mediana es más estable entre corridas que la media, y por debajo de minimo_us domina el ruido del reloj
+    base = {(fila["escala"], fila["operacion"]): fila["us_p50"] for fila in anterior["resultados"]}
+    regresiones = []
+    for fila in actual["resultados"]:
+        previo = base.get((fila["escala"], fila["operacion"]))
+        if previo and fila["us_p50"] > previo * (1 + tolerancia) and fila["us_p50"] - previo > minimo_us:
+            regresiones.append({"escala": fila["escala"], "operacion": fila["operacion"], "anterior": previo,
+                                "actual": fila["us_p50"], "factor": round(fila["us_p50"] / previo, 2)})
+    return regresiones
+
+
+def benchmark_agendar_turno(escalas=(1_000, 10_000, 100_000, 1_000_000), muestras: int = 1_000):
+    todos_los_dias = ["lunes", "martes", "miércoles", "jueves", "viernes", "sábado", "domingo"]
+    inicio = datetime(2024, 1, 1, 0, 0)
+    
+    print(f"{'Turnos previos':>15} | {'µs por turno':>12}")
+    print("-" * 30)
+    for cantidad in escalas:
+        clinica = Clinica()
+        medico = Medico("Dr. Benchmark", "MATB01")
+        medico.agregar_especialidad(Especialidad("Clínica Médica", todos_los_dias))
+        clinica.agregar_medico(medico)
+        clinica.agregar_paciente(Paciente("Paciente Benchmark", "00000001", "01/01/1990"))
+        
+        for i in range(cantidad):
+            clinica.agendar_turno("00000001", "MATB01", "Clínica Médica", inicio + DURACION_TURNO * i)
+        
+        comienzo = time.perf_counter()
+        for i in range(cantidad, cantidad + muestras):
+            clinica.agendar_turno("00000001", "MATB01", "Clínica Médica", inicio + DURACION_TURNO * i)
+        transcurrido = time.perf_counter() - comienzo
+        
+        print(f"{cantidad:>15,} | {transcurrido / muestras * 1e6:>12.2f}")
+
+
+def benchmark_carga_masiva(cantidad: int = 500_000):
+    todos_los_dias = ["lunes", "martes", "miércoles", "jueves", "viernes", "sábado", "domingo"]
+    inicio = datetime(2024, 1, 1, 0, 0)
+    clinica = Clinica()
+    
+    comienzo = time.perf_counter()
+    medicos = []
+    for i in range(100):
+        medico = Medico(f"Dr. {i}", f"MAT{i:05d}")
+        medico.agregar_especialidad(Especialidad("Clínica Médica", todos_los_dias))
+        medicos.append(medico)
+    clinica.agregar_medicos_bulk(medicos)
+    clinica.agregar_pacientes_bulk(Paciente(f"Paciente {i}", f"{i:08d}", "01/01/1990") for i in range(cantidad))
+    resultado = clinica.agendar_turnos_bulk(
+        (f"{i:08d}", f"MAT{i % 100:05d}", "Clínica Médica", inicio + DURACION_TURNO * (i // 100))
+        for i in range(cantidad)
+    )
+    transcurrido = time.perf_counter() - comienzo
+    
+    print(f"\nCarga masiva de {cantidad:,} pacientes y turnos: {transcurrido:.2f} s ({resultado})")
+
+
+def benchmark_persistencia(cantidad: int = 200_000):
+    import tempfile
+    
+    clinica = Clinica()
+    medico = Medico("Dr. Benchmark", "MATB01")
+    medico.agregar_especialidad(Especialidad("Clínica Médica", list(DIAS_SEMANA)))
+    clinica.agregar_medico(medico)
+    clinica.agregar_pacientes_bulk(Paciente(f"Paciente {i}", f"{i:08d}", "01/01/1990") for i in range(cantidad))
+    clinica.agendar_turnos_bulk(
+        (f"{i:08d}", "MATB01", "Clínica Médica", datetime(2024, 1, 1) + DURACION_TURNO * i) for i in range(cantidad)
+    )
+    
+    with tempfile.TemporaryDirectory() as directorio:
+        ruta = os.path.join(directorio, "clinica.jsonl")
+        print()
+        print(PersistenciaClinica(clinica).exportar_jsonl(ruta))
+        print(PersistenciaClinica(Clinica()).importar_jsonl(ruta))
+        print(PersistenciaClinica(clinica).exportar_csv(directorio))
+        print(PersistenciaClinica(Clinica()).importar_csv(directorio))
+
+
+# Entidades con la representación anterior a __slots__: mismos campos que las actuales, pero en el diccionario de
+# instancia, sin internar cadenas y con listas en lugar de tuplas. Solo sirven como referencia de memoria
+class _PacienteConDiccionario:
+    def __init__(self, nombre: str, dni: str, fecha_nacimiento: str):
+        self.__nombre = nombre
+        self.__dni = dni
+        self.__fecha_nacimiento = fecha_nacimiento
+
+
+class _MedicoConDiccionario:
+    def __init__(self, nombre: str, matricula: str):
+        self.__nombre = nombre
+        self.__matricula = matricula
+        self.__especialidades = []
+        self.__especialidades_por_dia = ((),) * 7
+        self.__duraciones = {}
+        self.__version = 0
+
+
+class _EspecialidadConDiccionario:
+    def __init__(self, tipo: str, dias: List[str], duracion: timedelta = DURACION_TURNO):
+        self.__tipo = tipo
+        self.__dias = [dia.lower() for dia in dias]
+        self.__duracion = duracion
+
+
+class _TurnoConDiccionario:
+    def __init__(self, paciente, medico, fecha_hora: datetime, especialidad: str, id_turno: int = None):
+        self.__paciente = paciente
+        self.__medico = medico
+        self.__fecha_hora = fecha_hora
+        self.__especialidad = especialidad
+        self.__duracion = DURACION_TURNO
+        self.__id = id_turno
+
+
+class _RecetaConDiccionario:
+    def __init__(self, paciente, medico, medicamentos: List[str], fecha: datetime):
+        self.__paciente = paciente
+        self.__medico = medico
+        self.__medicamentos = medicamentos.copy()
+        self.__fecha = fecha
+
+
+class _HistoriaClinicaConDiccionario:
+    def __init__(self, paciente):
+        self.__paciente = paciente
+        self.__turnos = []
+        self.__recetas = []
+        self.__archivados = []
+        self.__version = 0
+        self.__generacion = 0
+
+
+def _bytes_por_entidad(fabrica, cantidad: int) -> float:
+    import tracemalloc
+    
+    tracemalloc.start()
+    antes = tracemalloc.get_traced_memory()[0]
+    entidades = [fabrica(i) for i in range(cantidad)]
+    despues = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    return (despues - antes) / len(entidades)
+
+
+def benchmark_memoria(cantidad: int = 100_000):
+    paciente = Paciente("Paciente Benchmark", "00000001", "01/01/1990")
+    medico = Medico("Dr. Benchmark", "MATB01")
+    fecha = datetime(2024, 1, 1, 10, 0)
+    
+    def leido(texto: str) -> str:
+        # Copia nueva de un texto repetido, como al leerlo de un archivo: así se ve el efecto de internarlo
+        return texto.encode("utf-8").decode("utf-8")
+    
+    medicamentos = ("Paracetamol 500mg", "Ibuprofeno 400mg")
+    fabricas = {
+        "Paciente": (lambda i: _PacienteConDiccionario(f"Paciente {i}", f"{i:08d}", leido("01/01/1990")),
+                     lambda i: Paciente(f"Paciente {i}", f"{i:08d}", leido("01/01/1990"))),
+        "Medico": (lambda i: _MedicoConDiccionario(f"Dr. {i}", f"MAT{i:05d}"),
+                   lambda i: Medico(f"Dr. {i}", f"MAT{i:05d}")),
+        "Especialidad": (lambda i: _EspecialidadConDiccionario(leido("Cardiología"), ["Lunes", "Miércoles"]),
+                         lambda i: Especialidad(leido("Cardiología"), ["Lunes", "Miércoles"])),
+        "Turno": (lambda i: _TurnoConDiccionario(paciente, medico, fecha, leido("Cardiología"), i),
+                  lambda i: Turno(paciente, medico, fecha, leido("Cardiología"), i, DURACION_TURNO)),
+        "Receta": (lambda i: _RecetaConDiccionario(paciente, medico, [leido(m) for m in medicamentos], fecha),
+                   lambda i: Receta(paciente, medico, [leido(m) for m in medicamentos], fecha)),
+        "HistoriaClinica": (lambda i: _HistoriaClinicaConDiccionario(paciente), lambda i: HistoriaClinica(paciente)),
+    }
+    
+    print(f"\n{'Entidad':>15} | {'bytes con __dict__':>18} | {'bytes con __slots__':>19} | {'relación':>8}")
+    print("-" * 70)
+    for nombre, (fabrica_anterior, fabrica_actual) in fabricas.items():
+        anterior = _bytes_por_entidad(fabrica_anterior, cantidad)
+        actual = _bytes_por_entidad(fabrica_actual, cantidad)
+        print(f"{nombre:>15} | {anterior:>18.1f} | {actual:>19.1f} | {actual / anterior:>8.2f}")
+
+
+def benchmark_concurrencia(turnos_por_hilo: int = 20_000, hilos=(1, 2, 4, 8)):
+    print(f"\n{'Hilos':>6} | {'turnos/s':>12}")
+    print("-" * 22)
+    for cantidad_hilos in hilos:
+        clinica = Clinica(concurrente=True)
+        clinica.agregar_paciente(Paciente("Paciente Benchmark", "00000001", "01/01/1990"))
+        for i in range(cantidad_hilos):
+            medico = Medico(f"Dr. {i}", f"MAT{i:05d}")
+            medico.agregar_especialidad(Especialidad("Clínica Médica", list(DIAS_SEMANA)))
+            clinica.agregar_medico(medico)
+        
+        def reservar(matricula: str):
+            inicio = datetime(2024, 1, 1)
+            for i in range(turnos_por_hilo):
+                clinica.agendar_turno("00000001", matricula, "Clínica Médica", inicio + DURACION_TURNO * i)
+        
+        trabajadores = [threading.Thread(target=reservar, args=(f"MAT{i:05d}",)) for i in range(cantidad_hilos)]
+        comienzo = time.perf_counter()
+        for trabajador in trabajadores:
+            trabajador.start()
+        for trabajador in trabajadores:
+            trabajador.join()
+        transcurrido = time.perf_counter() - comienzo
+        
+        print(f"{cantidad_hilos:>6} | {cantidad_hilos * turnos_por_hilo / transcurrido:>12,.0f}")
+
+
+def benchmark_servicio(clientes: int = 2_000, solicitudes_por_cliente: int = 10, medicos: int = 50):
+    servicio = ServicioClinica()
+    
+    async def preparar():
+        for i in range(medicos):
+            await servicio.agregar_medico(f"Dr. {i}", f"MAT{i:05d}")
+            await servicio.agregar_especialidad(f"MAT{i:05d}", "Clínica Médica", list(DIAS_SEMANA))
+        for i in range(clientes):
+            await servicio.agregar_paciente(f"Paciente {i}", f"{i:08d}", "01/01/1990")
+    
+    async def cliente(puerto: int, numero: int, latencias: List[float]):
+        lector, escritor = await asyncio.open_connection("127.0.0.1", puerto)
+        for i in range(solicitudes_por_cliente):
+            solicitud = {"op": "agendar_turno", "args": {
+                "dni": f"{numero:08d}", "matricula": f"MAT{numero % medicos:05d}", "especialidad": "Clínica Médica",
+                "fecha_hora": (datetime(2024, 1, 1) +
+                               DURACION_TURNO * (numero * solicitudes_por_cliente + i)).isoformat()
+            }}
+            comienzo = time.perf_counter()
+            escritor.write(json.dumps(solicitud).encode("utf-8") + b"\n")
+            await escritor.drain()
+            await lector.readline()
+            latencias.append(time.perf_counter() - comienzo)
+        escritor.close()
+        await escritor.wait_closed()
+    
+    async def generar_carga():
+        await preparar()
+        servidor = await servicio.servir(puerto=0)
+        puerto = servidor.sockets[0].getsockname()[1]
+        latencias = []
+        comienzo = time.perf_counter()
+        await asyncio.gather(*(cliente(puerto, numero, latencias) for numero in range(clientes)))
+        transcurrido = time.perf_counter() - comienzo
+        servidor.close()
+        await servidor.wait_closed()
+        return sorted(latencias), transcurrido
+    
+    latencias, transcurrido = asyncio.run(generar_carga())
+    p50 = latencias[len(latencias) // 2] * 1000
+    p99 = latencias[int(len(latencias) * 0.99)] * 1000
+    print(f"\nServicio asíncrono: {clientes} clientes, {len(latencias)} solicitudes en {transcurrido:.2f} s "
+          f"({len(latencias) / transcurrido:,.0f} sol/s) - p50 {p50:.2f} ms, p99 {p99:.2f} ms")
+
+
+def benchmark_diario(escalas=(10_000, 100_000), lote_fsync=(1, 256)):
+    import tempfile
+    
+    print(f"\n{'registros':>10} | {'lote fsync':>10} | {'escritura ops/s':>15} | {'reinicio diario (s)':>19} | "
+          f"{'reinicio instantánea (s)':>24}")
+    print("-" * 92)
+    for cantidad in escalas:
+        for lote in lote_fsync:
+            with tempfile.TemporaryDirectory() as directorio:
+                clinica = Clinica(diario=DiarioOperaciones(directorio, lote_fsync=lote))
+                medico = Medico("Dr. Benchmark", "MATB01")
+                medico.agregar_especialidad(Especialidad("Clínica Médica", list(DIAS_SEMANA)))
+                clinica.agregar_medico(medico)
+                # Con fsync por operación solo se mide una muestra para no eternizar el benchmark
+                operaciones = cantidad if lote > 1 else min(cantidad, 1_000)
+                inicio = time.perf_counter()
+                for i in range(operaciones):
+                    clinica.agregar_paciente(Paciente(f"Paciente {i}", f"{i:08d}", "01/01/1990"))
+                escritura = operaciones / (time.perf_counter() - inicio)
+                clinica.cerrar()
+                
+                inicio = time.perf_counter()
+                Clinica.restaurar(DiarioOperaciones(directorio)).cerrar()
+                reinicio_diario = time.perf_counter() - inicio
+                
+                restaurada = Clinica.restaurar(DiarioOperaciones(directorio))
+                restaurada.crear_instantanea()
+                restaurada.cerrar()
+                inicio = time.perf_counter()
+                Clinica.restaurar(DiarioOperaciones(directorio)).cerrar()
+                reinicio_instantanea = time.perf_counter() - inicio
+                print(f"{operaciones:>10} | {lote:>10} | {escritura:>15.0f} | {reinicio_diario:>19.3f} | "
+                      f"{reinicio_instantanea:>24.3f}")
+
+
+def benchmark_archivo(cantidad: int = 200_000, medicos: int = 20):
+    import gc
+    import tempfile
+    import tracemalloc
+    
+    tracemalloc.start()
+    clinica = Clinica()
+    clinica.agregar_medicos_bulk(Medico(f"Dr. {i}", f"MATB{i:02d}") for i in range(medicos))
+    for i in range(medicos):
+        clinica.agregar_especialidad(f"MATB{i:02d}", Especialidad("Clínica Médica", list(DIAS_SEMANA)))
+    clinica.agregar_pacientes_bulk(Paciente(f"Paciente {i}", f"{i:08d}", "01/01/1990") for i in range(cantidad // 10))
+    inicio = datetime(2020, 1, 1)
+    clinica.agendar_turnos_bulk(
+        (f"{i % (cantidad // 10):08d}", f"MATB{i % medicos:02d}", "Clínica Médica",
+         inicio + timedelta(minutes=30 * (i // medicos))) for i in range(cantidad)
+    )
+    gc.collect()
+    memoria_antes = tracemalloc.get_traced_memory()[0]
+    
+    with tempfile.TemporaryDirectory() as directorio:
+        comienzo = time.perf_counter()
+        archivados = clinica.archivar_turnos(os.path.join(directorio, "turnos.bin"),
+                                             inicio + timedelta(minutes=30 * (cantidad // medicos)))
+        segundos = time.perf_counter() - comienzo
+        gc.collect()
+        memoria_despues = tracemalloc.get_traced_memory()[0]
+        tracemalloc.stop()
+        
+        comienzo = time.perf_counter()
+        for i in range(1_000):
+            clinica.obtener_turnos_medico(f"MATB{i % medicos:02d}", inicio + timedelta(days=i),
+                                          inicio + timedelta(days=i + 1))
+        consulta = (time.perf_counter() - comienzo) / 1_000
+        
+        print(f"\nTurnos archivados: {archivados} en {segundos:.2f} s")
+        print(f"Memoria de la clínica: {memoria_antes / 2 ** 20:.1f} MiB -> {memoria_despues / 2 ** 20:.1f} MiB")
+        print(f"Consulta de un día por médico sobre el archivo: {consulta * 1e6:.1f} µs")
+        clinica.cerrar()
+
+
+def benchmark_analitica(cantidad: int = 10_000_000, medicos: int = 500, medicamentos: int = 2_000):
+    if np is None:
+        print("\nNumPy no está instalado: se omite el benchmark de análisis")
+        return
+    
+    generador = np.random.default_rng(0)
+    inicio = (datetime(2020, 1, 1) - ArchivoTurnos.EPOCA) // ArchivoTurnos.MICROSEGUNDO
+    media_hora = 30 * 60 * 10 ** 6
+    columnas = (
+        inicio + generador.integers(0, 5 * 365 * 48, cantidad) * media_hora,
+        generador.integers(0, medicos, cantidad),
+        generador.integers(0, 20, cantidad),
+        [f"MATB{i:03d}" for i in range(medicos)],
+        [f"Especialidad {i}" for i in range(20)],
+        generador.zipf(1.5, cantidad) % medicamentos,
+        [f"Medicamento {i}" for i in range(medicamentos)],
+    )
+    comienzo = time.perf_counter()
+    analitica = AnaliticaClinica(*columnas)
+    
+    print(f"\n{'reporte':>30} | {'segundos':>8}")
+    print("-" * 42)
+    print(f"{'preparación de columnas':>30} | {time.perf_counter() - comienzo:>8.3f}")
+    for nombre, reporte in (("ocupación por médico y día", analitica.ocupacion_por_medico_y_dia),
+                            ("turnos por especialidad y mes", analitica.turnos_por_especialidad_y_mes),
+                            ("huecos por médico", analitica.huecos_por_medico),
+                            ("medicamentos más recetados", analitica.medicamentos_mas_recetados)):
+        comienzo = time.perf_counter()
+        reporte()
+        print(f"{nombre:>30} | {time.perf_counter() - comienzo:>8.3f}")
+
+
+def benchmark_busqueda_horarios(medicos: int = 300, turnos_por_medico: int = 2_000, consultas: int = 200):
+    clinica = Clinica()
+    clinica.agregar_medicos_bulk(Medico(f"Dr. {i}", f"MATB{i:03d}") for i in range(medicos))
+    for i in range(medicos):
+        clinica.agregar_especialidad(f"MATB{i:03d}", Especialidad("Cardiología", list(DIAS_SEMANA[i % 5:i % 5 + 2])))
+    clinica.agregar_paciente(Paciente("Paciente Benchmark", "00000001", "01/01/1990"))
+    
+    # Se reserva un turno por hora: quedan libres los horarios intermedios de cada día
+    inicio = datetime(2024, 1, 1)
+    filas = []
+    for i in range(medicos):
+        horarios = clinica.buscar_horarios_libres("Cardiología", inicio, turnos_por_medico,
+                                                  matriculas=[f"MATB{i:03d}"], duracion=timedelta(hours=1))
+        filas.extend(("00000001", f"MATB{i:03d}", "Cardiología", fecha) for fecha, _ in horarios)
+    clinica.agendar_turnos_bulk(filas)
+    
+    comienzo = time.perf_counter()
+    for i in range(consultas):
+        list(clinica.buscar_horarios_libres("Cardiología", inicio + timedelta(hours=i), 10))
+    segundos = (time.perf_counter() - comienzo) / consultas
+    print(f"\nPrimeros 10 horarios libres entre {medicos} médicos con {len(filas)} turnos: {segundos * 1e3:.2f} ms")
+
+
+def benchmark_busqueda_pacientes(cantidad: int = 1_000_000, consultas: int = 10_000):
+    import random
+    
+    nombres = ("Ana", "José", "María", "Lucía", "Martín", "Sofía", "Ángel", "Julián", "Inés", "Tomás")
+    apellidos = ("García", "Pérez", "Gómez", "Fernández", "López", "Díaz", "Martínez", "Núñez", "Suárez", "Álvarez")
+    aleatorio = random.Random(0)
+    clinica = Clinica()
+    clinica.agregar_pacientes_bulk(
+        Paciente(f"{aleatorio.choice(nombres)} {aleatorio.choice(apellidos)}{i % 1000}", f"{i:08d}", "01/01/1990")
+        for i in range(cantidad)
+    )
+    
+    comienzo = time.perf_counter()
+    clinica.buscar_pacientes("x")
+    construccion = time.perf_counter() - comienzo
+    
+    textos = [f"{aleatorio.choice(apellidos)[:4]}{aleatorio.randrange(1000)}" for _ in range(consultas // 2)]
+    textos += [f"{aleatorio.randrange(cantidad):08d}"[:6] for _ in range(consultas // 2)]
+    comienzo = time.perf_counter()
+    for texto in textos:
+        clinica.buscar_pacientes(texto, limite=20)
+    consulta = (time.perf_counter() - comienzo) / len(textos)
+    
+    comienzo = time.perf_counter()
+    for i in range(1_000):
+        clinica.agregar_paciente(Paciente("Paciente Nuevo", f"9{i:08d}", "01/01/1990"))
+    alta = (time.perf_counter() - comienzo) / 1_000
+    
+    print(f"\nÍndice de {cantidad} pacientes construido en {construccion:.2f} s")
+    print(f"Búsqueda paginada (20 resultados): {consulta * 1e6:.1f} µs; alta con índice: {alta * 1e6:.1f} µs")
+
+
+def benchmark_cache_render(turnos: int = 20_000, vistas: int = 50):
+    clinica = Clinica()
+    medico = Medico("Dr. Benchmark", "MATB01")
+    medico.agregar_especialidad(Especialidad("Clínica Médica", list(DIAS_SEMANA)))
+    clinica.agregar_medico(medico)
+    clinica.agregar_paciente(Paciente("Paciente Benchmark", "00000001", "01/01/1990"))
+    clinica.agendar_turnos_bulk(
+        ("00000001", "MATB01", "Clínica Médica", datetime(2024, 1, 1) + timedelta(minutes=30 * i))
+        for i in range(turnos)
+    )
+    historia = clinica.obtener_historia_clinica("00000001")
+    siguiente = datetime(2024, 1, 1) + timedelta(minutes=30 * turnos)
+    
+    comienzo = time.perf_counter()
+    for i in range(vistas):
+        [str(turno) for turno in historia.obtener_turnos()]
+        clinica.agendar_turno("00000001", "MATB01", "Clínica Médica", siguiente + timedelta(minutes=30 * i))
+    sin_cache = (time.perf_counter() - comienzo) / vistas
+    
+    cache = CacheRender()
+    comienzo = time.perf_counter()
+    for i in range(vistas):
+        cache.historia(historia)
+        clinica.agendar_turno("00000001", "MATB01", "Clínica Médica", siguiente + timedelta(minutes=30 * (vistas + i)))
+    con_cache = (time.perf_counter() - comienzo) / vistas
+    print(f"\nVista de una historia con {turnos} turnos y un alta entre vistas: "
+          f"{sin_cache * 1e3:.2f} ms sin caché, {con_cache * 1e3:.2f} ms con caché ({cache})")
+
+
+def benchmark_estadisticas(turnos: int = 200_000, medicos: int = 50, consultas: int = 10_000):
+    clinica = Clinica()
+    clinica.agregar_medicos_bulk(Medico(f"Dr. {i}", f"MATB{i:02d}") for i in range(medicos))
+    for i in range(medicos):
+        clinica.agregar_especialidad(f"MATB{i:02d}", Especialidad(f"Especialidad {i % 10}", list(DIAS_SEMANA)))
+    clinica.agregar_pacientes_bulk(Paciente(f"Paciente {i}", f"{i:08d}", "01/01/1990") for i in range(turnos // 10))
+    inicio = datetime(2024, 1, 1)
+    clinica.agendar_turnos_bulk(
+        (f"{i % (turnos // 10):08d}", f"MATB{i % medicos:02d}", f"Especialidad {i % medicos % 10}",
+         inicio + timedelta(minutes=30 * (i // medicos))) for i in range(turnos)
+    )
+    
+    comienzo = time.perf_counter()
+    estadisticas = clinica.obtener_estadisticas()
+    construccion = time.perf_counter() - comienzo
+    
+    comienzo = time.perf_counter()
+    for i in range(consultas):
+        estadisticas.turnos_medico(f"MATB{i % medicos:02d}")
+        estadisticas.turnos_paciente(f"{i:08d}")
+    lectura = (time.perf_counter() - comienzo) / consultas
+    
+    comienzo = time.perf_counter()
+    for i in range(100):
+        estadisticas.resumen(inicio + timedelta(days=i))
+    resumen = (time.perf_counter() - comienzo) / 100
+    
+    comienzo = time.perf_counter()
+    for _ in range(10):
+        sum(1 for turno in clinica.obtener_turnos() if turno.medico.obtener_matricula() == "MATB00")
+    recorrido = (time.perf_counter() - comienzo) / 10
+    print(f"\nEstadísticas de {turnos} turnos: construcción {construccion:.2f} s, contador {lectura * 1e6:.2f} µs, "
+          f"resumen {resumen * 1e3:.2f} ms, recorrido completo {recorrido * 1e3:.1f} ms")
+
+
+def benchmark_lotes(cantidad: int = 100_000):
+    import io
+    
+    lineas = [json.dumps({"op": "agregar_medico", "args": {"nombre": "Dr. Lote", "matricula": "MATB01"}}),
+              json.dumps({"op": "agregar_especialidad",
+                          "args": {"matricula": "MATB01", "tipo": "Clínica Médica", "dias": list(DIAS_SEMANA)}})]
+    for i in range(cantidad // 2):
+        lineas.append(json.dumps({"op": "agregar_paciente", "args": {
+            "nombre": f"Paciente {i}", "dni": f"{i:08d}", "fecha_nacimiento": "01/01/1990"}}))
+        lineas.append(json.dumps({"op": "agendar_turno", "args": {
+            "dni": f"{i:08d}", "matricula": "MATB01", "especialidad": "Clínica Médica",
+            "fecha_hora": (datetime(2024, 1, 1) + timedelta(minutes=30 * i)).isoformat()}}))
+    
+    procesador = ProcesadorLotes(salida=io.StringIO(), solo_errores=True)
+    print(f"\n{procesador.procesar(lineas)} - Errores: {procesador.errores}")
+
+
+def benchmark_fragmentos(turnos: int = 200_000, medicos: int = 64, fragmentos=(1, 2, 4), lote: int = 2_000,
+                         hilos: int = 8):
+    # Reservas por lotes (cada lote abarca todos los fragmentos) y reservas individuales desde varios hilos
+    # del enrutador; con un solo núcleo los fragmentos no pueden escalar y solo se ve el costo de la comunicación
+    print(f"\n{'fragmentos':>10} | {'lotes turnos/s':>14} | {'individual turnos/s':>19}")
+    print("-" * 50)
+    inicio = datetime(2024, 1, 1)
+    filas = [("00000001", f"MAT{i % medicos:05d}", "Clínica Médica", inicio + DURACION_TURNO * (i // medicos))
+             for i in range(turnos)]
+    
+    for cantidad in fragmentos:
+        clinica = ClinicaFragmentada(cantidad)
+        clinica.agregar_paciente(Paciente("Paciente Benchmark", "00000001", "01/01/1990"))
+        for i in range(medicos):
+            medico = Medico(f"Dr. {i}", f"MAT{i:05d}")
+            medico.agregar_especialidad(Especialidad("Clínica Médica", list(DIAS_SEMANA)))
+            clinica.agregar_medico(medico)
+        
+        comienzo = time.perf_counter()
+        for desde in range(0, turnos // 2, lote):
+            clinica.agendar_turnos_bulk(filas[desde:desde + lote])
+        por_lotes = (turnos // 2) / (time.perf_counter() - comienzo)
+        
+        pendientes = filas[turnos // 2:]
+        
+        def reservar(numero: int):
+            for fila in pendientes[numero::hilos]:
+                clinica.agendar_turno(*fila)
+        
+        trabajadores = [threading.Thread(target=reservar, args=(numero,)) for numero in range(hilos)]
+        comienzo = time.perf_counter()
+        for trabajador in trabajadores:
+            trabajador.start()
+        for trabajador in trabajadores:
+            trabajador.join()
+        individual = len(pendientes) / (time.perf_counter() - comienzo)
+        clinica.cerrar()
+        
+        print(f"{cantidad:>10} | {por_lotes:>14,.0f} | {individual:>19,.0f}")
+
+
+def benchmark_cancelacion(escalas=(10_000, 100_000, 1_000_000), medicos: int = 50, muestras: int = 1_000):
+    # Cancelar y reprogramar ubican el turno por id y lo quitan de la agenda por búsqueda binaria, así que el costo
+    # no debería crecer con la escala; el primer listado posterior solo rearma el índice de bloques del orden de alta
+    print(f"\n{'turnos':>10} | {'cancelar µs':>11} | {'reprogramar µs':>14} | {'listado posterior ms':>20}")
+    print("-" * 66)
+    inicio = datetime(2024, 1, 1)
+    azar = random.Random(0)
+    for escala in escalas:
+        # Diez turnos por paciente: la historia de cada uno se mantiene chica como en una clínica real
+        pacientes = max(escala // 10, 1)
+        clinica = Clinica()
+        clinica.agregar_pacientes_bulk(Paciente(f"Paciente {i}", f"{i:08d}", "01/01/1990") for i in range(pacientes))
+        clinica.agregar_medicos_bulk(Medico(f"Dr. {i}", f"MAT{i:05d}") for i in range(medicos))
+        for i in range(medicos):
+            clinica.agregar_especialidad(f"MAT{i:05d}", Especialidad("Clínica Médica", list(DIAS_SEMANA)))
+        clinica.agendar_turnos_bulk((f"{i % pacientes:08d}", f"MAT{i % medicos:05d}", "Clínica Médica",
+                                     inicio + DURACION_TURNO * (i // medicos)) for i in range(escala))
+        
+        ids = azar.sample(range(1, escala + 1), 2 * muestras)
+        cancelar = _medir(clinica.cancelar_turno, [(id_turno,) for id_turno in ids[:muestras]])
+        # Los destinos quedan más allá del último turno de cada médico, así que siempre están libres
+        destino = inicio + DURACION_TURNO * (escala // medicos + 1)
+        reprogramar = _medir(clinica.reprogramar_turno,
+                             [(id_turno, destino + DURACION_TURNO * i) for i, id_turno in enumerate(ids[muestras:])])
+        
+        comienzo = time.perf_counter()
+        clinica.obtener_turnos()
+        listado = (time.perf_counter() - comienzo) * 1e3
+        
+        print(f"{escala:>10,} | {cancelar['us_p50']:>11.1f} | {reprogramar['us_p50']:>14.1f} | {listado:>20.1f}")
+
+
+def benchmark_superposicion(escalas=(1_000, 10_000, 100_000), medicos: int = 4, consultas: int = 2_000):
+    # Turnos de 30 minutos cada una hora: la mitad de las consultas cae dentro de un turno y se rechaza, la otra
+    # mitad ocupa un hueco libre. Con la agenda como lista ordenada de intervalos el costo crece como log n
+    from .repositorio_sqlite import RepositorioSQLite
+    
+    print(f"\n{'turnos/médico':>13} | {'repositorio':>11} | {'rechazo µs':>10} | {'reserva µs':>10}")
+    print("-" * 55)
+    inicio = datetime(2024, 1, 1)
+    hora = timedelta(hours=1)
+    azar = random.Random(0)
+    for escala in escalas:
+        for nombre, repositorio in (("memoria", None), ("sqlite", RepositorioSQLite())):
+            clinica = Clinica(repositorio=repositorio)
+            clinica.agregar_paciente(Paciente("Paciente Benchmark", "00000001", "01/01/1990"))
+            clinica.agregar_medicos_bulk(Medico(f"Dr. {i}", f"MAT{i:05d}") for i in range(medicos))
+            for i in range(medicos):
+                clinica.agregar_especialidad(f"MAT{i:05d}", Especialidad("Clínica Médica", list(DIAS_SEMANA)))
+            clinica.agendar_turnos_bulk(("00000001", f"MAT{i:05d}", "Clínica Médica", inicio + hora * j)
+                                        for i in range(medicos) for j in range(escala))
+            
+            def intentar(matricula: str, fecha_hora: datetime):
+                try:
+                    clinica.agendar_turno("00000001", matricula, "Clínica Médica", fecha_hora)
+                except ValueError:
+                    pass
+            
+            huecos = azar.sample(range(escala), min(consultas, escala))
+            rechazos = _medir(intentar, [(f"MAT{j % medicos:05d}", inicio + hora * j + timedelta(minutes=10))
+                                         for j in huecos])
+            reservas = _medir(intentar, [(f"MAT{j % medicos:05d}", inicio + hora * j + DURACION_TURNO)
+                                         for j in huecos])
+            clinica.cerrar()
+            
+            print(f"{escala:>13,} | {nombre:>11} | {rechazos['us_p50']:>10.1f} | {reservas['us_p50']:>10.1f}")
+
+
+def benchmark_series(turnos_previos: int = 100_000, semanas: int = 52, series: int = 50):
+    # Una serie de un año contra las mismas reservas hechas de a una, sobre un médico con la agenda ya cargada
+    inicio = datetime(2024, 1, 1)
+    clinica = Clinica()
+    clinica.agregar_pacientes_bulk(Paciente(f"Paciente {i}", f"{i:08d}", "01/01/1990") for i in range(series))
+    medico = Medico("Dr. Serie", "MATS01")
+    medico.agregar_especialidad(Especialidad("Clínica Médica", list(DIAS_SEMANA)))
+    clinica.agregar_medico(medico)
+    clinica.agendar_turnos_bulk(("00000000", "MATS01", "Clínica Médica", inicio + DURACION_TURNO * i)
+                                for i in range(turnos_previos))
+    
+    # Cada serie usa un horario propio, más allá de los turnos previos, para que todas se puedan agendar
+    primera = inicio + DURACION_TURNO * turnos_previos
+    comienzo = time.perf_counter()
+    for i in range(series):
+        clinica.agendar_serie(f"{i:08d}", "MATS01", "Clínica Médica", primera + DURACION_TURNO * i, semanas)
+    por_serie = (time.perf_counter() - comienzo) / series
+    
+    primera += timedelta(weeks=semanas)
+    comienzo = time.perf_counter()
+    for i in range(series):
+        for semana in range(semanas):
+            clinica.agendar_turno(f"{i:08d}", "MATS01", "Clínica Médica",
+                                  primera + DURACION_TURNO * i + timedelta(weeks=semana))
+    individuales = (time.perf_counter() - comienzo) / series
+    
+    print(f"\nSerie de {semanas} turnos sobre {turnos_previos:,} previos: {por_serie * 1e6:.0f} µs por serie, "
+          f"{individuales * 1e6:.0f} µs con {semanas} reservas individuales "
+          f"({por_serie / individuales * semanas:.1f} reservas individuales equivalentes)")
+
+
+def benchmark_indice_medicamentos(recetas: int = 1_000_000, pacientes: int = 100_000, medicos: int = 50,
+                                  medicamentos: int = 2_000, consultas: int = 1_000):
+    # Recetas de cinco años con medicamentos de popularidad desigual; las consultas piden una semana de uno solo
+    aleatorio = random.Random(0)
+    clinica = Clinica()
+    clinica.agregar_medicos_bulk(Medico(f"Dr. {i}", f"MATB{i:02d}") for i in range(medicos))
+    clinica.agregar_pacientes_bulk(Paciente(f"Paciente {i}", f"{i:08d}", "01/01/1990") for i in range(pacientes))
+    nombres = [f"Medicamento {i} 500mg" for i in range(medicamentos)]
+    pesos = list(accumulate(1 / (i + 1) for i in range(medicamentos)))
+    inicio = datetime(2020, 1, 1)
+    paso = timedelta(days=5 * 365) / recetas
+    for i in range(recetas):
+        clinica.emitir_receta(f"{aleatorio.randrange(pacientes):08d}", f"MATB{i % medicos:02d}",
+                              aleatorio.choices(nombres, cum_weights=pesos, k=2), inicio + paso * i)
+    
+    comienzo = time.perf_counter()
+    indice = clinica.obtener_indice_medicamentos()
+    construccion = time.perf_counter() - comienzo
+    
+    ventanas = [(aleatorio.choice(nombres[:100]).upper(), inicio + timedelta(days=aleatorio.randrange(5 * 358)))
+                for _ in range(consultas)]
+    resultados = 0
+    comienzo = time.perf_counter()
+    for nombre, desde in ventanas:
+        resultados += len(indice.pacientes(nombre, desde, desde + timedelta(weeks=1)))
+    consulta = (time.perf_counter() - comienzo) / consultas
+    
+    # Sin índice hay que recorrer todas las historias comparando cada medicamento
+    nombre, desde = ventanas[0]
+    hasta = desde + timedelta(weeks=1)
+    comienzo = time.perf_counter()
+    for paciente in clinica.obtener_pacientes():
+        for receta in clinica.obtener_historia_clinica(paciente.obtener_dni()).obtener_recetas():
+            if desde <= receta.fecha < hasta and any(m.casefold() == nombre.casefold() for m in receta.medicamentos):
+                break
+    recorrido = time.perf_counter() - comienzo
+    
+    comienzo = time.perf_counter()
+    for i in range(10_000):
+        clinica.emitir_receta(f"{i:08d}", "MATB00", aleatorio.choices(nombres, cum_weights=pesos, k=2),
+                              inicio + paso * (recetas + i))
+    alta = (time.perf_counter() - comienzo) / 10_000
+    
+    print(f"\nÍndice de {len(indice)} medicamentos sobre {recetas:,} recetas construido en {construccion:.2f} s")
+    print(f"Pacientes con un medicamento en una semana: {consulta * 1e6:.1f} µs "
+          f"({resultados / consultas:.1f} pacientes en promedio), recorrido completo {recorrido * 1e3:.0f} ms; "
+          f"receta con índice: {alta * 1e6:.1f} µs")
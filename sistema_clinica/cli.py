@@ -0,0 +1,474 @@
+from collections import OrderedDict
+from collections.abc import Sequence
+from datetime import datetime, timedelta
+from typing import Optional, Tuple
+
+from .entidades import DURACION_TURNO, Especialidad, HistoriaClinica, Medico, Paciente, Receta, Turno, VistaSoloLectura
+from .nucleo import Clinica
+
+
+class CacheRender:
+    # LRU acotada de textos ya renderizados, con claves estables (dni, matrícula, id de turno) para que también
+    # acierte con repositorios que arman objetos nuevos en cada consulta, como SQLite o el archivo histórico
+    CAPACIDAD = 4096
+    
+    def __init__(self, capacidad: int = CAPACIDAD):
+        if capacidad <= 0:
+            raise ValueError("La capacidad de la caché debe ser positiva")
+        self.__capacidad = capacidad
+        self.__entradas = OrderedDict()
+        self.__aciertos = 0
+        self.__fallos = 0
+    
+    def texto(self, entidad) -> str:
+        clave = self.clave(entidad)
+        version = getattr(entidad, "version", 0)
+        entrada = self._obtener(clave)
+        if entrada is not None and entrada[0] == version:
+            self.__aciertos += 1
+            return entrada[1]
+        
+        self.__fallos += 1
+        texto = str(entidad)
+        self._guardar(clave, (version, texto))
+        return texto
+    
+    def historia(self, historia: HistoriaClinica) -> Tuple[str, Sequence, Sequence]:
+        # La versión de la historia la mantiene quien la guarda (la historia en memoria o el repositorio SQLite),
+        # así que un acierto no recorre los turnos aunque el objeto se haya armado de nuevo
+        clave = ("historia", historia.paciente.obtener_dni())
+        entrada = self._obtener(clave)
+        if entrada is not None and entrada[0] == historia.version:
+            self.__aciertos += 1
+            return entrada[2], VistaSoloLectura(entrada[3]), VistaSoloLectura(entrada[4])
+        
+        # Turnos y recetas solo se agregan al final: si no cambió el orden de los ya renderizados se agregan los nuevos
+        self.__fallos += 1
+        turnos, recetas = [], []
+        if entrada is not None and entrada[1] == historia.generacion:
+            turnos, recetas = entrada[3], entrada[4]
+        turnos.extend(str(turno) for turno in historia.turnos[len(turnos):])
+        recetas.extend(str(receta) for receta in historia.recetas[len(recetas):])
+        encabezado = str(historia)
+        self._guardar(clave, (historia.version, historia.generacion, encabezado, turnos, recetas))
+        return encabezado, VistaSoloLectura(turnos), VistaSoloLectura(recetas)
+    
+    @staticmethod
+    def clave(entidad):
+        # Paciente y turno no cambian una vez creados (reprogramar crea un turno nuevo con el mismo id); el médico
+        # cambia solo al sumar especialidades, y eso lo refleja su versión
+        if isinstance(entidad, Paciente):
+            return "paciente", entidad.obtener_dni()
+        if isinstance(entidad, Medico):
+            return "medico", entidad.obtener_matricula()
+        if isinstance(entidad, Turno) and entidad.id is not None:
+            return "turno", entidad.id, entidad.fecha_hora
+        if isinstance(entidad, Receta):
+            return ("receta", entidad.paciente.obtener_dni(), entidad.medico.obtener_matricula(), entidad.fecha,
+                    tuple(entidad.medicamentos))
+        return entidad
+    
+    def limpiar(self):
+        self.__entradas.clear()
+    
+    def __len__(self) -> int:
+        return len(self.__entradas)
+    
+    def __str__(self) -> str:
+        return (f"Caché de vistas - Entradas: {len(self.__entradas)}/{self.__capacidad}, "
+                f"Aciertos: {self.__aciertos}, Fallos: {self.__fallos}")
+    
+    @property
+    def aciertos(self) -> int:
+        return self.__aciertos
+    
+    @property
+    def fallos(self) -> int:
+        return self.__fallos
+    
+    def _obtener(self, clave):
+        entrada = self.__entradas.get(clave)
+        if entrada is not None:
+            self.__entradas.move_to_end(clave)
+        return entrada
+    
+    def _guardar(self, clave, entrada):
+        self.__entradas[clave] = entrada
+        self.__entradas.move_to_end(clave)
+        if len(self.__entradas) > self.__capacidad:
+            self.__entradas.popitem(last=False)
+
+
+class ClinicaCLI:
+    def __init__(self, clinica: Optional[Clinica] = None, cache: Optional[CacheRender] = None,
+                 capacidad_cache: int = CacheRender.CAPACIDAD):
+        self.clinica = clinica if clinica is not None else Clinica()
+        self.cache = cache if cache is not None else CacheRender(capacidad_cache)
+    
+    def mostrar_menu_principal(self):
+        print("\n" + "="*50)
+        print("🏥 SISTEMA DE GESTIÓN DE CLÍNICA")
+        print("="*50)
+        print("--- Menú Clínica ---")
+        print("1) Agregar paciente")
+        print("2) Agregar médico")
+        print("3) Agendar turno")
+        print("4) Agregar especialidad")
+        print("5) Emitir receta")
+        print("6) Ver historia clínica")
+        print("7) Ver todos los turnos")
+        print("8) Ver todos los pacientes")
+        print("9) Ver todos los médicos")
+        print("10) Cancelar turno")
+        print("11) Reprogramar turno")
+        print("0) Salir")
+        print("="*50)
+    
+    def ejecutar(self):
+        print("🏥 Bienvenido al Sistema de Gestión de Clínica")
+        
+        while True:
+            try:
+                self.mostrar_menu_principal()
+                opcion = input("Seleccione una opción (0-11): ").strip()
+                
+                if opcion == "1":
+                    self._agregar_paciente()
+                elif opcion == "2":
+                    self._agregar_medico()
+                elif opcion == "3":
+                    self._agendar_turno()
+                elif opcion == "4":
+                    self._agregar_especialidad()
+                elif opcion == "5":
+                    self._emitir_receta()
+                elif opcion == "6":
+                    self._ver_historia_clinica()
+                elif opcion == "7":
+                    self._ver_todos_los_turnos()
+                elif opcion == "8":
+                    self._ver_todos_los_pacientes()
+                elif opcion == "9":
+                    self._ver_todos_los_medicos()
+                elif opcion == "10":
+                    self._cancelar_turno()
+                elif opcion == "11":
+                    self._reprogramar_turno()
+                elif opcion == "0":
+                    print("\n👋 Gracias por usar el Sistema de Gestión de Clínica")
+                    break
+                else:
+                    print("❌ Opción inválida. Por favor, seleccione una opción del 0 al 11.")
+                
+                input("\nPresione Enter para continuar...")
+                
+            except KeyboardInterrupt:
+                print("\n\n👋 Programa interrumpido por el usuario.")
+                break
+            except Exception as e:
+                print(f"\n❌ Error inesperado: {e}")
+                input("\nPresione Enter para continuar...")
+    
+    def _agregar_paciente(self):
+        print("\n📝 AGREGAR PACIENTE")
+        print("-" * 30)
+        
+        try:
+            nombre = input("Ingrese el nombre del paciente: ").strip()
+            if not nombre:
+                print("❌ El nombre no puede estar vacío.")
+                return
+            
+            dni = input("Ingrese el DNI del paciente: ").strip()
+            if not dni:
+                print("❌ El DNI no puede estar vacío.")
+                return
+            
+            fecha_nacimiento = input("Ingrese la fecha de nacimiento (DD/MM/AAAA): ").strip()
+            if not fecha_nacimiento:
+                print("❌ La fecha de nacimiento no puede estar vacía.")
+                return
+            
+            paciente = Paciente(nombre, dni, fecha_nacimiento)
+            self.clinica.agregar_paciente(paciente)
+            
+            print(f"✅ Paciente agregado exitosamente: {paciente}")
+            
+        except ValueError as e:
+            print(f"❌ Error: {e}")
+        except Exception as e:
+            print(f"❌ Error inesperado al agregar paciente: {e}")
+    
+    def _agregar_medico(self):
+        print("\n👨‍⚕️ AGREGAR MÉDICO")
+        print("-" * 30)
+        
+        try:
+            nombre = input("Ingrese el nombre del médico: ").strip()
+            if not nombre:
+                print("❌ El nombre no puede estar vacío.")
+                return
+            
+            matricula = input("Ingrese la matrícula del médico: ").strip()
+            if not matricula:
+                print("❌ La matrícula no puede estar vacía.")
+                return
+            
+            medico = Medico(nombre, matricula)
+            self.clinica.agregar_medico(medico)
+            
+            print(f"✅ Médico agregado exitosamente: {medico}")
+            
+        except ValueError as e:
+            print(f"❌ Error: {e}")
+        except Exception as e:
+            print(f"❌ Error inesperado al agregar médico: {e}")
+    
+    def _agendar_turno(self):
+        print("\n📅 AGENDAR TURNO")
+        print("-" * 30)
+        
+        try:
+            dni = input("Ingrese el DNI del paciente: ").strip()
+            if not dni:
+                print("❌ El DNI no puede estar vacío.")
+                return
+            
+            matricula = input("Ingrese la matrícula del médico: ").strip()
+            if not matricula:
+                print("❌ La matrícula no puede estar vacía.")
+                return
+            
+            especialidad = input("Ingrese la especialidad: ").strip()
+            if not especialidad:
+                print("❌ La especialidad no puede estar vacía.")
+                return
+            
+            fecha_str = input("Ingrese la fecha (DD/MM/AAAA): ").strip()
+            hora_str = input("Ingrese la hora (HH:MM): ").strip()
+            
+            try:
+                fecha_hora = datetime.strptime(f"{fecha_str} {hora_str}", "%d/%m/%Y %H:%M")
+            except ValueError:
+                print("❌ Formato de fecha u hora inválido. Use DD/MM/AAAA para fecha y HH:MM para hora.")
+                return
+            
+            turno = self.clinica.agendar_turno(dni, matricula, especialidad, fecha_hora)
+            print(f"✅ Turno agendado exitosamente: {turno}")
+            
+        except ValueError as e:
+            print(f"❌ Error: {e}")
+        except Exception as e:
+            print(f"❌ Error inesperado al agendar turno: {e}")
+    
+    def _agregar_especialidad(self):
+        print("\n🏥 AGREGAR ESPECIALIDAD A MÉDICO")
+        print("-" * 40)
+        
+        try:
+            matricula = input("Ingrese la matrícula del médico: ").strip()
+            if not matricula:
+                print("❌ La matrícula no puede estar vacía.")
+                return
+            
+            medico = self.clinica.obtener_medico_por_matricula(matricula)
+            if not medico:
+                print("❌ No existe un médico con esa matrícula.")
+                return
+            
+            tipo_especialidad = input("Ingrese el tipo de especialidad: ").strip()
+            if not tipo_especialidad:
+                print("❌ El tipo de especialidad no puede estar vacío.")
+                return
+            
+            print("Ingrese los días de atención (separados por comas):")
+            print("Opciones: lunes, martes, miércoles, jueves, viernes, sábado, domingo")
+            dias_str = input("Días: ").strip()
+            
+            if not dias_str:
+                print("❌ Debe especificar al menos un día.")
+                return
+            
+            dias = [dia.strip() for dia in dias_str.split(",")]
+            
+            minutos_por_defecto = DURACION_TURNO // timedelta(minutes=1)
+            duracion_str = input(f"Duración del turno en minutos (Enter = {minutos_por_defecto}): ").strip()
+            if duracion_str and not duracion_str.isdigit():
+                print("❌ La duración debe ser un número de minutos.")
+                return
+            duracion = timedelta(minutes=int(duracion_str)) if duracion_str else DURACION_TURNO
+            
+            especialidad = Especialidad(tipo_especialidad, dias, duracion)
+            self.clinica.agregar_especialidad(matricula, especialidad)
+            
+            print(f"✅ Especialidad agregada exitosamente: {especialidad}")
+            print(f"   Al médico: {medico.nombre}")
+            
+        except ValueError as e:
+            print(f"❌ Error: {e}")
+        except Exception as e:
+            print(f"❌ Error inesperado al agregar especialidad: {e}")
+    
+    def _emitir_receta(self):
+        print("\n💊 EMITIR RECETA")
+        print("-" * 30)
+        
+        try:
+            dni = input("Ingrese el DNI del paciente: ").strip()
+            if not dni:
+                print("❌ El DNI no puede estar vacío.")
+                return
+            
+            matricula = input("Ingrese la matrícula del médico: ").strip()
+            if not matricula:
+                print("❌ La matrícula no puede estar vacía.")
+                return
+            
+            print("Ingrese los medicamentos (separados por comas):")
+            medicamentos_str = input("Medicamentos: ").strip()
+            
+            if not medicamentos_str:
+                print("❌ Debe especificar al menos un medicamento.")
+                return
+            
+            medicamentos = [med.strip() for med in medicamentos_str.split(",")]
+            
+            receta = self.clinica.emitir_receta(dni, matricula, medicamentos)
+            print(f"✅ Receta emitida exitosamente: {receta}")
+            
+        except ValueError as e:
+            print(f"❌ Error: {e}")
+        except Exception as e:
+            print(f"❌ Error inesperado al emitir receta: {e}")
+    
+    def _ver_historia_clinica(self):
+        print("\n📋 VER HISTORIA CLÍNICA")
+        print("-" * 35)
+        
+        try:
+            dni = input("Ingrese el DNI del paciente: ").strip()
+            if not dni:
+                print("❌ El DNI no puede estar vacío.")
+                return
+            
+            historia = self.clinica.obtener_historia_clinica(dni)
+            if not historia:
+                print("❌ No existe un paciente con ese DNI.")
+                return
+            
+            encabezado, turnos, recetas = self.cache.historia(historia)
+            print(f"\n📋 {encabezado}")
+            print("\n--- TURNOS ---")
+            if turnos:
+                for i, turno in enumerate(turnos, 1):
+                    print(f"{i}. {turno}")
+            else:
+                print("No hay turnos registrados.")
+            
+            print("\n--- RECETAS ---")
+            if recetas:
+                for i, receta in enumerate(recetas, 1):
+                    print(f"{i}. {receta}")
+            else:
+                print("No hay recetas registradas.")
+                
+        except Exception as e:
+            print(f"❌ Error inesperado al ver historia clínica: {e}")
+    
+    def _ver_todos_los_turnos(self):
+        print("\n📅 TODOS LOS TURNOS")
+        print("-" * 30)
+        
+        try:
+            turnos = self.clinica.obtener_turnos()
+            if turnos:
+                for i, turno in enumerate(turnos, 1):
+                    print(f"{i}. [id {turno.id}] {self.cache.texto(turno)}")
+                print(f"\nTotal de turnos: {len(turnos)}")
+            else:
+                print("No hay turnos agendados.")
+                
+        except Exception as e:
+            print(f"❌ Error inesperado al ver turnos: {e}")
+    
+    def _cancelar_turno(self):
+        print("\n🗑️ CANCELAR TURNO")
+        print("-" * 30)
+        
+        try:
+            id_str = input("Ingrese el id del turno (ver 'Ver todos los turnos'): ").strip()
+            if not id_str.isdigit():
+                print("❌ El id del turno debe ser un número.")
+                return
+            
+            turno = self.clinica.cancelar_turno(int(id_str))
+            print(f"✅ Turno cancelado: {turno}")
+            
+        except ValueError as e:
+            print(f"❌ Error: {e}")
+        except Exception as e:
+            print(f"❌ Error inesperado al cancelar turno: {e}")
+    
+    def _reprogramar_turno(self):
+        print("\n🔁 REPROGRAMAR TURNO")
+        print("-" * 30)
+        
+        try:
+            id_str = input("Ingrese el id del turno (ver 'Ver todos los turnos'): ").strip()
+            if not id_str.isdigit():
+                print("❌ El id del turno debe ser un número.")
+                return
+            
+            fecha_str = input("Ingrese la nueva fecha (DD/MM/AAAA): ").strip()
+            hora_str = input("Ingrese la nueva hora (HH:MM): ").strip()
+            
+            try:
+                fecha_hora = datetime.strptime(f"{fecha_str} {hora_str}", "%d/%m/%Y %H:%M")
+            except ValueError:
+                print("❌ Formato de fecha u hora inválido. Use DD/MM/AAAA para fecha y HH:MM para hora.")
+                return
+            
+            turno = self.clinica.reprogramar_turno(int(id_str), fecha_hora)
+            print(f"✅ Turno reprogramado: {turno}")
+            
+        except ValueError as e:
+            print(f"❌ Error: {e}")
+        except Exception as e:
+            print(f"❌ Error inesperado al reprogramar turno: {e}")
+    
+    def _ver_todos_los_pacientes(self):
+        print("\n👥 TODOS LOS PACIENTES")
+        print("-" * 35)
+        
+        try:
+            filtro = input("Buscar por nombre o DNI (Enter para ver todos): ").strip()
+            if filtro:
+                pacientes = self.clinica.buscar_pacientes(filtro, limite=None)
+            else:
+                pacientes = self.clinica.obtener_pacientes()
+            if pacientes:
+                for i, paciente in enumerate(pacientes, 1):
+                    print(f"{i}. {self.cache.texto(paciente)}")
+                print(f"\nTotal de pacientes: {len(pacientes)}")
+            else:
+                print("No hay pacientes registrados.")
+                
+        except Exception as e:
+            print(f"❌ Error inesperado al ver pacientes: {e}")
+    
+    def _ver_todos_los_medicos(self):
+        print("\n👨‍⚕️ TODOS LOS MÉDICOS")
+        print("-" * 35)
+        
+        try:
+            filtro = input("Buscar por nombre o matrícula (Enter para ver todos): ").strip()
+            medicos = self.clinica.buscar_medicos(filtro, limite=None) if filtro else self.clinica.obtener_medicos()
+            if medicos:
+                for i, medico in enumerate(medicos, 1):
+                    print(f"{i}. {self.cache.texto(medico)}")
+                print(f"\nTotal de médicos: {len(medicos)}")
+            else:
+                print("No hay médicos registrados.")
+                
+        except Exception as e:
+            print(f"❌ Error inesperado al ver médicos: {e}")
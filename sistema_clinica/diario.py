@@ -0,0 +1,189 @@
+from typing import Optional, Tuple
+import json
+import os
+import threading
+
+from .nucleo import Clinica
+from .persistencia import PersistenciaClinica
+
+
+class DiarioOperaciones:
+    ARCHIVO_DIARIO = "diario.jsonl"
+    ARCHIVO_INSTANTANEA = "instantanea.jsonl"
+    ARCHIVO_METADATOS = "instantanea.json"
+    
+    def __init__(self, directorio: str, lote_fsync: int = 256, intervalo_fsync: float = 0.05,
+                 operaciones_por_instantanea: Optional[int] = None):
+        os.makedirs(directorio, exist_ok=True)
+        self.__directorio = directorio
+        self.__lote_fsync = lote_fsync
+        self.__intervalo_fsync = intervalo_fsync
+        self.__operaciones_por_instantanea = operaciones_por_instantanea
+        self.__bloqueo = threading.Lock()
+        self.__secuencia_instantanea, self.__archivo_instantanea, self.__ultimo_id_turno = self._leer_metadatos()
+        self._descartar_registro_incompleto()
+        self._descartar_instantaneas_huerfanas()
+        self.__secuencia = max(self.__secuencia_instantanea, self._ultima_secuencia_del_diario())
+        self.__pendientes = 0
+        self.__operaciones_desde_instantanea = self.__secuencia - self.__secuencia_instantanea
+        self.__archivo = open(self._ruta(self.ARCHIVO_DIARIO), "a", encoding="utf-8")
+        # El hilo de sincronización garantiza que ningún registro espere más de intervalo_fsync en el buffer
+        self.__cerrado = threading.Event()
+        self.__sincronizador = threading.Thread(target=self._sincronizar_periodicamente, daemon=True)
+        self.__sincronizador.start()
+    
+    def registrar(self, tipo: str, fila: dict):
+        with self.__bloqueo:
+            self.__secuencia += 1
+            self.__archivo.write(json.dumps({"seq": self.__secuencia, "registro": tipo, **fila}, ensure_ascii=False))
+            self.__archivo.write("\n")
+            self.__pendientes += 1
+            self.__operaciones_desde_instantanea += 1
+            if self.__pendientes >= self.__lote_fsync:
+                self._sincronizar()
+    
+    def necesita_instantanea(self) -> bool:
+        return (self.__operaciones_por_instantanea is not None and
+                self.__operaciones_desde_instantanea >= self.__operaciones_por_instantanea)
+    
+    def sincronizar(self):
+        with self.__bloqueo:
+            self._sincronizar()
+    
+    def restaurar(self, clinica: Clinica) -> int:
+        persistencia = PersistenciaClinica(clinica)
+        filas = 0
+        ruta_instantanea = self._ruta(self.__archivo_instantanea)
+        if self.__secuencia_instantanea and os.path.exists(ruta_instantanea):
+            filas += persistencia.aplicar_filas(persistencia.leer_jsonl(ruta_instantanea))
+            # La instantánea no tiene los turnos cancelados: sus ids se reservan para no volver a entregarlos
+            clinica.reservar_ids_turno_hasta(self.__ultimo_id_turno)
+        filas += persistencia.aplicar_filas(self.leer_cola())
+        return filas
+    
+    def leer_cola(self):
+        ruta = self._ruta(self.ARCHIVO_DIARIO)
+        if not os.path.exists(ruta):
+            return
+        for tipo, fila, numero in PersistenciaClinica.leer_jsonl(ruta):
+            if fila.pop("seq") > self.__secuencia_instantanea:
+                yield tipo, fila, numero
+    
+    def crear_instantanea(self, clinica: Clinica):
+        with self.__bloqueo:
+            self._sincronizar()
+            # Cada instantánea lleva su secuencia en el nombre y los metadatos la activan con un único os.replace:
+            # un corte en cualquier punto deja una instantánea y una secuencia que se corresponden
+            anterior = self.__archivo_instantanea
+            nombre = f"instantanea-{self.__secuencia:012d}.jsonl"
+            ruta = self._ruta(nombre)
+            PersistenciaClinica(clinica).exportar_jsonl(ruta + ".tmp")
+            self._sincronizar_archivo(ruta + ".tmp")
+            os.replace(ruta + ".tmp", ruta)
+            self._escribir_metadatos(self.__secuencia, nombre, clinica.ultimo_id_turno())
+            self.__secuencia_instantanea = self.__secuencia
+            self.__archivo_instantanea = nombre
+            self.__ultimo_id_turno = clinica.ultimo_id_turno()
+            
+            # La instantánea ya cubre todo el diario: se puede vaciar
+            self._vaciar_diario()
+            self.__operaciones_desde_instantanea = 0
+            if anterior != nombre and os.path.exists(self._ruta(anterior)):
+                os.remove(self._ruta(anterior))
+    
+    def cerrar(self):
+        self.__cerrado.set()
+        self.__sincronizador.join()
+        with self.__bloqueo:
+            self._sincronizar()
+            self.__archivo.close()
+    
+    def __str__(self) -> str:
+        return (f"Diario de operaciones - Secuencia: {self.__secuencia}, "
+                f"Instantánea: {self.__secuencia_instantanea}")
+    
+    @property
+    def secuencia(self) -> int:
+        return self.__secuencia
+    
+    def _sincronizar(self):
+        if self.__pendientes:
+            self.__archivo.flush()
+            os.fsync(self.__archivo.fileno())
+            self.__pendientes = 0
+    
+    def _sincronizar_periodicamente(self):
+        while not self.__cerrado.wait(self.__intervalo_fsync):
+            with self.__bloqueo:
+                if not self.__archivo.closed:
+                    self._sincronizar()
+    
+    def _leer_metadatos(self) -> Tuple[int, str, int]:
+        ruta = self._ruta(self.ARCHIVO_METADATOS)
+        if not os.path.exists(ruta):
+            return 0, self.ARCHIVO_INSTANTANEA, 0
+        with open(ruta, encoding="utf-8") as archivo:
+            metadatos = json.load(archivo)
+        # Los diarios anteriores guardaban la instantánea siempre con el mismo nombre y no tenían el último id
+        return (metadatos["seq"], metadatos.get("instantanea", self.ARCHIVO_INSTANTANEA),
+                metadatos.get("ultimo_id_turno", 0))
+    
+    def _descartar_instantaneas_huerfanas(self):
+        # Quedan de un corte antes de activarse o de borrar la anterior; los metadatos nunca las referencian
+        for nombre in os.listdir(self.__directorio):
+            if nombre.startswith("instantanea-") and nombre != self.__archivo_instantanea:
+                os.remove(self._ruta(nombre))
+    
+    def _escribir_metadatos(self, secuencia: int, nombre: str, ultimo_id_turno: int):
+        ruta = self._ruta(self.ARCHIVO_METADATOS)
+        with open(ruta + ".tmp", "w", encoding="utf-8") as archivo:
+            json.dump({"seq": secuencia, "instantanea": nombre, "ultimo_id_turno": ultimo_id_turno}, archivo)
+        self._sincronizar_archivo(ruta + ".tmp")
+        os.replace(ruta + ".tmp", ruta)
+    
+    def _vaciar_diario(self):
+        self.__archivo.close()
+        self.__archivo = open(self._ruta(self.ARCHIVO_DIARIO), "w", encoding="utf-8")
+    
+    def _ultima_secuencia_del_diario(self) -> int:
+        ruta = self._ruta(self.ARCHIVO_DIARIO)
+        if not os.path.exists(ruta) or os.path.getsize(ruta) == 0:
+            return 0
+        with open(ruta, "rb") as archivo:
+            archivo.seek(max(0, os.path.getsize(ruta) - 65536))
+            lineas = archivo.read().splitlines()
+        for linea in reversed(lineas):
+            try:
+                return json.loads(linea)["seq"]
+            except (ValueError, KeyError):
+                continue
+        return 0
+    
+    def _descartar_registro_incompleto(self):
+        # Un corte durante la escritura puede dejar la última línea a medias: se trunca hasta el último registro
+        # completo
+        ruta = self._ruta(self.ARCHIVO_DIARIO)
+        if not os.path.exists(ruta) or os.path.getsize(ruta) == 0:
+            return
+        with open(ruta, "rb+") as archivo:
+            tamano = os.path.getsize(ruta)
+            posicion = tamano
+            while posicion > 0:
+                inicio = max(0, posicion - 65536)
+                archivo.seek(inicio)
+                bloque = archivo.read(posicion - inicio)
+                salto = bloque.rfind(b"\n")
+                if salto != -1:
+                    posicion = inicio + salto + 1
+                    break
+                posicion = inicio
+            if posicion != tamano:
+                archivo.truncate(posicion)
+    
+    def _ruta(self, nombre: str) -> str:
+        return os.path.join(self.__directorio, nombre)
+    
+    @staticmethod
+    def _sincronizar_archivo(ruta: str):
+        with open(ruta, "rb") as archivo:
+            os.fsync(archivo.fileno())
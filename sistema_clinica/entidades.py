@@ -0,0 +1,638 @@
+from bisect import bisect_left, bisect_right
+from collections.abc import Sequence
+from datetime import datetime, date, timedelta
+from itertools import accumulate, islice
+from typing import List, Optional, Iterable, Tuple
+import sys
+import threading
+
+
+DIAS_SEMANA = ("lunes", "martes", "miércoles", "jueves", "viernes", "sábado", "domingo")
+INDICE_DIA_SEMANA = {dia: numero for numero, dia in enumerate(DIAS_SEMANA)}
+DURACION_TURNO = timedelta(minutes=30)
+
+
+class VistaSoloLectura(Sequence):
+    # Ventana sobre una lista que solo crece: fija su longitud al crearse y nunca copia los datos
+    __slots__ = ("__datos", "__inicio", "__fin")
+    
+    def __init__(self, datos: Sequence, inicio: int = 0, fin: Optional[int] = None):
+        self.__datos = datos
+        self.__inicio = inicio
+        self.__fin = len(datos) if fin is None else min(fin, len(datos))
+    
+    def pagina(self, offset: int = 0, limite: Optional[int] = None) -> 'VistaSoloLectura':
+        fin = len(self) if limite is None else offset + limite
+        return self[offset:fin]
+    
+    def __len__(self) -> int:
+        return max(0, self.__fin - self.__inicio)
+    
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            inicio, fin, paso = indice.indices(len(self))
+            if paso != 1:
+                return tuple(self[i] for i in range(inicio, fin, paso))
+            return VistaSoloLectura(self.__datos, self.__inicio + inicio, self.__inicio + max(inicio, fin))
+        
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError("Índice fuera de rango")
+        return self.__datos[self.__inicio + indice]
+    
+    def __iter__(self):
+        return map(self.__datos.__getitem__, range(self.__inicio, self.__fin))
+    
+    def __eq__(self, otro) -> bool:
+        if isinstance(otro, Sequence) and not isinstance(otro, str):
+            return len(self) == len(otro) and all(a == b for a, b in zip(self, otro))
+        return NotImplemented
+    
+    __hash__ = None
+    
+    def __repr__(self) -> str:
+        return f"VistaSoloLectura({list(self)!r})"
+
+
+class VistaConcatenada(Sequence):
+    # Une dos secuencias (por ejemplo, turnos archivados y turnos en memoria) sin copiarlas
+    __slots__ = ("__primera", "__segunda")
+    
+    def __init__(self, primera: Sequence, segunda: Sequence):
+        self.__primera = primera
+        self.__segunda = segunda
+    
+    def __len__(self) -> int:
+        return len(self.__primera) + len(self.__segunda)
+    
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return VistaSoloLectura(self)[indice]
+        
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError("Índice fuera de rango")
+        largo_primera = len(self.__primera)
+        if indice < largo_primera:
+            return self.__primera[indice]
+        return self.__segunda[indice - largo_primera]
+    
+    def __iter__(self):
+        yield from self.__primera
+        yield from self.__segunda
+    
+    def __eq__(self, otro) -> bool:
+        if isinstance(otro, Sequence) and not isinstance(otro, str):
+            return len(self) == len(otro) and all(a == b for a, b in zip(self, otro))
+        return NotImplemented
+    
+    __hash__ = None
+
+
+class ListaPorBloques:
+    # Lista en orden de alta que admite bajas y reemplazos sin desplazar el resto: cada elemento conserva su ranura
+    # y una baja deja un hueco. Los bloques se copian antes de modificarse, así que una instantánea ya entregada
+    # nunca cambia y una baja cuesta O(TAMANO_BLOQUE) en vez de O(n)
+    TAMANO_BLOQUE = 512
+    
+    def __init__(self, elementos: Iterable = ()):
+        self.__bloqueo = threading.Lock()
+        self.__bloques = []
+        self.__vivos = []
+        self.__con_huecos = set()
+        self.__largo = 0
+        # Bloques y vivos acumulados para las instantáneas; se rearman solo tras una baja, un reemplazo o un bloque
+        # nuevo, no con cada alta
+        self.__fijos = None
+        for elemento in elementos:
+            self.agregar(elemento)
+    
+    def agregar(self, elemento) -> int:
+        with self.__bloqueo:
+            if not self.__bloques or len(self.__bloques[-1]) == self.TAMANO_BLOQUE:
+                self.__bloques.append([])
+                self.__vivos.append(0)
+                self.__fijos = None
+            ranura = (len(self.__bloques) - 1) * self.TAMANO_BLOQUE + len(self.__bloques[-1])
+            self.__bloques[-1].append(elemento)
+            self.__vivos[-1] += 1
+            self.__largo += 1
+            return ranura
+    
+    def quitar(self, ranura: int):
+        with self.__bloqueo:
+            numero, posicion = divmod(ranura, self.TAMANO_BLOQUE)
+            bloque = list(self.__bloques[numero])
+            bloque[posicion] = None
+            self.__vivos[numero] -= 1
+            # Un bloque sin elementos vivos no necesita conservar sus huecos
+            self.__bloques[numero] = bloque if self.__vivos[numero] or numero == len(self.__bloques) - 1 else ()
+            self.__con_huecos.add(numero)
+            self.__largo -= 1
+            self.__fijos = None
+    
+    def reemplazar(self, ranura: int, elemento):
+        with self.__bloqueo:
+            numero, posicion = divmod(ranura, self.TAMANO_BLOQUE)
+            bloque = list(self.__bloques[numero])
+            bloque[posicion] = elemento
+            self.__bloques[numero] = bloque
+            self.__fijos = None
+    
+    def instantanea(self) -> Sequence:
+        with self.__bloqueo:
+            if self.__fijos is None:
+                self.__fijos = (tuple(self.__bloques), tuple(accumulate(self.__vivos[:-1])),
+                                frozenset(self.__con_huecos))
+            return _VistaBloques(*self.__fijos, self.__largo)
+    
+    def __len__(self) -> int:
+        return self.__largo
+
+
+class _VistaBloques(Sequence):
+    # Instantánea de una ListaPorBloques; el último bloque puede seguir creciendo, pero el largo queda fijo
+    __slots__ = ("__bloques", "__finales", "__con_huecos", "__largo")
+    
+    def __init__(self, bloques: tuple, finales: tuple, con_huecos: frozenset, largo: int):
+        self.__bloques = bloques
+        self.__finales = finales
+        self.__con_huecos = con_huecos
+        self.__largo = largo
+    
+    def __len__(self) -> int:
+        return self.__largo
+    
+    def __getitem__(self, indice):
+        if isinstance(indice, slice):
+            return VistaSoloLectura(self)[indice]
+        
+        if indice < 0:
+            indice += self.__largo
+        if not 0 <= indice < self.__largo:
+            raise IndexError("Índice fuera de rango")
+        numero = bisect_right(self.__finales, indice)
+        local = indice - (self.__finales[numero - 1] if numero else 0)
+        bloque = self.__bloques[numero]
+        if numero not in self.__con_huecos:
+            return bloque[local]
+        return next(islice((elemento for elemento in bloque if elemento is not None), local, None))
+    
+    def __iter__(self):
+        vivos = (elemento for bloque in self.__bloques for elemento in bloque if elemento is not None)
+        return islice(vivos, self.__largo)
+    
+    def __eq__(self, otro) -> bool:
+        if isinstance(otro, Sequence) and not isinstance(otro, str):
+            return len(self) == len(otro) and all(a == b for a, b in zip(self, otro))
+        return NotImplemented
+    
+    __hash__ = None
+
+
+class Paciente:
+    __slots__ = ("__nombre", "__dni", "__fecha_nacimiento", "__weakref__")
+    
+    def __init__(self, nombre: str, dni: str, fecha_nacimiento: str):
+        self.__nombre = nombre
+        self.__dni = dni
+        self.__fecha_nacimiento = sys.intern(fecha_nacimiento)
+    
+    def obtener_dni(self) -> str:
+        return self.__dni
+    
+    def __str__(self) -> str:
+        return f"Paciente: {self.__nombre} (DNI: {self.__dni})"
+    
+    @property
+    def nombre(self) -> str:
+        return self.__nombre
+    
+    @property
+    def fecha_nacimiento(self) -> str:
+        return self.__fecha_nacimiento
+
+
+class Medico:
+    __slots__ = ("__nombre", "__matricula", "__especialidades", "__especialidades_por_dia", "__duraciones",
+                 "__version")
+    
+    def __init__(self, nombre: str, matricula: str):
+        self.__nombre = nombre
+        self.__matricula = matricula
+        self.__especialidades = []
+        self.__especialidades_por_dia = ((),) * 7
+        self.__duraciones = {}
+        self.__version = 0
+    
+    def agregar_especialidad(self, especialidad: 'Especialidad'):
+        if especialidad not in self.__especialidades:
+            # La duración es una por tipo: un mismo tipo en otros días tiene que repetirla
+            duracion = self.__duraciones.get(especialidad.tipo)
+            if duracion is not None and duracion != especialidad.duracion:
+                raise ValueError(f"{especialidad.tipo} ya tiene turnos de {duracion // timedelta(minutes=1)} minutos "
+                                 f"para este médico")
+            self.__especialidades.append(especialidad)
+            self.__especialidades_por_dia = self._construir_tabla_dias()
+            self.__duraciones[especialidad.tipo] = especialidad.duracion
+            self.__version += 1
+    
+    def obtener_matricula(self) -> str:
+        return self.__matricula
+    
+    def obtener_especialidad_para_dia(self, dia: str) -> Optional[str]:
+        especialidades = self.obtener_especialidades_para_dia(dia)
+        return especialidades[0] if especialidades else None
+    
+    def obtener_especialidades_para_dia(self, dia: str) -> Tuple[str, ...]:
+        numero = INDICE_DIA_SEMANA.get(dia.lower())
+        return () if numero is None else self.__especialidades_por_dia[numero]
+    
+    def obtener_especialidades_para_dia_semana(self, numero: int) -> Tuple[str, ...]:
+        return self.__especialidades_por_dia[numero]
+    
+    def obtener_duracion(self, especialidad: str) -> timedelta:
+        return self.__duraciones.get(especialidad, DURACION_TURNO)
+    
+    def atiende_varias_especialidades(self, numero: int) -> bool:
+        return len(self.__especialidades_por_dia[numero]) > 1
+    
+    def _construir_tabla_dias(self) -> Tuple[Tuple[str, ...], ...]:
+        tabla = [[] for _ in DIAS_SEMANA]
+        for especialidad in self.__especialidades:
+            for dia in especialidad.dias:
+                numero = INDICE_DIA_SEMANA.get(dia)
+                if numero is not None and especialidad.tipo not in tabla[numero]:
+                    tabla[numero].append(especialidad.tipo)
+        return tuple(tuple(especialidades) for especialidades in tabla)
+    
+    def __str__(self) -> str:
+        especialidades_str = ", ".join([esp.obtener_especialidad() for esp in self.__especialidades])
+        return f"Dr./Dra. {self.__nombre} (Mat: {self.__matricula}) - Especialidades: {especialidades_str}"
+    
+    @property
+    def nombre(self) -> str:
+        return self.__nombre
+    
+    @property
+    def matricula(self) -> str:
+        return self.__matricula
+    
+    @property
+    def especialidades(self) -> Sequence:
+        return VistaSoloLectura(self.__especialidades)
+    
+    @property
+    def version(self) -> int:
+        return self.__version
+
+
+class Turno:
+    __slots__ = ("__paciente", "__medico", "__fecha_hora", "__especialidad", "__id", "__duracion")
+    
+    def __init__(self, paciente: Paciente, medico: Medico, fecha_hora: datetime, especialidad: str,
+                 id_turno: Optional[int] = None, duracion: Optional[timedelta] = None):
+        self.__paciente = paciente
+        self.__medico = medico
+        self.__fecha_hora = fecha_hora
+        self.__especialidad = sys.intern(especialidad)
+        self.__duracion = duracion if duracion is not None else medico.obtener_duracion(self.__especialidad)
+        # Lo asigna la clínica al agendar y se conserva al reprogramar
+        self.__id = id_turno
+    
+    def obtener_medico(self) -> Medico:
+        return self.__medico
+    
+    def obtener_fecha_hora(self) -> datetime:
+        return self.__fecha_hora
+    
+    def __str__(self) -> str:
+        fecha_str = self.__fecha_hora.strftime("%d/%m/%Y %H:%M")
+        return (f"Turno: {fecha_str} - {self.__especialidad} - "
+                f"Paciente: {self.__paciente.nombre} - Médico: {self.__medico.nombre}")
+    
+    @property
+    def paciente(self) -> Paciente:
+        return self.__paciente
+    
+    @property
+    def medico(self) -> Medico:
+        return self.__medico
+    
+    @property
+    def fecha_hora(self) -> datetime:
+        return self.__fecha_hora
+    
+    @property
+    def especialidad(self) -> str:
+        return self.__especialidad
+    
+    @property
+    def id(self) -> Optional[int]:
+        return self.__id
+    
+    @property
+    def duracion(self) -> timedelta:
+        return self.__duracion
+    
+    @property
+    def fin(self) -> datetime:
+        return self.__fecha_hora + self.__duracion
+
+
+class Receta:
+    __slots__ = ("__paciente", "__medico", "__medicamentos", "__fecha")
+    
+    def __init__(self, paciente: Paciente, medico: Medico, medicamentos: List[str], fecha: Optional[datetime] = None):
+        self.__paciente = paciente
+        self.__medico = medico
+        self.__medicamentos = tuple(sys.intern(medicamento) for medicamento in medicamentos)
+        self.__fecha = fecha if fecha is not None else datetime.now()
+    
+    def __str__(self) -> str:
+        medicamentos_str = ", ".join(self.__medicamentos)
+        fecha_str = self.__fecha.strftime("%d/%m/%Y")
+        return (f"Receta del {fecha_str} - "
+                f"Paciente: {self.__paciente.nombre} - "
+                f"Médico: {self.__medico.nombre} - "
+                f"Medicamentos: {medicamentos_str}")
+    
+    @property
+    def paciente(self) -> Paciente:
+        return self.__paciente
+    
+    @property
+    def medico(self) -> Medico:
+        return self.__medico
+    
+    @property
+    def medicamentos(self) -> Sequence:
+        return VistaSoloLectura(self.__medicamentos)
+    
+    @property
+    def fecha(self) -> datetime:
+        return self.__fecha
+
+
+class Especialidad:
+    __slots__ = ("__tipo", "__dias", "__duracion")
+    
+    def __init__(self, tipo: str, dias: List[str], duracion: timedelta = DURACION_TURNO):
+        if duracion <= timedelta(0) or duracion % timedelta(minutes=1):
+            raise ValueError("La duración del turno debe ser una cantidad positiva de minutos")
+        self.__tipo = sys.intern(tipo)
+        self.__dias = tuple(sys.intern(dia.lower()) for dia in dias)
+        self.__duracion = duracion
+    
+    def obtener_especialidad(self) -> str:
+        return self.__tipo
+    
+    def verificar_dia(self, dia: str) -> bool:
+        return dia.lower() in self.__dias
+    
+    def __str__(self) -> str:
+        dias_str = ", ".join(self.__dias)
+        return f"{self.__tipo} (Días: {dias_str})"
+    
+    @property
+    def tipo(self) -> str:
+        return self.__tipo
+    
+    @property
+    def dias(self) -> Sequence:
+        return VistaSoloLectura(self.__dias)
+    
+    @property
+    def duracion(self) -> timedelta:
+        return self.__duracion
+
+
+class HistoriaClinica:
+    __slots__ = ("__paciente", "__turnos", "__recetas", "__archivados", "__version", "__generacion")
+    # Con locks por médico, dos médicos pueden escribir a la vez en la historia del mismo paciente. Un lock por
+    # historia pesaría más que la historia vacía, así que se reparten entre un conjunto fijo de locks
+    _BLOQUEOS = tuple(threading.Lock() for _ in range(64))
+    
+    def __init__(self, paciente: Paciente):
+        self.__paciente = paciente
+        # Las listas se crean con el primer registro: la mayoría de las historias quedan vacías
+        self.__turnos = ()
+        self.__recetas = ()
+        self.__archivados = ()
+        # version cambia con cada alta; generacion solo cuando cambia el orden de los turnos ya registrados
+        self.__version = 0
+        self.__generacion = 0
+    
+    def agregar_turno(self, turno: Turno):
+        with self._bloqueo():
+            if not self.__turnos:
+                self.__turnos = [turno]
+            else:
+                self.__turnos.append(turno)
+            self.__version += 1
+    
+    def agregar_receta(self, receta: Receta):
+        with self._bloqueo():
+            if not self.__recetas:
+                self.__recetas = [receta]
+            else:
+                self.__recetas.append(receta)
+            self.__version += 1
+    
+    # Copia al escribir: las vistas ya entregadas suponen una lista que solo crece. Recorre solo los turnos de este
+    # paciente, no los de la clínica
+    def quitar_turno(self, turno: Turno):
+        with self._bloqueo():
+            turnos = list(self.__turnos)
+            turnos.remove(turno)
+            self.__turnos = turnos
+            self.__version += 1
+            self.__generacion += 1
+    
+    def reemplazar_turno(self, anterior: Turno, nuevo: Turno):
+        with self._bloqueo():
+            turnos = list(self.__turnos)
+            turnos[turnos.index(anterior)] = nuevo
+            self.__turnos = turnos
+            self.__version += 1
+            self.__generacion += 1
+    
+    # Para repositorios que arman la historia en cada consulta: la versión la lleva el repositorio por paciente
+    def asignar_version(self, version: int, generacion: int):
+        self.__version = version
+        self.__generacion = generacion
+    
+    def obtener_turnos(self, offset: int = 0, limite: Optional[int] = None) -> Sequence:
+        return self.turnos.pagina(offset, limite)
+    
+    def obtener_recetas(self, offset: int = 0, limite: Optional[int] = None) -> Sequence:
+        return VistaSoloLectura(self.__recetas).pagina(offset, limite)
+    
+    def archivar_turnos(self, antes_de: datetime, archivados: Sequence):
+        # Los turnos anteriores al corte pasan a leerse del archivo; el resto sigue en memoria
+        with self._bloqueo():
+            self.__turnos = [turno for turno in self.__turnos if turno.fecha_hora >= antes_de] or ()
+            self.__archivados = archivados
+            self.__version += 1
+            self.__generacion += 1
+    
+    def __str__(self) -> str:
+        return (f"Historia Clínica de {self.__paciente.nombre} - "
+                f"Turnos: {len(self.__archivados) + len(self.__turnos)}, Recetas: {len(self.__recetas)}")
+    
+    @property
+    def paciente(self) -> Paciente:
+        return self.__paciente
+    
+    @property
+    def turnos(self) -> Sequence:
+        if not self.__archivados:
+            return VistaSoloLectura(self.__turnos)
+        return VistaSoloLectura(VistaConcatenada(self.__archivados, self.__turnos))
+    
+    @property
+    def recetas(self) -> Sequence:
+        return VistaSoloLectura(self.__recetas)
+    
+    @property
+    def version(self) -> int:
+        return self.__version
+    
+    @property
+    def generacion(self) -> int:
+        return self.__generacion
+    
+    def _bloqueo(self) -> threading.Lock:
+        return self._BLOQUEOS[hash(self.__paciente.obtener_dni()) % len(self._BLOQUEOS)]
+
+
+class AgendaMedico:
+    def __init__(self, medico: Medico):
+        self.__medico = medico
+        self.__fechas = []
+        self.__turnos = []
+        self.__archivados = None
+    
+    def agregar_turno(self, turno: Turno):
+        posicion = bisect_right(self.__fechas, turno.fecha_hora)
+        self.__fechas.insert(posicion, turno.fecha_hora)
+        self.__turnos.insert(posicion, turno)
+    
+    def agregar_turnos(self, turnos: Iterable[Turno]):
+        turnos = list(turnos)
+        # Pocos turnos, como una serie semanal: insertarlos de a uno cuesta menos que reordenar toda la agenda
+        if len(turnos) < 256:
+            for turno in turnos:
+                self.agregar_turno(turno)
+            return
+        self.__turnos.extend(turnos)
+        self.__turnos.sort(key=lambda turno: turno.fecha_hora)
+        self.__fechas = [turno.fecha_hora for turno in self.__turnos]
+    
+    def quitar_turno(self, turno: Turno):
+        # Los horarios de un médico son únicos: la búsqueda binaria encuentra la posición exacta
+        posicion = bisect_left(self.__fechas, turno.fecha_hora)
+        if posicion < len(self.__turnos) and self.__turnos[posicion] is turno:
+            del self.__fechas[posicion]
+            del self.__turnos[posicion]
+    
+    def se_superpone(self, inicio: datetime, fin: datetime, excluir: Optional[int] = None) -> bool:
+        if self.__archivados is not None and self.__archivados.se_superpone(inicio, fin):
+            return True
+        # Los turnos de un médico no se solapan, así que sus finales quedan tan ordenados como sus comienzos:
+        # alcanza con mirar el último turno que empieza antes del final pedido
+        posicion = bisect_left(self.__fechas, fin) if fin > inicio else bisect_right(self.__fechas, inicio)
+        if posicion and excluir is not None and self.__turnos[posicion - 1].id == excluir:
+            posicion -= 1
+        return posicion > 0 and self.__turnos[posicion - 1].fin > inicio
+    
+    def obtener_turnos_entre(self, desde: Optional[datetime] = None, hasta: Optional[datetime] = None) -> Sequence:
+        inicio = 0 if desde is None else bisect_left(self.__fechas, desde)
+        fin = len(self.__fechas) if hasta is None else bisect_left(self.__fechas, hasta)
+        if self.__archivados is None:
+            return self.__turnos[inicio:fin]
+        
+        archivados = self.__archivados.entre(desde, hasta)
+        if not archivados:
+            return self.__turnos[inicio:fin]
+        return VistaConcatenada(archivados, self.__turnos[inicio:fin])
+    
+    def archivar_turnos(self, antes_de: datetime, archivados: 'VistaArchivo'):
+        # La agenda está ordenada: los turnos anteriores al corte son un prefijo
+        posicion = bisect_left(self.__fechas, antes_de)
+        del self.__fechas[:posicion]
+        del self.__turnos[:posicion]
+        self.__archivados = archivados
+    
+    def obtener_turnos_del_dia(self, dia: date) -> Sequence:
+        comienzo = datetime(dia.year, dia.month, dia.day)
+        return self.obtener_turnos_entre(comienzo, comienzo + timedelta(days=1))
+    
+    def horarios_libres(self, especialidad: Optional[str], desde: datetime, duracion: timedelta = timedelta(minutes=30),
+                        apertura: timedelta = timedelta(hours=8), cierre: timedelta = timedelta(hours=18),
+                        dias_maximos: int = 365) -> Iterable[datetime]:
+        # Sin especialidad sirve cualquier día en que el médico atienda alguna
+        dia = datetime(desde.year, desde.month, desde.day)
+        for _ in range(dias_maximos):
+            especialidades = self.__medico.obtener_especialidades_para_dia_semana(dia.weekday())
+            if especialidad in especialidades if especialidad is not None else especialidades:
+                # Solo se leen los turnos de ese día, ya ordenados por la agenda; cada uno ocupa su propia duración
+                ocupados = [(turno.fecha_hora, turno.fin) for turno in self.obtener_turnos_entre(dia, dia + cierre)]
+                candidato = dia + apertura
+                if candidato < desde:
+                    candidato += duracion * -((candidato - desde) // duracion)
+                posicion = 0
+                while candidato + duracion <= dia + cierre:
+                    while posicion < len(ocupados) and ocupados[posicion][1] <= candidato:
+                        posicion += 1
+                    if posicion == len(ocupados) or ocupados[posicion][0] >= candidato + duracion:
+                        yield candidato
+                    candidato += duracion
+            dia += timedelta(days=1)
+    
+    def proximo_horario_libre(self, desde: datetime, intervalo: timedelta = timedelta(minutes=30),
+                              dias_maximos: int = 365, apertura: timedelta = timedelta(hours=8),
+                              cierre: timedelta = timedelta(hours=18)) -> Optional[datetime]:
+        # Mismos días y horario de atención que horarios_libres, en cualquier especialidad del médico
+        return next(iter(self.horarios_libres(None, desde, intervalo, apertura, cierre, dias_maximos)), None)
+    
+    def __len__(self) -> int:
+        return len(self.__turnos) + (0 if self.__archivados is None else len(self.__archivados))
+    
+    def __str__(self) -> str:
+        return f"Agenda de {self.__medico.nombre} - Turnos: {len(self)}"
+    
+    @property
+    def medico(self) -> Medico:
+        return self.__medico
+
+
+class ResultadoLote:
+    def __init__(self):
+        self.__registros = []
+        self.__errores = []
+    
+    def agregar_registro(self, registro):
+        self.__registros.append(registro)
+    
+    def agregar_error(self, fila: int, mensaje: str):
+        self.__errores.append((fila, mensaje))
+    
+    def __str__(self) -> str:
+        if self.exitoso:
+            return f"Lote aplicado - Registros: {len(self.__registros)}"
+        return f"Lote rechazado - Errores: {len(self.__errores)}"
+    
+    @property
+    def exitoso(self) -> bool:
+        return not self.__errores
+    
+    @property
+    def registros(self) -> list:
+        return self.__registros.copy()
+    
+    @property
+    def errores(self) -> List[Tuple[int, str]]:
+        return self.__errores.copy()
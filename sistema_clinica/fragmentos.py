@@ -0,0 +1,262 @@
+from contextlib import ExitStack
+from datetime import datetime
+from typing import List, Optional, Iterable, Tuple
+import multiprocessing
+import threading
+import zlib
+
+from .entidades import Especialidad, HistoriaClinica, Medico, Paciente, Receta, ResultadoLote, Turno
+from .nucleo import Clinica
+
+
+def _historia_fragmento(clinica: Clinica, dni: str):
+    historia = clinica.obtener_historia_clinica(dni)
+    if historia is None:
+        return None
+    return historia.paciente, list(historia.turnos), list(historia.recetas)
+
+
+def _turnos_fragmento(clinica: Clinica) -> List[Turno]:
+    return list(clinica.obtener_turnos())
+
+
+def _medicos_fragmento(clinica: Clinica) -> List[Medico]:
+    return list(clinica.obtener_medicos())
+
+
+# Operaciones que un fragmento acepta del enrutador; las vistas se convierten en listas antes de enviarse
+OPERACIONES_FRAGMENTO = {
+    "agregar_paciente": Clinica.agregar_paciente,
+    "agregar_pacientes_bulk": Clinica.agregar_pacientes_bulk,
+    "agregar_medico": Clinica.agregar_medico,
+    "agregar_medicos_bulk": Clinica.agregar_medicos_bulk,
+    "validar_medicos_bulk": Clinica.validar_medicos_bulk,
+    "agregar_especialidad": Clinica.agregar_especialidad,
+    "agendar_turno": Clinica.agendar_turno,
+    "agendar_turnos_bulk": Clinica.agendar_turnos_bulk,
+    "agendar_serie": Clinica.agendar_serie,
+    "validar_turnos_bulk": Clinica.validar_turnos_bulk,
+    "obtener_turno": Clinica.obtener_turno,
+    "cancelar_turno": Clinica.cancelar_turno,
+    "reprogramar_turno": Clinica.reprogramar_turno,
+    "emitir_receta": Clinica.emitir_receta,
+    "obtener_pacientes": Clinica.obtener_pacientes,
+    "pacientes_con_medicamento": Clinica.pacientes_con_medicamento,
+    "historia": _historia_fragmento,
+    "turnos": _turnos_fragmento,
+    "medicos": _medicos_fragmento,
+}
+
+
+def atender_fragmento(conexion, indice: int = 0, fragmentos: int = 1):
+    # Bucle de cada proceso trabajador: es dueño de una Clinica y responde una solicitud por vez. Cada fragmento
+    # entrega ids de turno de a `fragmentos` desde indice + 1, así que son únicos entre todos
+    clinica = Clinica(primer_id_turno=indice + 1, paso_id_turno=fragmentos)
+    try:
+        while True:
+            try:
+                solicitud = conexion.recv()
+            except EOFError:
+                break
+            if solicitud is None:
+                break
+            operacion, argumentos = solicitud
+            # Cualquier error vuelve como respuesta: si el proceso terminara, el enrutador quedaría esperando
+            try:
+                conexion.send((True, OPERACIONES_FRAGMENTO[operacion](clinica, *argumentos)))
+            except Exception as e:
+                conexion.send((False, str(e)))
+    finally:
+        clinica.cerrar()
+        conexion.close()
+
+
+class ClinicaFragmentada:
+    # Los médicos se reparten por hash de matrícula entre procesos; los pacientes se replican en todos para que
+    # cada fragmento valide sus turnos y recetas sin consultar a los demás
+    def __init__(self, fragmentos: int = 2, metodo_inicio: str = "spawn"):
+        if fragmentos < 1:
+            raise ValueError("La cantidad de fragmentos debe ser al menos 1")
+        
+        contexto = multiprocessing.get_context(metodo_inicio)
+        self.__conexiones = []
+        self.__procesos = []
+        for indice in range(fragmentos):
+            extremo_local, extremo_remoto = contexto.Pipe()
+            proceso = contexto.Process(target=atender_fragmento, args=(extremo_remoto, indice, fragmentos),
+                                       daemon=True)
+            proceso.start()
+            extremo_remoto.close()
+            self.__conexiones.append(extremo_local)
+            self.__procesos.append(proceso)
+        # Un bloqueo por fragmento: solicitudes a fragmentos distintos avanzan en paralelo desde varios hilos
+        self.__bloqueos = [threading.Lock() for _ in range(fragmentos)]
+    
+    def fragmento_de(self, matricula: str) -> int:
+        # crc32 y no hash(): el reparto tiene que ser el mismo en todos los procesos y entre ejecuciones
+        return zlib.crc32(matricula.encode("utf-8")) % len(self.__conexiones)
+    
+    def fragmento_del_turno(self, id_turno: int) -> int:
+        return (id_turno - 1) % len(self.__conexiones)
+    
+    def agregar_paciente(self, paciente: Paciente):
+        self._difundir("agregar_paciente", paciente)
+    
+    def agregar_pacientes_bulk(self, pacientes: Iterable[Paciente]) -> ResultadoLote:
+        # Todos los fragmentos tienen los mismos pacientes, así que todos aceptan o rechazan el lote por igual
+        return self._difundir("agregar_pacientes_bulk", list(pacientes))[0]
+    
+    def agregar_medico(self, medico: Medico):
+        self._solicitar(self.fragmento_de(medico.obtener_matricula()), "agregar_medico", medico)
+    
+    def agregar_medicos_bulk(self, medicos: Iterable[Medico]) -> ResultadoLote:
+        medicos = list(medicos)
+        return self._lote_en_dos_fases(medicos, [medico.obtener_matricula() for medico in medicos],
+                                       "validar_medicos_bulk", "agregar_medicos_bulk")
+    
+    def agregar_especialidad(self, matricula: str, especialidad: Especialidad):
+        self._solicitar(self.fragmento_de(matricula), "agregar_especialidad", matricula, especialidad)
+    
+    def agendar_turno(self, dni: str, matricula: str, especialidad: str, fecha_hora: datetime) -> Turno:
+        return self._solicitar(self.fragmento_de(matricula), "agendar_turno", dni, matricula, especialidad, fecha_hora)
+    
+    def agendar_serie(self, dni: str, matricula: str, especialidad: str, fecha_hora: datetime, repeticiones: int,
+                      cada_semanas: int = 1) -> ResultadoLote:
+        return self._solicitar(self.fragmento_de(matricula), "agendar_serie", dni, matricula, especialidad, fecha_hora,
+                               repeticiones, cada_semanas)
+    
+    def agendar_turnos_bulk(self, filas: Iterable[Tuple[str, str, str, datetime]]) -> ResultadoLote:
+        filas = list(filas)
+        return self._lote_en_dos_fases(filas, [fila[1] for fila in filas], "validar_turnos_bulk",
+                                       "agendar_turnos_bulk")
+    
+    def emitir_receta(self, dni: str, matricula: str, medicamentos: List[str],
+                      fecha: Optional[datetime] = None) -> Receta:
+        return self._solicitar(self.fragmento_de(matricula), "emitir_receta", dni, matricula, medicamentos, fecha)
+    
+    def obtener_historia_clinica(self, dni: str) -> Optional[HistoriaClinica]:
+        partes = [parte for parte in self._difundir("historia", dni) if parte is not None]
+        if not partes:
+            return None
+        
+        historia = HistoriaClinica(partes[0][0])
+        for turno in sorted((turno for _, turnos, _ in partes for turno in turnos), key=lambda t: t.fecha_hora):
+            historia.agregar_turno(turno)
+        for receta in sorted((receta for _, _, recetas in partes for receta in recetas), key=lambda r: r.fecha):
+            historia.agregar_receta(receta)
+        return historia
+    
+    def obtener_turnos(self, offset: int = 0, limite: Optional[int] = None) -> List[Turno]:
+        # El orden de alta no existe entre fragmentos: el listado combinado se ordena por fecha y matrícula
+        turnos = sorted((turno for turnos in self._difundir("turnos") for turno in turnos),
+                        key=lambda turno: (turno.fecha_hora, turno.medico.obtener_matricula()))
+        return turnos[offset:None if limite is None else offset + limite]
+    
+    def obtener_pacientes(self) -> List[Paciente]:
+        return self._solicitar(0, "obtener_pacientes")
+    
+    def obtener_medicos(self) -> List[Medico]:
+        return [medico for medicos in self._difundir("medicos") for medico in medicos]
+    
+    def obtener_estadisticas(self):
+        raise ValueError("Las estadísticas no están disponibles en modo fragmentado")
+    
+    def pacientes_con_medicamento(self, medicamento: str, desde: Optional[datetime] = None,
+                                  hasta: Optional[datetime] = None) -> List[Paciente]:
+        # Cada fragmento indexa sus propias recetas; los pacientes se replican, así que se combinan por dni
+        pacientes = {}
+        for parcial in self._difundir("pacientes_con_medicamento", medicamento, desde, hasta):
+            for paciente in parcial:
+                pacientes.setdefault(paciente.obtener_dni(), paciente)
+        return list(pacientes.values())
+    
+    # El id de turno indica el fragmento que lo entregó, que es el del médico
+    def obtener_turno(self, id_turno: int) -> Optional[Turno]:
+        return self._solicitar(self.fragmento_del_turno(id_turno), "obtener_turno", id_turno)
+    
+    def cancelar_turno(self, id_turno: int) -> Turno:
+        return self._solicitar(self.fragmento_del_turno(id_turno), "cancelar_turno", id_turno)
+    
+    def reprogramar_turno(self, id_turno: int, fecha_hora: datetime) -> Turno:
+        return self._solicitar(self.fragmento_del_turno(id_turno), "reprogramar_turno", id_turno, fecha_hora)
+    
+    def archivar_turnos(self, ruta: str, antes_de: datetime) -> int:
+        raise ValueError("El archivo histórico de turnos no está disponible en modo fragmentado")
+    
+    def cerrar(self):
+        for indice, conexion in enumerate(self.__conexiones):
+            with self.__bloqueos[indice]:
+                if not conexion.closed:
+                    conexion.send(None)
+                    conexion.close()
+        for proceso in self.__procesos:
+            proceso.join()
+    
+    def __str__(self) -> str:
+        return f"Clínica fragmentada - Fragmentos: {len(self.__conexiones)}"
+    
+    @property
+    def fragmentos(self) -> int:
+        return len(self.__conexiones)
+    
+    def _solicitar(self, indice: int, operacion: str, *argumentos):
+        with self.__bloqueos[indice]:
+            self.__conexiones[indice].send((operacion, argumentos))
+            return self._respuesta(indice)
+    
+    def _difundir(self, operacion: str, *argumentos) -> list:
+        # Se envía a todos antes de esperar a ninguno para que los fragmentos trabajen a la vez
+        with ExitStack() as pila:
+            for bloqueo in self.__bloqueos:
+                pila.enter_context(bloqueo)
+            for conexion in self.__conexiones:
+                conexion.send((operacion, argumentos))
+            return self._respuestas(range(len(self.__conexiones)))
+    
+    def _lote_en_dos_fases(self, elementos: list, matriculas: List[str], validar: str, aplicar: str) -> ResultadoLote:
+        # Los lotes que abarcan varios fragmentos se validan en todos antes de aplicarse en alguno; los fragmentos
+        # involucrados quedan bloqueados entre ambas fases, así que el lote sigue siendo todo o nada
+        posiciones = {}
+        for posicion, matricula in enumerate(matriculas):
+            posiciones.setdefault(self.fragmento_de(matricula), []).append(posicion)
+        involucrados = sorted(posiciones)
+        
+        resultado = ResultadoLote()
+        with ExitStack() as pila:
+            for indice in involucrados:
+                pila.enter_context(self.__bloqueos[indice])
+            
+            errores = []
+            validaciones = self._enviar_particiones(involucrados, posiciones, elementos, validar)
+            for indice, parcial in zip(involucrados, validaciones):
+                errores.extend((posiciones[indice][fila], mensaje) for fila, mensaje in parcial.errores)
+            if errores:
+                for fila, mensaje in sorted(errores):
+                    resultado.agregar_error(fila, mensaje)
+                return resultado
+            
+            registros = [None] * len(elementos)
+            aplicados = self._enviar_particiones(involucrados, posiciones, elementos, aplicar)
+            for indice, parcial in zip(involucrados, aplicados):
+                for fila, registro in zip(posiciones[indice], parcial.registros):
+                    registros[fila] = registro
+        for registro in registros:
+            resultado.agregar_registro(registro)
+        return resultado
+    
+    def _enviar_particiones(self, involucrados: List[int], posiciones: dict, elementos: list,
+                            operacion: str) -> List[ResultadoLote]:
+        for indice in involucrados:
+            self.__conexiones[indice].send((operacion, ([elementos[fila] for fila in posiciones[indice]],)))
+        return self._respuestas(involucrados)
+    
+    def _respuesta(self, indice: int):
+        return self._respuestas((indice,))[0]
+    
+    def _respuestas(self, indices: Iterable[int]) -> list:
+        # Se leen todas las respuestas antes de informar un error para no dejar ninguna conexión desfasada
+        respuestas = [self.__conexiones[indice].recv() for indice in indices]
+        for exito, valor in respuestas:
+            if not exito:
+                raise ValueError(valor)
+        return [valor for _, valor in respuestas]
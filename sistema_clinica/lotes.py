@@ -0,0 +1,52 @@
+from typing import Optional, Iterable
+import asyncio
+import json
+import sys
+import time
+
+from .nucleo import Clinica
+from .persistencia import ResumenTransferencia
+from .servicio import ServicioClinica
+
+
+class ProcesadorLotes:
+    # Ejecuta un archivo JSONL con el mismo protocolo del servicio, sin menús ni pausas entre operaciones
+    def __init__(self, clinica: Optional[Clinica] = None, salida=None, solo_errores: bool = False):
+        self.__servicio = ServicioClinica(clinica)
+        self.__salida = salida if salida is not None else sys.stdout
+        self.__solo_errores = solo_errores
+        self.__errores = 0
+    
+    def procesar(self, lineas: Iterable[str]) -> ResumenTransferencia:
+        return asyncio.run(self._procesar(lineas))
+    
+    def procesar_archivo(self, ruta: str) -> ResumenTransferencia:
+        if ruta == "-":
+            return self.procesar(sys.stdin)
+        with open(ruta, encoding="utf-8") as archivo:
+            return self.procesar(archivo)
+    
+    @property
+    def errores(self) -> int:
+        return self.__errores
+    
+    async def _procesar(self, lineas: Iterable[str]) -> ResumenTransferencia:
+        escribir = self.__salida.write
+        operaciones = 0
+        inicio = time.perf_counter()
+        for numero, linea in enumerate(lineas, 1):
+            if not linea.strip():
+                continue
+            operaciones += 1
+            try:
+                respuesta = await self.__servicio.atender(json.loads(linea))
+            except json.JSONDecodeError as e:
+                respuesta = {"ok": False, "error": f"JSON inválido: {e}"}
+            
+            if not respuesta["ok"]:
+                self.__errores += 1
+            elif self.__solo_errores:
+                continue
+            escribir(json.dumps({"linea": numero, **respuesta}, ensure_ascii=False, separators=(",", ":")))
+            escribir("\n")
+        return ResumenTransferencia("lote", operaciones, time.perf_counter() - inicio)
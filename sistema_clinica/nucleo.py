@@ -0,0 +1,1017 @@
+from bisect import bisect_left, bisect_right, insort
+from collections import Counter
+from collections.abc import Sequence
+from contextlib import ExitStack, nullcontext
+from datetime import datetime, date, timedelta
+from heapq import merge
+from itertools import islice
+from typing import List, Dict, Optional, Iterable, Tuple
+import os
+import sys
+import threading
+import unicodedata
+
+from .entidades import (AgendaMedico, DIAS_SEMANA, Especialidad, HistoriaClinica, ListaPorBloques, Medico, Paciente,
+                        Receta, ResultadoLote, Turno, VistaConcatenada, VistaSoloLectura)
+
+
+class IndiceBusqueda:
+    # Índice de prefijos sobre claves "palabra\0identificador" ordenadas; las altas recientes esperan en un
+    # segundo nivel pequeño que se fusiona con el principal cuando crece
+    SEPARADOR = "\0"
+    SIGNOS = str.maketrans({chr(c): " " for c in range(128) if not chr(c).isalnum()})
+    
+    def __init__(self, obtener_entidad, identificador, textos):
+        self.__obtener_entidad = obtener_entidad
+        self.__identificador = identificador
+        self.__textos = textos
+        self.__claves = []
+        self.__recientes = []
+    
+    @classmethod
+    def normalizar(cls, texto: str) -> str:
+        # Minúsculas y sin tildes: "García" y "garcia" son la misma clave; la ñ queda como n
+        texto = texto.casefold()
+        if not texto.isascii():
+            texto = unicodedata.normalize("NFKD", texto).encode("ascii", "ignore").decode("ascii")
+        return texto.translate(cls.SIGNOS)
+    
+    def agregar(self, entidad):
+        for clave in self._claves(entidad):
+            insort(self.__recientes, clave)
+        if len(self.__recientes) > max(1024, len(self.__claves) >> 3):
+            self._fusionar()
+    
+    def agregar_varios(self, entidades: Iterable):
+        self.__recientes.extend(clave for entidad in entidades for clave in self._claves(entidad))
+        self._fusionar()
+    
+    def buscar(self, texto: str, offset: int = 0, limite: Optional[int] = 20) -> list:
+        palabras = self.normalizar(texto).split()
+        if not palabras:
+            return []
+        if all(palabra.isdigit() for palabra in palabras):
+            palabras = ["".join(palabras)]  # "12.345" es un DNI parcial, no dos palabras
+        # Se recorre el rango de la palabra más larga y el resto se verifica sobre cada candidato
+        resto = sorted(palabras, key=len)
+        principal = resto.pop()
+        
+        resultados = []
+        vistos = set()
+        for clave in merge(self._rango(self.__claves, principal), self._rango(self.__recientes, principal)):
+            identificador = clave.rpartition(self.SEPARADOR)[2]
+            if identificador in vistos:
+                continue
+            vistos.add(identificador)
+            entidad = self.__obtener_entidad(identificador)
+            if resto and not self._coincide(entidad, resto):
+                continue
+            if offset:
+                offset -= 1
+                continue
+            resultados.append(entidad)
+            if limite is not None and len(resultados) >= limite:
+                break
+        return resultados
+    
+    def __len__(self) -> int:
+        return len(self.__claves) + len(self.__recientes)
+    
+    def _claves(self, entidad) -> List[str]:
+        identificador = self.__identificador(entidad)
+        sufijo = self.SEPARADOR + identificador
+        return [palabra + sufijo for palabra in set(self._palabras(entidad, identificador))]
+    
+    def _coincide(self, entidad, palabras: List[str]) -> bool:
+        propias = self._palabras(entidad, self.__identificador(entidad))
+        return all(any(propia.startswith(palabra) for propia in propias) for palabra in palabras)
+    
+    def _palabras(self, entidad, identificador: str) -> List[str]:
+        palabras = self.normalizar(" ".join(self.__textos(entidad))).split()
+        if identificador.isascii() and identificador.isalnum():
+            palabras.append(identificador.casefold())
+        else:
+            palabras.append(self.normalizar(identificador).replace(" ", ""))
+        return palabras
+    
+    def _fusionar(self):
+        # Timsort detecta las dos corridas ya ordenadas y las fusiona en tiempo lineal
+        claves = self.__claves + self.__recientes
+        claves.sort()
+        self.__claves = claves
+        self.__recientes = []
+    
+    @staticmethod
+    def _rango(claves: List[str], prefijo: str):
+        posicion = bisect_left(claves, prefijo)
+        while posicion < len(claves) and claves[posicion].startswith(prefijo):
+            yield claves[posicion]
+            posicion += 1
+
+
+class EstadisticasClinica:
+    # Contadores que se actualizan en O(1) con cada alta: consultarlos nunca recorre turnos ni recetas
+    def __init__(self):
+        self.__bloqueo = threading.Lock()
+        self.__turnos = 0
+        self.__recetas = 0
+        self.__turnos_por_medico = Counter()
+        self.__turnos_por_paciente = Counter()
+        self.__turnos_por_especialidad = {}
+        self.__recetas_por_paciente_y_mes = Counter()
+    
+    def registrar_turno(self, turno: Turno, cantidad: int = 1):
+        with self.__bloqueo:
+            self.__turnos += cantidad
+            self.__turnos_por_medico[turno.medico.obtener_matricula()] += cantidad
+            self.__turnos_por_paciente[turno.paciente.obtener_dni()] += cantidad
+            por_dia = self.__turnos_por_especialidad.setdefault(turno.especialidad, Counter())
+            por_dia[turno.fecha_hora.date()] += cantidad
+    
+    def registrar_receta(self, receta: Receta):
+        with self.__bloqueo:
+            self.__recetas += 1
+            clave = (receta.paciente.obtener_dni(), receta.fecha.year, receta.fecha.month)
+            self.__recetas_por_paciente_y_mes[clave] += 1
+    
+    def turnos_medico(self, matricula: str) -> int:
+        return self.__turnos_por_medico[matricula]
+    
+    def turnos_paciente(self, dni: str) -> int:
+        return self.__turnos_por_paciente[dni]
+    
+    def recetas_paciente_en_mes(self, dni: str, anio: int, mes: int) -> int:
+        return self.__recetas_por_paciente_y_mes[(dni, anio, mes)]
+    
+    def turnos_proximos_por_especialidad(self, desde: Optional[datetime] = None) -> Dict[str, int]:
+        # Recorre los días con turnos de cada especialidad, no los turnos
+        dia = (desde or datetime.now()).date()
+        with self.__bloqueo:
+            return {especialidad: sum(cantidad for fecha, cantidad in por_dia.items() if fecha >= dia)
+                    for especialidad, por_dia in self.__turnos_por_especialidad.items()}
+    
+    def resumen(self, desde: Optional[datetime] = None) -> dict:
+        with self.__bloqueo:
+            turnos_por_medico = dict(self.__turnos_por_medico)
+        return {"turnos": self.__turnos, "recetas": self.__recetas, "turnos_por_medico": turnos_por_medico,
+                "turnos_proximos_por_especialidad": self.turnos_proximos_por_especialidad(desde)}
+    
+    def __str__(self) -> str:
+        return (f"Estadísticas - Turnos: {self.__turnos}, Recetas: {self.__recetas}, "
+                f"Médicos con turnos: {len(self.__turnos_por_medico)}")
+    
+    @property
+    def turnos(self) -> int:
+        return self.__turnos
+    
+    @property
+    def recetas(self) -> int:
+        return self.__recetas
+
+
+class IndiceMedicamentos:
+    # Catálogo de medicamentos con un id por nombre normalizado e índice invertido id -> recetas ordenadas por
+    # fecha: una consulta por rango de fechas son dos búsquedas binarias más los k resultados
+    def __init__(self):
+        self.__bloqueo = threading.Lock()
+        self.__ids = {}
+        # Grafía exacta -> id: las recetas repiten los mismos nombres y así se normalizan una sola vez
+        self.__grafias = {}
+        self.__nombres = []
+        self.__fechas = []
+        self.__recetas = []
+    
+    @staticmethod
+    def normalizar(nombre: str) -> str:
+        return " ".join(IndiceBusqueda.normalizar(nombre).split())
+    
+    def registrar_receta(self, receta: Receta):
+        fecha = receta.fecha
+        with self.__bloqueo:
+            for id_medicamento in {self._registrar_nombre(medicamento) for medicamento in receta.medicamentos}:
+                fechas = self.__fechas[id_medicamento]
+                # Las recetas suelen llegar en orden de fecha: casi siempre es un append
+                if not fechas or fechas[-1] <= fecha:
+                    fechas.append(fecha)
+                    self.__recetas[id_medicamento].append(receta)
+                else:
+                    posicion = bisect_right(fechas, fecha)
+                    fechas.insert(posicion, fecha)
+                    self.__recetas[id_medicamento].insert(posicion, receta)
+    
+    def id_medicamento(self, nombre: str) -> Optional[int]:
+        id_medicamento = self.__grafias.get(nombre)
+        return id_medicamento if id_medicamento is not None else self.__ids.get(self.normalizar(nombre))
+    
+    def nombre(self, id_medicamento: int) -> str:
+        return self.__nombres[id_medicamento]
+    
+    def recetas(self, medicamento: str, desde: Optional[datetime] = None,
+                hasta: Optional[datetime] = None) -> Sequence:
+        id_medicamento = self.id_medicamento(medicamento)
+        if id_medicamento is None:
+            return VistaSoloLectura(())
+        with self.__bloqueo:
+            fechas = self.__fechas[id_medicamento]
+            inicio = 0 if desde is None else bisect_left(fechas, desde)
+            fin = len(fechas) if hasta is None else bisect_left(fechas, hasta)
+            return VistaSoloLectura(self.__recetas[id_medicamento][inicio:fin])
+    
+    def pacientes(self, medicamento: str, desde: Optional[datetime] = None,
+                  hasta: Optional[datetime] = None) -> List[Paciente]:
+        return list(dict.fromkeys(receta.paciente for receta in self.recetas(medicamento, desde, hasta)))
+    
+    def medicos(self, medicamento: str, desde: Optional[datetime] = None,
+                hasta: Optional[datetime] = None) -> List[Medico]:
+        return list(dict.fromkeys(receta.medico for receta in self.recetas(medicamento, desde, hasta)))
+    
+    def __len__(self) -> int:
+        return len(self.__nombres)
+    
+    def __str__(self) -> str:
+        return f"Índice de medicamentos - Medicamentos: {len(self.__nombres)}"
+    
+    @property
+    def catalogo(self) -> Sequence:
+        return VistaSoloLectura(self.__nombres)
+    
+    def _registrar_nombre(self, nombre: str) -> int:
+        id_medicamento = self.__grafias.get(nombre)
+        if id_medicamento is not None:
+            return id_medicamento
+        
+        # El catálogo conserva la primera grafía vista; "Ibuprofeno 400mg" e "IBUPROFENO 400MG" comparten id
+        clave = self.normalizar(nombre)
+        id_medicamento = self.__ids.get(clave)
+        if id_medicamento is None:
+            id_medicamento = self.__ids[sys.intern(clave)] = len(self.__nombres)
+            self.__nombres.append(sys.intern(nombre))
+            self.__fechas.append([])
+            self.__recetas.append([])
+        self.__grafias[sys.intern(nombre)] = id_medicamento
+        return id_medicamento
+
+
+class Clinica:
+    def __init__(self, repositorio: Optional['RepositorioClinica'] = None, concurrente: bool = False,
+                 diario: Optional['DiarioOperaciones'] = None, primer_id_turno: int = 1, paso_id_turno: int = 1):
+        self.__repositorio = repositorio if repositorio is not None else RepositorioMemoria()
+        self.__diario = diario
+        self.__concurrente = concurrente
+        # En modo concurrente cada médico tiene su propio lock: las reservas de médicos distintos no se bloquean
+        self.__bloqueo_registro = threading.Lock() if concurrente else nullcontext()
+        self.__bloqueos_medicos = {}
+        # Protege solo la tabla de locks: _bloqueo_total la consulta mientras ya tiene __bloqueo_registro
+        self.__bloqueo_tabla = threading.Lock()
+        # Los índices de búsqueda se construyen con la primera consulta y luego se mantienen en cada alta
+        self.__indice_pacientes = None
+        self.__indice_medicos = None
+        self.__estadisticas = None
+        self.__indice_medicamentos = None
+        # Los ids de turno son estables: se asignan al agendar y se conservan al reprogramar o restaurar. Con un paso
+        # mayor a 1 la clínica solo entrega los ids primer_id_turno + k * paso_id_turno (un fragmento de varios)
+        self.__bloqueo_ids = threading.Lock()
+        self.__primer_id_turno = primer_id_turno
+        self.__paso_id_turno = paso_id_turno
+        self.__ultimo_id_turno = self.__repositorio.ultimo_id_turno()
+    
+    def agregar_paciente(self, paciente: Paciente):
+        dni = paciente.obtener_dni()
+        with self.__bloqueo_registro:
+            if self.__repositorio.existe_paciente(dni):
+                raise ValueError(f"Ya existe un paciente con DNI {dni}")
+            
+            self.__repositorio.guardar_pacientes([paciente])
+            self._registrar_en_diario("paciente", paciente)
+            if self.__indice_pacientes is not None:
+                self.__indice_pacientes.agregar(paciente)
+        self._verificar_instantanea()
+    
+    def agregar_medico(self, medico: Medico):
+        matricula = medico.obtener_matricula()
+        with self.__bloqueo_registro:
+            if self.__repositorio.existe_medico(matricula):
+                raise ValueError(f"Ya existe un médico con matrícula {matricula}")
+            
+            self.__repositorio.guardar_medicos([medico])
+            self._registrar_medico_en_diario(medico)
+            if self.__indice_medicos is not None:
+                self.__indice_medicos.agregar(medico)
+        self._verificar_instantanea()
+    
+    def agregar_especialidad(self, matricula: str, especialidad: Especialidad):
+        medico = self.__repositorio.obtener_medico(matricula)
+        if medico is None:
+            raise ValueError(f"No existe médico con matrícula {matricula}")
+        
+        with self._bloqueo_medico(matricula):
+            if especialidad not in medico.especialidades:
+                medico.agregar_especialidad(especialidad)
+                self.__repositorio.guardar_especialidad(matricula, especialidad)
+                self._registrar_en_diario("especialidad", matricula, especialidad)
+        self._verificar_instantanea()
+    
+    def obtener_pacientes(self) -> List[Paciente]:
+        return self.__repositorio.listar_pacientes()
+    
+    def obtener_medicos(self) -> List[Medico]:
+        return self.__repositorio.listar_medicos()
+    
+    def obtener_medico_por_matricula(self, matricula: str) -> Optional[Medico]:
+        return self.__repositorio.obtener_medico(matricula)
+    
+    # Búsqueda por nombre, DNI o matrícula
+    def buscar_pacientes(self, texto: str, offset: int = 0, limite: Optional[int] = 20) -> List[Paciente]:
+        with self.__bloqueo_registro:
+            if self.__indice_pacientes is None:
+                self.__indice_pacientes = IndiceBusqueda(self.__repositorio.obtener_paciente,
+                                                         Paciente.obtener_dni, lambda p: (p.nombre,))
+                self.__indice_pacientes.agregar_varios(self.__repositorio.listar_pacientes())
+        return self.__indice_pacientes.buscar(texto, offset, limite)
+    
+    def buscar_medicos(self, texto: str, offset: int = 0, limite: Optional[int] = 20) -> List[Medico]:
+        with self.__bloqueo_registro:
+            if self.__indice_medicos is None:
+                self.__indice_medicos = IndiceBusqueda(self.__repositorio.obtener_medico,
+                                                       Medico.obtener_matricula, lambda m: (m.nombre,))
+                self.__indice_medicos.agregar_varios(self.__repositorio.listar_medicos())
+        return self.__indice_medicos.buscar(texto, offset, limite)
+    
+    def agendar_turno(self, dni: str, matricula: str, especialidad: str, fecha_hora: datetime):
+        with self._bloqueo_medico(matricula):
+            paciente, medico = self._validar_turno(dni, matricula, especialidad, fecha_hora)
+            turno = Turno(paciente, medico, fecha_hora, especialidad, self._nuevo_id_turno())
+            self.__repositorio.guardar_turnos([turno])
+            self._registrar_en_diario("turno", turno)
+            if self.__estadisticas is not None:
+                self.__estadisticas.registrar_turno(turno)
+        self._verificar_instantanea()
+        return turno
+    
+    def obtener_turnos(self, offset: int = 0, limite: Optional[int] = None) -> Sequence:
+        return self.__repositorio.listar_turnos(offset, limite)
+    
+    # Cancelación y reprogramación por id de turno
+    def obtener_turno(self, id_turno: int) -> Optional[Turno]:
+        return self.__repositorio.obtener_turno(id_turno)
+    
+    def cancelar_turno(self, id_turno: int) -> Turno:
+        turno = self._obtener_turno_existente(id_turno)
+        with self._bloqueo_medico(turno.medico.obtener_matricula()):
+            # Se vuelve a leer con el lock tomado: otro hilo pudo cancelarlo o moverlo mientras tanto
+            turno = self._obtener_turno_existente(id_turno)
+            self.__repositorio.cancelar_turno(turno)
+            self._registrar_en_diario("cancelacion", turno)
+            if self.__estadisticas is not None:
+                self.__estadisticas.registrar_turno(turno, -1)
+        self._verificar_instantanea()
+        return turno
+    
+    def reprogramar_turno(self, id_turno: int, fecha_hora: datetime) -> Turno:
+        turno = self._obtener_turno_existente(id_turno)
+        matricula = turno.medico.obtener_matricula()
+        with self._bloqueo_medico(matricula):
+            # Validación y reemplazo ocurren con el mismo lock que usa agendar_turno para este médico
+            turno = self._obtener_turno_existente(id_turno)
+            paciente, medico = self._validar_turno(turno.paciente.obtener_dni(), matricula, turno.especialidad,
+                                                   fecha_hora, excluir=id_turno)
+            nuevo = Turno(paciente, medico, fecha_hora, turno.especialidad, id_turno)
+            self.__repositorio.reemplazar_turno(turno, nuevo)
+            self._registrar_en_diario("reprogramacion", nuevo)
+            if self.__estadisticas is not None:
+                self.__estadisticas.registrar_turno(turno, -1)
+                self.__estadisticas.registrar_turno(nuevo)
+        self._verificar_instantanea()
+        return nuevo
+    
+    # Agenda por médico
+    def obtener_turnos_medico(self, matricula: str, desde: Optional[datetime] = None,
+                              hasta: Optional[datetime] = None) -> Sequence:
+        return self._obtener_agenda(matricula).obtener_turnos_entre(desde, hasta)
+    
+    def obtener_turnos_medico_del_dia(self, matricula: str, dia: date) -> Sequence:
+        return self._obtener_agenda(matricula).obtener_turnos_del_dia(dia)
+    
+    def proximo_horario_libre(self, matricula: str, desde: datetime, intervalo: timedelta = timedelta(minutes=30),
+                              apertura: timedelta = timedelta(hours=8),
+                              cierre: timedelta = timedelta(hours=18)) -> Optional[datetime]:
+        return self._obtener_agenda(matricula).proximo_horario_libre(desde, intervalo, apertura=apertura,
+                                                                     cierre=cierre)
+    
+    def buscar_horarios_libres(self, especialidad: str, desde: datetime, cantidad: Optional[int] = None,
+                               matriculas: Optional[Iterable[str]] = None,
+                               duracion: Optional[timedelta] = None, apertura: timedelta = timedelta(hours=8),
+                               cierre: timedelta = timedelta(hours=18),
+                               dias_maximos: int = 365) -> Iterable[Tuple[datetime, Medico]]:
+        # Sin duración explícita cada médico ofrece horarios del largo que tiene configurado para la especialidad
+        if duracion is not None and duracion <= timedelta(0):
+            raise ValueError("La duración del turno debe ser positiva")
+        if matriculas is None:
+            agendas = [self._obtener_agenda(medico.obtener_matricula()) for medico in self.obtener_medicos()
+                       if any(esp.tipo == especialidad for esp in medico.especialidades)]
+        else:
+            agendas = [self._obtener_agenda(matricula) for matricula in matriculas]
+        
+        # Cada agenda genera sus horarios en orden; merge los intercala por fecha sin calcular de más
+        horarios = merge(*(self._horarios_libres_de_agenda(agenda, especialidad, desde, duracion, apertura, cierre,
+                                                           dias_maximos) for agenda in agendas),
+                         key=lambda horario: (horario[0], horario[1].obtener_matricula()))
+        return horarios if cantidad is None else islice(horarios, cantidad)
+    
+    def emitir_receta(self, dni: str, matricula: str, medicamentos: List[str], fecha: Optional[datetime] = None):
+        paciente = self.__repositorio.obtener_paciente(dni)
+        if paciente is None:
+            raise ValueError(f"No existe paciente con DNI {dni}")
+        
+        medico = self.__repositorio.obtener_medico(matricula)
+        if medico is None:
+            raise ValueError(f"No existe médico con matrícula {matricula}")
+        
+        receta = Receta(paciente, medico, medicamentos, fecha)
+        with self._bloqueo_medico(matricula):
+            self.__repositorio.guardar_receta(receta)
+            self._registrar_en_diario("receta", receta)
+            if self.__estadisticas is not None:
+                self.__estadisticas.registrar_receta(receta)
+            if self.__indice_medicamentos is not None:
+                self.__indice_medicamentos.registrar_receta(receta)
+        self._verificar_instantanea()
+        
+        return receta
+    
+    # Carga masiva
+    def agregar_pacientes_bulk(self, pacientes: Iterable[Paciente]) -> ResultadoLote:
+        resultado = ResultadoLote()
+        nuevos = {}
+        with self.__bloqueo_registro:
+            for fila, paciente in enumerate(pacientes):
+                dni = paciente.obtener_dni()
+                if dni in nuevos or self.__repositorio.existe_paciente(dni):
+                    resultado.agregar_error(fila, f"Ya existe un paciente con DNI {dni}")
+                else:
+                    nuevos[dni] = paciente
+            
+            if resultado.exitoso:
+                self.__repositorio.guardar_pacientes(list(nuevos.values()))
+                for paciente in nuevos.values():
+                    resultado.agregar_registro(paciente)
+                    self._registrar_en_diario("paciente", paciente)
+                if self.__indice_pacientes is not None:
+                    self.__indice_pacientes.agregar_varios(nuevos.values())
+        self._verificar_instantanea()
+        return resultado
+    
+    def agregar_medicos_bulk(self, medicos: Iterable[Medico]) -> ResultadoLote:
+        resultado = ResultadoLote()
+        with self.__bloqueo_registro:
+            nuevos = self._preparar_medicos(medicos, resultado)
+            if resultado.exitoso:
+                self.__repositorio.guardar_medicos(list(nuevos.values()))
+                for medico in nuevos.values():
+                    resultado.agregar_registro(medico)
+                    self._registrar_medico_en_diario(medico)
+                if self.__indice_medicos is not None:
+                    self.__indice_medicos.agregar_varios(nuevos.values())
+        self._verificar_instantanea()
+        return resultado
+    
+    def agendar_turnos_bulk(self, filas: Iterable[Tuple[str, str, str, datetime]]) -> ResultadoLote:
+        filas = list(filas)
+        resultado = ResultadoLote()
+        with self._bloqueo_medicos({fila[1] for fila in filas}):
+            turnos = self._preparar_turnos(filas, resultado)
+            if resultado.exitoso:
+                self._confirmar_turnos(turnos, resultado)
+        self._verificar_instantanea()
+        return resultado
+    
+    def agendar_serie(self, dni: str, matricula: str, especialidad: str, fecha_hora: datetime, repeticiones: int,
+                      cada_semanas: int = 1) -> ResultadoLote:
+        # Turnos en el mismo día y horario cada cada_semanas semanas; se agendan todos o ninguno y los errores
+        # indican las fechas en conflicto
+        if repeticiones < 1:
+            raise ValueError("La serie debe tener al menos un turno")
+        if cada_semanas < 1:
+            raise ValueError("La frecuencia de la serie debe ser de al menos una semana")
+        
+        fechas = [fecha_hora + timedelta(weeks=cada_semanas * i) for i in range(repeticiones)]
+        resultado = ResultadoLote()
+        with self._bloqueo_medico(matricula):
+            # Todas las fechas caen el mismo día de la semana: paciente, médico y días de atención se validan una
+            # sola vez y por fecha solo queda buscar superposiciones en la agenda
+            paciente, medico = self._validar_participantes(dni, matricula, especialidad, fecha_hora)
+            duracion = medico.obtener_duracion(especialidad)
+            if duracion > timedelta(weeks=cada_semanas):
+                raise ValueError("Los turnos de la serie se superponen entre sí")
+            agenda = self._obtener_agenda(matricula)
+            for fila, fecha in enumerate(fechas):
+                if agenda.se_superpone(fecha, fecha + duracion):
+                    resultado.agregar_error(fila, f"{fecha.strftime('%d/%m/%Y %H:%M')}: ya existe un turno para "
+                                                  "ese médico que se superpone con ese horario")
+            if resultado.exitoso:
+                self._confirmar_turnos([Turno(paciente, medico, fecha, especialidad, id_turno, duracion)
+                                        for fecha, id_turno in zip(fechas, self._reservar_ids_turno(len(fechas)))],
+                                       resultado)
+        self._verificar_instantanea()
+        return resultado
+    
+    # Validación de lotes sin aplicarlos: los errores son los mismos que devolvería la carga masiva
+    def validar_medicos_bulk(self, medicos: Iterable[Medico]) -> ResultadoLote:
+        resultado = ResultadoLote()
+        with self.__bloqueo_registro:
+            self._preparar_medicos(medicos, resultado)
+        return resultado
+    
+    def validar_turnos_bulk(self, filas: Iterable[Tuple[str, str, str, datetime]]) -> ResultadoLote:
+        filas = list(filas)
+        resultado = ResultadoLote()
+        with self._bloqueo_medicos({fila[1] for fila in filas}):
+            self._preparar_turnos(filas, resultado, crear=False)
+        return resultado
+    
+    def obtener_historia_clinica(self, dni: str) -> Optional[HistoriaClinica]:
+        return self.__repositorio.obtener_historia_clinica(dni)
+    
+    # Estadísticas: se calculan completas una sola vez y luego se mantienen en cada alta
+    def obtener_estadisticas(self) -> EstadisticasClinica:
+        if self.__estadisticas is None:
+            with self._bloqueo_total():
+                if self.__estadisticas is None:
+                    estadisticas = EstadisticasClinica()
+                    for turno in self.obtener_turnos():
+                        estadisticas.registrar_turno(turno)
+                    for paciente in self.obtener_pacientes():
+                        for receta in self.obtener_historia_clinica(paciente.obtener_dni()).obtener_recetas():
+                            estadisticas.registrar_receta(receta)
+                    self.__estadisticas = estadisticas
+        return self.__estadisticas
+    
+    def obtener_indice_medicamentos(self) -> IndiceMedicamentos:
+        if self.__indice_medicamentos is None:
+            with self._bloqueo_total():
+                if self.__indice_medicamentos is None:
+                    # Recorridas por paciente las recetas quedan fuera de orden; ordenadas antes, cada alta es un append
+                    recetas = [receta for paciente in self.obtener_pacientes()
+                               for receta in self.obtener_historia_clinica(paciente.obtener_dni()).obtener_recetas()]
+                    recetas.sort(key=lambda receta: receta.fecha)
+                    indice = IndiceMedicamentos()
+                    for receta in recetas:
+                        indice.registrar_receta(receta)
+                    self.__indice_medicamentos = indice
+        return self.__indice_medicamentos
+    
+    def pacientes_con_medicamento(self, medicamento: str, desde: Optional[datetime] = None,
+                                  hasta: Optional[datetime] = None) -> List[Paciente]:
+        return self.obtener_indice_medicamentos().pacientes(medicamento, desde, hasta)
+    
+    # Validaciones y Utilidades
+    def validar_existencia_paciente(self, dni: str) -> bool:
+        return self.__repositorio.existe_paciente(dni)
+    
+    def validar_existencia_medico(self, matricula: str) -> bool:
+        return self.__repositorio.existe_medico(matricula)
+    
+    def validar_turno_no_duplicado(self, medico: Medico, fecha_hora: datetime) -> bool:
+        return not self._verificar_turno_duplicado(medico, fecha_hora)
+    
+    def obtener_dia_semana_turno(self, fecha_hora: datetime) -> str:
+        return self._obtener_dia_semana(fecha_hora)
+    
+    def obtener_especialidad_disponible(self, medico: Medico, dia_semana: str) -> Optional[str]:
+        return medico.obtener_especialidad_para_dia(dia_semana)
+    
+    def validar_especialidad_y_disponibilidad(self, medico: Medico, especialidad_solicitada: str,
+                                              dia_semana: str) -> bool:
+        return especialidad_solicitada in medico.obtener_especialidades_para_dia(dia_semana)
+    
+    # Diario de operaciones
+    @classmethod
+    def restaurar(cls, diario: 'DiarioOperaciones', repositorio: Optional['RepositorioClinica'] = None,
+                  concurrente: bool = False) -> 'Clinica':
+        clinica = cls(repositorio, concurrente)
+        diario.restaurar(clinica)
+        clinica.__diario = diario
+        return clinica
+    
+    def crear_instantanea(self):
+        if self.__diario is None:
+            raise ValueError("La clínica no tiene un diario de operaciones")
+        # Se excluyen todas las escrituras para que la instantánea coincida con la secuencia del diario
+        with self._bloqueo_total():
+            self.__diario.crear_instantanea(self)
+    
+    # El último id entregado sigue reservado aunque ese turno se haya cancelado
+    def ultimo_id_turno(self) -> int:
+        with self.__bloqueo_ids:
+            return self.__ultimo_id_turno
+    
+    def reservar_ids_turno_hasta(self, ultimo: int):
+        self._nuevo_id_turno(ultimo)
+    
+    # Archivo histórico
+    def archivar_turnos(self, ruta: str, antes_de: datetime) -> int:
+        with self._bloqueo_total():
+            return self.__repositorio.archivar_turnos(ruta, antes_de)
+    
+    def cerrar(self):
+        if self.__diario is not None:
+            self.__diario.cerrar()
+        self.__repositorio.cerrar()
+    
+    def _validar_turno(self, dni: str, matricula: str, especialidad: str, fecha_hora: datetime,
+                       excluir: Optional[int] = None) -> Tuple[Paciente, Medico]:
+        paciente, medico = self._validar_participantes(dni, matricula, especialidad, fecha_hora)
+        if self.__repositorio.existe_superposicion(matricula, fecha_hora,
+                                                   fecha_hora + medico.obtener_duracion(especialidad), excluir):
+            raise ValueError("Ya existe un turno para ese médico que se superpone con ese horario")
+        
+        return paciente, medico
+    
+    def _validar_participantes(self, dni: str, matricula: str, especialidad: str,
+                               fecha_hora: datetime) -> Tuple[Paciente, Medico]:
+        paciente = self.__repositorio.obtener_paciente(dni)
+        if paciente is None:
+            raise ValueError(f"No existe paciente con DNI {dni}")
+        
+        medico = self.__repositorio.obtener_medico(matricula)
+        if medico is None:
+            raise ValueError(f"No existe médico con matrícula {matricula}")
+        
+        if especialidad not in medico.obtener_especialidades_para_dia_semana(fecha_hora.weekday()):
+            raise ValueError(f"El médico no atiende {especialidad} los {self._obtener_dia_semana(fecha_hora)}")
+        
+        return paciente, medico
+    
+    def _preparar_medicos(self, medicos: Iterable[Medico], resultado: ResultadoLote) -> Dict[str, Medico]:
+        nuevos = {}
+        for fila, medico in enumerate(medicos):
+            matricula = medico.obtener_matricula()
+            if matricula in nuevos or self.__repositorio.existe_medico(matricula):
+                resultado.agregar_error(fila, f"Ya existe un médico con matrícula {matricula}")
+            else:
+                nuevos[matricula] = medico
+        return nuevos
+    
+    def _preparar_turnos(self, filas: List[tuple], resultado: ResultadoLote, crear: bool = True) -> List[Turno]:
+        # Cada fila es (dni, matrícula, especialidad, fecha_hora) y opcionalmente el id con que fue exportado
+        validos = []
+        # Comienzos y finales ordenados de los turnos ya aceptados en el lote, por médico
+        horarios_del_lote = {}
+        ids_del_lote = set()
+        for fila, (dni, matricula, especialidad, fecha_hora, *id_turno) in enumerate(filas):
+            try:
+                paciente, medico = self._validar_turno(dni, matricula, especialidad, fecha_hora)
+            except ValueError as e:
+                resultado.agregar_error(fila, str(e))
+                continue
+            
+            inicios, fines = horarios_del_lote.setdefault(matricula, ([], []))
+            fin = fecha_hora + medico.obtener_duracion(especialidad)
+            posicion = bisect_left(inicios, fin)
+            if posicion and fines[posicion - 1] > fecha_hora:
+                if inicios[posicion - 1] == fecha_hora:
+                    resultado.agregar_error(fila, "El turno está repetido dentro del lote")
+                else:
+                    resultado.agregar_error(fila, "El turno se superpone con otro turno del lote")
+                continue
+            id_turno = id_turno[0] if id_turno else None
+            if id_turno is not None:
+                if id_turno in ids_del_lote or self.__repositorio.obtener_turno(id_turno) is not None:
+                    resultado.agregar_error(fila, f"Ya existe un turno con id {id_turno}")
+                    continue
+                ids_del_lote.add(id_turno)
+            inicios.insert(posicion, fecha_hora)
+            fines.insert(posicion, fin)
+            validos.append((paciente, medico, fecha_hora, especialidad, id_turno))
+        
+        # Los ids se asignan solo si el lote se va a aplicar
+        if not crear or not resultado.exitoso:
+            return []
+        return [Turno(paciente, medico, fecha_hora, especialidad, self._nuevo_id_turno(id_turno))
+                for paciente, medico, fecha_hora, especialidad, id_turno in validos]
+    
+    def _confirmar_turnos(self, turnos: List[Turno], resultado: ResultadoLote):
+        self.__repositorio.guardar_turnos(turnos)
+        for turno in turnos:
+            resultado.agregar_registro(turno)
+            self._registrar_en_diario("turno", turno)
+            if self.__estadisticas is not None:
+                self.__estadisticas.registrar_turno(turno)
+    
+    def _nuevo_id_turno(self, id_turno: Optional[int] = None) -> int:
+        with self.__bloqueo_ids:
+            if id_turno is None:
+                self.__ultimo_id_turno = self._siguiente_id_turno()
+                return self.__ultimo_id_turno
+            self.__ultimo_id_turno = max(self.__ultimo_id_turno, id_turno)
+            return id_turno
+    
+    def _reservar_ids_turno(self, cantidad: int) -> range:
+        with self.__bloqueo_ids:
+            ids = range(self._siguiente_id_turno(), self._siguiente_id_turno() + cantidad * self.__paso_id_turno,
+                        self.__paso_id_turno)
+            if ids:
+                self.__ultimo_id_turno = ids[-1]
+            return ids
+    
+    def _siguiente_id_turno(self) -> int:
+        if self.__ultimo_id_turno < self.__primer_id_turno:
+            return self.__primer_id_turno
+        distancia = (self.__ultimo_id_turno - self.__primer_id_turno) % self.__paso_id_turno
+        return self.__ultimo_id_turno + self.__paso_id_turno - distancia
+    
+    def _obtener_turno_existente(self, id_turno: int) -> Turno:
+        turno = self.__repositorio.obtener_turno(id_turno)
+        if turno is None:
+            raise ValueError(f"No existe turno con id {id_turno}")
+        return turno
+    
+    def _registrar_en_diario(self, tipo: str, *datos):
+        # Las filas solo se arman si hay diario; el módulo de persistencia ya está cargado en ese caso
+        if self.__diario is not None:
+            from .persistencia import PersistenciaClinica
+            self.__diario.registrar(tipo, getattr(PersistenciaClinica, f"fila_{tipo}")(*datos))
+    
+    def _registrar_medico_en_diario(self, medico: Medico):
+        if self.__diario is not None:
+            self._registrar_en_diario("medico", medico)
+            for especialidad in medico.especialidades:
+                self._registrar_en_diario("especialidad", medico.obtener_matricula(), especialidad)
+    
+    def _verificar_instantanea(self):
+        if self.__diario is not None and self.__diario.necesita_instantanea():
+            self.crear_instantanea()
+    
+    def _bloqueo_medico(self, matricula: str):
+        if not self.__concurrente:
+            return nullcontext()
+        bloqueo = self.__bloqueos_medicos.get(matricula)
+        if bloqueo is None:
+            with self.__bloqueo_tabla:
+                bloqueo = self.__bloqueos_medicos.setdefault(matricula, threading.Lock())
+        return bloqueo
+    
+    def _bloqueo_medicos(self, matriculas: Iterable[str]) -> ExitStack:
+        # Se adquieren siempre en el mismo orden para evitar interbloqueos entre lotes
+        pila = ExitStack()
+        for matricula in sorted(matriculas):
+            pila.enter_context(self._bloqueo_medico(matricula))
+        return pila
+    
+    @staticmethod
+    def _horarios_libres_de_agenda(agenda: AgendaMedico, especialidad: str, desde: datetime,
+                                   duracion: Optional[timedelta], apertura: timedelta, cierre: timedelta,
+                                   dias_maximos: int):
+        medico = agenda.medico
+        if duracion is None:
+            duracion = medico.obtener_duracion(especialidad)
+        for fecha_hora in agenda.horarios_libres(especialidad, desde, duracion, apertura, cierre, dias_maximos):
+            yield fecha_hora, medico
+    
+    def _bloqueo_total(self) -> ExitStack:
+        pila = ExitStack()
+        pila.enter_context(self.__bloqueo_registro)
+        pila.enter_context(self._bloqueo_medicos(m.obtener_matricula() for m in self.obtener_medicos()))
+        return pila
+    
+    def _obtener_agenda(self, matricula: str) -> AgendaMedico:
+        agenda = self.__repositorio.obtener_agenda(matricula)
+        if agenda is None:
+            raise ValueError(f"No existe médico con matrícula {matricula}")
+        return agenda
+    
+    def _obtener_dia_semana(self, fecha_hora: datetime) -> str:
+        return DIAS_SEMANA[fecha_hora.weekday()]
+    
+    def _verificar_turno_duplicado(self, medico: Medico, fecha_hora: datetime) -> bool:
+        # Ocupado si algún turno del médico cubre ese instante
+        return self.__repositorio.existe_superposicion(medico.obtener_matricula(), fecha_hora, fecha_hora)
+    
+    def __str__(self) -> str:
+        return (f"Clínica - Pacientes: {self.__repositorio.contar_pacientes()}, "
+                f"Médicos: {self.__repositorio.contar_medicos()}, Turnos: {self.__repositorio.contar_turnos()}")
+
+
+class ClinicaException(Exception):
+    pass
+
+
+# ===================== REPOSITORIOS =====================
+
+class RepositorioClinica:
+    def existe_paciente(self, dni: str) -> bool:
+        raise NotImplementedError
+    
+    def obtener_paciente(self, dni: str) -> Optional[Paciente]:
+        raise NotImplementedError
+    
+    def listar_pacientes(self) -> List[Paciente]:
+        raise NotImplementedError
+    
+    def guardar_pacientes(self, pacientes: List[Paciente]):
+        raise NotImplementedError
+    
+    def existe_medico(self, matricula: str) -> bool:
+        raise NotImplementedError
+    
+    def obtener_medico(self, matricula: str) -> Optional[Medico]:
+        raise NotImplementedError
+    
+    def listar_medicos(self) -> List[Medico]:
+        raise NotImplementedError
+    
+    def guardar_medicos(self, medicos: List[Medico]):
+        raise NotImplementedError
+    
+    def guardar_especialidad(self, matricula: str, especialidad: Especialidad):
+        raise NotImplementedError
+    
+    def existe_superposicion(self, matricula: str, inicio: datetime, fin: datetime,
+                             excluir: Optional[int] = None) -> bool:
+        raise NotImplementedError
+    
+    def guardar_turnos(self, turnos: List[Turno]):
+        raise NotImplementedError
+    
+    def listar_turnos(self, offset: int = 0, limite: Optional[int] = None) -> Sequence:
+        raise NotImplementedError
+    
+    def obtener_turno(self, id_turno: int) -> Optional[Turno]:
+        raise NotImplementedError
+    
+    def cancelar_turno(self, turno: Turno):
+        raise NotImplementedError
+    
+    def reemplazar_turno(self, anterior: Turno, nuevo: Turno):
+        raise NotImplementedError
+    
+    def ultimo_id_turno(self) -> int:
+        raise NotImplementedError
+    
+    def obtener_agenda(self, matricula: str) -> Optional[AgendaMedico]:
+        raise NotImplementedError
+    
+    def guardar_receta(self, receta: Receta):
+        raise NotImplementedError
+    
+    def obtener_historia_clinica(self, dni: str) -> Optional[HistoriaClinica]:
+        raise NotImplementedError
+    
+    def contar_pacientes(self) -> int:
+        raise NotImplementedError
+    
+    def contar_medicos(self) -> int:
+        raise NotImplementedError
+    
+    def contar_turnos(self) -> int:
+        raise NotImplementedError
+    
+    def archivar_turnos(self, ruta: str, antes_de: datetime) -> int:
+        raise NotImplementedError
+    
+    def cerrar(self):
+        pass
+
+
+class RepositorioMemoria(RepositorioClinica):
+    def __init__(self):
+        self.__pacientes = {}
+        self.__medicos = {}
+        # Turnos por id en orden de alta. La lista para paginar conserva la ranura de cada turno: cancelar o
+        # reprogramar solo copia el bloque que lo contiene
+        self.__turnos = {}
+        self.__lista_turnos = ListaPorBloques()
+        self.__ranuras = {}
+        self.__agendas = {}
+        self.__historias_clinicas = {}
+        self.__archivo = None
+        self.__ultimo_id_cancelado = 0
+    
+    def existe_paciente(self, dni: str) -> bool:
+        return dni in self.__pacientes
+    
+    def obtener_paciente(self, dni: str) -> Optional[Paciente]:
+        return self.__pacientes.get(dni)
+    
+    def listar_pacientes(self) -> List[Paciente]:
+        return list(self.__pacientes.values())
+    
+    def guardar_pacientes(self, pacientes: List[Paciente]):
+        for paciente in pacientes:
+            self.__pacientes[paciente.obtener_dni()] = paciente
+            self.__historias_clinicas[paciente.obtener_dni()] = HistoriaClinica(paciente)
+    
+    def existe_medico(self, matricula: str) -> bool:
+        return matricula in self.__medicos
+    
+    def obtener_medico(self, matricula: str) -> Optional[Medico]:
+        return self.__medicos.get(matricula)
+    
+    def listar_medicos(self) -> List[Medico]:
+        return list(self.__medicos.values())
+    
+    def guardar_medicos(self, medicos: List[Medico]):
+        for medico in medicos:
+            self.__medicos[medico.obtener_matricula()] = medico
+            self.__agendas[medico.obtener_matricula()] = AgendaMedico(medico)
+    
+    def guardar_especialidad(self, matricula: str, especialidad: Especialidad):
+        pass
+    
+    def existe_superposicion(self, matricula: str, inicio: datetime, fin: datetime,
+                             excluir: Optional[int] = None) -> bool:
+        agenda = self.__agendas.get(matricula)
+        return agenda is not None and agenda.se_superpone(inicio, fin, excluir)
+    
+    def guardar_turnos(self, turnos: List[Turno]):
+        turnos_por_medico = {}
+        for turno in turnos:
+            matricula = turno.medico.obtener_matricula()
+            self.__turnos[turno.id] = turno
+            self.__ranuras[turno.id] = self.__lista_turnos.agregar(turno)
+            self.__historias_clinicas[turno.paciente.obtener_dni()].agregar_turno(turno)
+            turnos_por_medico.setdefault(matricula, []).append(turno)
+        
+        for matricula, turnos_medico in turnos_por_medico.items():
+            if len(turnos_medico) == 1:
+                self.__agendas[matricula].agregar_turno(turnos_medico[0])
+            else:
+                self.__agendas[matricula].agregar_turnos(turnos_medico)
+    
+    def listar_turnos(self, offset: int = 0, limite: Optional[int] = None) -> Sequence:
+        turnos = self.__lista_turnos.instantanea()
+        if self.__archivo is None:
+            return VistaSoloLectura(turnos).pagina(offset, limite)
+        return VistaSoloLectura(VistaConcatenada(self.__archivo.turnos(), turnos)).pagina(offset, limite)
+    
+    def obtener_turno(self, id_turno: int) -> Optional[Turno]:
+        return self.__turnos.get(id_turno)
+    
+    def cancelar_turno(self, turno: Turno):
+        self.__ultimo_id_cancelado = max(self.__ultimo_id_cancelado, turno.id)
+        del self.__turnos[turno.id]
+        self.__lista_turnos.quitar(self.__ranuras.pop(turno.id))
+        self.__historias_clinicas[turno.paciente.obtener_dni()].quitar_turno(turno)
+        self.__agendas[turno.medico.obtener_matricula()].quitar_turno(turno)
+    
+    def reemplazar_turno(self, anterior: Turno, nuevo: Turno):
+        # El turno conserva su lugar en el orden de alta
+        self.__turnos[anterior.id] = nuevo
+        self.__lista_turnos.reemplazar(self.__ranuras[anterior.id], nuevo)
+        self.__historias_clinicas[nuevo.paciente.obtener_dni()].reemplazar_turno(anterior, nuevo)
+        agenda = self.__agendas[nuevo.medico.obtener_matricula()]
+        agenda.quitar_turno(anterior)
+        agenda.agregar_turno(nuevo)
+    
+    def ultimo_id_turno(self) -> int:
+        ultimo = max(max(self.__turnos, default=0), self.__ultimo_id_cancelado)
+        if self.__archivo is not None:
+            ultimo = max(ultimo, max((fila[4] or 0 for fila in self.__archivo.filas()), default=0))
+        return ultimo
+    
+    def obtener_agenda(self, matricula: str) -> Optional[AgendaMedico]:
+        return self.__agendas.get(matricula)
+    
+    def guardar_receta(self, receta: Receta):
+        self.__historias_clinicas[receta.paciente.obtener_dni()].agregar_receta(receta)
+    
+    def obtener_historia_clinica(self, dni: str) -> Optional[HistoriaClinica]:
+        return self.__historias_clinicas.get(dni)
+    
+    def contar_pacientes(self) -> int:
+        return len(self.__pacientes)
+    
+    def contar_medicos(self) -> int:
+        return len(self.__medicos)
+    
+    def contar_turnos(self) -> int:
+        return len(self.__turnos) + (0 if self.__archivo is None else len(self.__archivo))
+    
+    def archivar_turnos(self, ruta: str, antes_de: datetime) -> int:
+        from .archivo import ArchivoTurnos
+        archivados = [turno for turno in self.__turnos.values() if turno.fecha_hora < antes_de]
+        if not archivados:
+            return 0
+        
+        # Se reescribe el archivo con los turnos ya archivados más los nuevos, conservando el orden de alta; los
+        # archivados se copian por columnas desde el archivo actual
+        nuevos = [(turno.paciente.obtener_dni(), turno.medico.obtener_matricula(), turno.especialidad,
+                   turno.fecha_hora, turno.id) for turno in archivados]
+        ArchivoTurnos.escribir(ruta + ".tmp", nuevos, self.__archivo)
+        os.replace(ruta + ".tmp", ruta)
+        self.__archivo = ArchivoTurnos(ruta, self.obtener_paciente, self.obtener_medico)
+        
+        self.__turnos = {id_turno: turno for id_turno, turno in self.__turnos.items() if turno.fecha_hora >= antes_de}
+        self.__lista_turnos = ListaPorBloques()
+        self.__ranuras = {id_turno: self.__lista_turnos.agregar(turno) for id_turno, turno in self.__turnos.items()}
+        for dni in self.__archivo.dnis:
+            self.__historias_clinicas[dni].archivar_turnos(antes_de, self.__archivo.turnos_paciente(dni))
+        for matricula in self.__archivo.matriculas:
+            self.__agendas[matricula].archivar_turnos(antes_de, self.__archivo.turnos_medico(matricula))
+        # El archivo anterior no se cierra: cada vista entregada antes lo referencia y lo sigue leyendo aunque su ruta
+        # ya apunte al nuevo; se libera cuando la última de esas vistas deja de usarse
+        return len(archivados)
+    
+    def cerrar(self):
+        if self.__archivo is not None:
+            self.__archivo.cerrar()
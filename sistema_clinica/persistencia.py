@@ -0,0 +1,238 @@
+from datetime import datetime, timedelta
+from typing import Optional
+import csv
+import json
+import os
+import time
+
+from .entidades import DURACION_TURNO, Especialidad, Medico, Paciente, Receta, Turno
+from .nucleo import Clinica
+
+
+class ResumenTransferencia:
+    def __init__(self, operacion: str, filas: int, segundos: float):
+        self.__operacion = operacion
+        self.__filas = filas
+        self.__segundos = segundos
+    
+    def __str__(self) -> str:
+        return (f"{self.__operacion}: {self.__filas} filas en {self.__segundos:.2f} s "
+                f"({self.filas_por_segundo:,.0f} filas/s)")
+    
+    @property
+    def filas(self) -> int:
+        return self.__filas
+    
+    @property
+    def segundos(self) -> float:
+        return self.__segundos
+    
+    @property
+    def filas_por_segundo(self) -> float:
+        return self.__filas / self.__segundos if self.__segundos > 0 else float(self.__filas)
+
+
+class PersistenciaClinica:
+    ARCHIVOS_CSV = {
+        "paciente": ("pacientes.csv", ["nombre", "dni", "fecha_nacimiento"]),
+        "medico": ("medicos.csv", ["nombre", "matricula"]),
+        "especialidad": ("especialidades.csv", ["matricula", "tipo", "dias", "duracion"]),
+        "turno": ("turnos.csv", ["dni", "matricula", "especialidad", "fecha_hora", "id"]),
+        "receta": ("recetas.csv", ["dni", "matricula", "fecha", "medicamentos"]),
+    }
+    SEPARADOR_LISTAS = "|"
+    
+    def __init__(self, clinica: Clinica):
+        self.__clinica = clinica
+    
+    # Exportación
+    def exportar_jsonl(self, ruta: str) -> ResumenTransferencia:
+        comienzo = time.perf_counter()
+        filas = 0
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            for tipo, fila in self.iterar_filas():
+                fila["registro"] = tipo
+                archivo.write(json.dumps(fila, ensure_ascii=False))
+                archivo.write("\n")
+                filas += 1
+        return ResumenTransferencia("Exportación JSONL", filas, time.perf_counter() - comienzo)
+    
+    def exportar_csv(self, directorio: str) -> ResumenTransferencia:
+        comienzo = time.perf_counter()
+        os.makedirs(directorio, exist_ok=True)
+        archivos = {}
+        escritores = {}
+        filas = 0
+        try:
+            for tipo, (nombre_archivo, columnas) in self.ARCHIVOS_CSV.items():
+                archivos[tipo] = open(os.path.join(directorio, nombre_archivo), "w", encoding="utf-8", newline="")
+                escritores[tipo] = csv.DictWriter(archivos[tipo], fieldnames=columnas)
+                escritores[tipo].writeheader()
+            
+            for tipo, fila in self.iterar_filas():
+                for columna, valor in fila.items():
+                    if isinstance(valor, list):
+                        fila[columna] = self.SEPARADOR_LISTAS.join(valor)
+                escritores[tipo].writerow(fila)
+                filas += 1
+        finally:
+            for archivo in archivos.values():
+                archivo.close()
+        return ResumenTransferencia("Exportación CSV", filas, time.perf_counter() - comienzo)
+    
+    def iterar_filas(self):
+        for paciente in self.__clinica.obtener_pacientes():
+            yield "paciente", self.fila_paciente(paciente)
+        
+        for medico in self.__clinica.obtener_medicos():
+            yield "medico", self.fila_medico(medico)
+            for especialidad in medico.especialidades:
+                yield "especialidad", self.fila_especialidad(medico.obtener_matricula(), especialidad)
+        
+        for turno in self.__clinica.obtener_turnos():
+            yield "turno", self.fila_turno(turno)
+        
+        for paciente in self.__clinica.obtener_pacientes():
+            for receta in self.__clinica.obtener_historia_clinica(paciente.obtener_dni()).obtener_recetas():
+                yield "receta", self.fila_receta(receta)
+    
+    @staticmethod
+    def fila_paciente(paciente: Paciente) -> dict:
+        return {"nombre": paciente.nombre, "dni": paciente.obtener_dni(), "fecha_nacimiento": paciente.fecha_nacimiento}
+    
+    @staticmethod
+    def fila_medico(medico: Medico) -> dict:
+        return {"nombre": medico.nombre, "matricula": medico.obtener_matricula()}
+    
+    @staticmethod
+    def fila_especialidad(matricula: str, especialidad: Especialidad) -> dict:
+        return {"matricula": matricula, "tipo": especialidad.tipo, "dias": list(especialidad.dias),
+                "duracion": especialidad.duracion // timedelta(minutes=1)}
+    
+    @staticmethod
+    def fila_turno(turno: Turno) -> dict:
+        return {"dni": turno.paciente.obtener_dni(), "matricula": turno.medico.obtener_matricula(),
+                "especialidad": turno.especialidad, "fecha_hora": turno.fecha_hora.isoformat(), "id": turno.id}
+    
+    # Cancelaciones y reprogramaciones solo aparecen en el diario: una exportación ya refleja su efecto
+    @staticmethod
+    def fila_cancelacion(turno: Turno) -> dict:
+        return {"id": turno.id}
+    
+    @staticmethod
+    def fila_reprogramacion(turno: Turno) -> dict:
+        return {"id": turno.id, "fecha_hora": turno.fecha_hora.isoformat()}
+    
+    @staticmethod
+    def fila_receta(receta: Receta) -> dict:
+        return {"dni": receta.paciente.obtener_dni(), "matricula": receta.medico.obtener_matricula(),
+                "fecha": receta.fecha.isoformat(), "medicamentos": list(receta.medicamentos)}
+    
+    # Importación
+    def importar_jsonl(self, ruta: str) -> ResumenTransferencia:
+        comienzo = time.perf_counter()
+        filas = self.aplicar_filas(self.leer_jsonl(ruta))
+        return ResumenTransferencia("Importación JSONL", filas, time.perf_counter() - comienzo)
+    
+    def importar_csv(self, directorio: str) -> ResumenTransferencia:
+        comienzo = time.perf_counter()
+        filas = self.aplicar_filas(self._leer_csv(directorio))
+        return ResumenTransferencia("Importación CSV", filas, time.perf_counter() - comienzo)
+    
+    @staticmethod
+    def leer_jsonl(ruta: str):
+        with open(ruta, encoding="utf-8") as archivo:
+            for numero, linea in enumerate(archivo, 1):
+                if not linea.strip():
+                    continue
+                fila = json.loads(linea)
+                yield fila.pop("registro", None), fila, numero
+    
+    def _leer_csv(self, directorio: str):
+        for tipo, (nombre_archivo, _) in self.ARCHIVOS_CSV.items():
+            ruta = os.path.join(directorio, nombre_archivo)
+            if not os.path.exists(ruta):
+                continue
+            with open(ruta, encoding="utf-8", newline="") as archivo:
+                for numero, fila in enumerate(csv.DictReader(archivo), 2):
+                    for columna in ("dias", "medicamentos"):
+                        if columna in fila:
+                            fila[columna] = fila[columna].split(self.SEPARADOR_LISTAS) if fila[columna] else []
+                    yield tipo, fila, numero
+    
+    def aplicar_filas(self, filas, tamano_lote: int = 10_000) -> int:
+        # Las corridas de pacientes y turnos consecutivos se cargan con las operaciones masivas
+        total = 0
+        lote = []
+        for tipo, fila, numero in filas:
+            if lote and (tipo != lote[0][0] or len(lote) >= tamano_lote):
+                self._aplicar_lote(lote)
+                lote = []
+            if tipo in ("paciente", "turno"):
+                lote.append((tipo, fila, numero))
+            else:
+                self.aplicar_fila(tipo, fila, numero)
+            total += 1
+        if lote:
+            self._aplicar_lote(lote)
+        return total
+    
+    def _aplicar_lote(self, lote: list):
+        tipo = lote[0][0]
+        try:
+            if tipo == "paciente":
+                resultado = self.__clinica.agregar_pacientes_bulk(
+                    Paciente(fila["nombre"], fila["dni"], fila["fecha_nacimiento"]) for _, fila, _ in lote
+                )
+            else:
+                resultado = self.__clinica.agendar_turnos_bulk(
+                    (fila["dni"], fila["matricula"], fila["especialidad"], datetime.fromisoformat(fila["fecha_hora"]),
+                     self._id_turno(fila))
+                    for _, fila, _ in lote
+                )
+        except (KeyError, ValueError) as e:
+            raise ValueError(f"Fila {lote[0][2]} ({tipo}): {e}") from e
+        
+        if not resultado.exitoso:
+            indice, mensaje = resultado.errores[0]
+            raise ValueError(f"Fila {lote[indice][2]} ({tipo}): {mensaje}")
+    
+    def aplicar_fila(self, tipo: Optional[str], fila: dict, numero: int):
+        try:
+            if tipo == "paciente":
+                self.__clinica.agregar_paciente(Paciente(fila["nombre"], fila["dni"], fila["fecha_nacimiento"]))
+            elif tipo == "medico":
+                self.__clinica.agregar_medico(Medico(fila["nombre"], fila["matricula"]))
+            elif tipo == "especialidad":
+                self.__clinica.agregar_especialidad(fila["matricula"], Especialidad(fila["tipo"], fila["dias"],
+                                                                                    self._duracion(fila)))
+            elif tipo == "turno":
+                # Por la carga masiva para conservar el id con que se exportó el turno
+                resultado = self.__clinica.agendar_turnos_bulk([(fila["dni"], fila["matricula"], fila["especialidad"],
+                                                                 datetime.fromisoformat(fila["fecha_hora"]),
+                                                                 self._id_turno(fila))])
+                if not resultado.exitoso:
+                    raise ValueError(resultado.errores[0][1])
+            elif tipo == "cancelacion":
+                self.__clinica.cancelar_turno(int(fila["id"]))
+            elif tipo == "reprogramacion":
+                self.__clinica.reprogramar_turno(int(fila["id"]), datetime.fromisoformat(fila["fecha_hora"]))
+            elif tipo == "receta":
+                self.__clinica.emitir_receta(fila["dni"], fila["matricula"], fila["medicamentos"],
+                                             datetime.fromisoformat(fila["fecha"]))
+            else:
+                raise ValueError(f"Tipo de registro desconocido: {tipo}")
+        except (KeyError, ValueError) as e:
+            raise ValueError(f"Fila {numero} ({tipo}): {e}") from e
+    
+    @staticmethod
+    def _duracion(fila: dict) -> timedelta:
+        # Exportaciones anteriores a las duraciones por especialidad usan la duración por defecto
+        valor = fila.get("duracion")
+        return timedelta(minutes=int(valor)) if valor not in (None, "") else DURACION_TURNO
+    
+    @staticmethod
+    def _id_turno(fila: dict) -> Optional[int]:
+        # Exportaciones anteriores no tienen id; en CSV llega como texto y vacío si no se conocía
+        valor = fila.get("id")
+        return int(valor) if valor not in (None, "") else None
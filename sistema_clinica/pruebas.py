@@ -0,0 +1,1886 @@
+from datetime import datetime, date, timedelta
+from typing import List
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import threading
+import unittest
+
+from .entidades import (DIAS_SEMANA, DURACION_TURNO, Especialidad, HistoriaClinica, ListaPorBloques, Medico, Paciente,
+                        Receta, Turno)
+from .nucleo import Clinica
+from .repositorio_sqlite import RepositorioSQLite
+from .persistencia import PersistenciaClinica
+from .diario import DiarioOperaciones
+from .analitica import AnaliticaClinica, np
+from .servicio import ServicioClinica
+from .lotes import ProcesadorLotes
+from .cli import CacheRender, ClinicaCLI
+from .fragmentos import ClinicaFragmentada
+from .benchmarks import GeneradorClinica, comparar_benchmarks, suite_benchmarks
+
+
+class TestPacientesYMedicos(unittest.TestCase):
+    
+    def setUp(self):
+        self.clinica = Clinica()
+        self.paciente1 = Paciente("Juan Pérez", "12345678", "01/01/1990")
+        self.paciente2 = Paciente("María García", "87654321", "15/05/1985")
+        self.medico1 = Medico("Dr. López", "MAT001")
+        self.medico2 = Medico("Dra. Martínez", "MAT002")
+    
+    def test_registro_exitoso_pacientes(self):
+        self.clinica.agregar_paciente(self.paciente1)
+        self.clinica.agregar_paciente(self.paciente2)
+        
+        pacientes = self.clinica.obtener_pacientes()
+        self.assertEqual(len(pacientes), 2)
+        self.assertIn(self.paciente1, pacientes)
+        self.assertIn(self.paciente2, pacientes)
+    
+    def test_registro_exitoso_medicos(self):
+        self.clinica.agregar_medico(self.medico1)
+        self.clinica.agregar_medico(self.medico2)
+        
+        medicos = self.clinica.obtener_medicos()
+        self.assertEqual(len(medicos), 2)
+        self.assertIn(self.medico1, medicos)
+        self.assertIn(self.medico2, medicos)
+    
+    def test_prevencion_registros_duplicados_dni(self):
+        self.clinica.agregar_paciente(self.paciente1)
+        
+        paciente_duplicado = Paciente("Otro Nombre", "12345678", "02/02/1992")
+        with self.assertRaises(ValueError) as context:
+            self.clinica.agregar_paciente(paciente_duplicado)
+        self.assertIn("Ya existe un paciente con DNI", str(context.exception))
+    
+    def test_prevencion_registros_duplicados_matricula(self):
+        self.clinica.agregar_medico(self.medico1)
+        
+        medico_duplicado = Medico("Otro Doctor", "MAT001")
+        with self.assertRaises(ValueError) as context:
+            self.clinica.agregar_medico(medico_duplicado)
+        self.assertIn("Ya existe un médico con matrícula", str(context.exception))
+    
+    def test_entidades_sin_diccionario_de_instancia(self):
+        turno = Turno(self.paciente1, self.medico1, datetime(2024, 1, 8, 10, 0), "Cardiología")
+        receta = Receta(self.paciente1, self.medico1, ["Paracetamol 500mg"])
+        for entidad in (self.paciente1, self.medico1, turno, receta, HistoriaClinica(self.paciente1)):
+            self.assertFalse(hasattr(entidad, "__dict__"))
+        self.assertEqual(str(turno), "Turno: 08/01/2024 10:00 - Cardiología - Paciente: Juan Pérez - Médico: Dr. López")
+    
+    def test_cadenas_repetidas_internadas(self):
+        especialidad = Especialidad("".join(["Cardio", "logía"]), ["".join(["Lu", "nes"])])
+        receta = Receta(self.paciente1, self.medico1, ["".join(["Aspi", "rina"])])
+        self.assertIs(especialidad.tipo, sys.intern("Cardiología"))
+        self.assertIs(especialidad.dias[0], sys.intern("lunes"))
+        self.assertIs(receta.medicamentos[0], sys.intern("Aspirina"))
+    
+    def test_verificacion_errores_datos_faltantes(self):
+        with self.assertRaises(TypeError):
+            Paciente("", "", "")
+        
+        with self.assertRaises(TypeError):
+            Medico("", "")
+
+
+class TestEspecialidades(unittest.TestCase):
+    def setUp(self):
+        self.medico = Medico("Dr. Especialista", "MAT003")
+        self.especialidad1 = Especialidad("Cardiología", ["lunes", "miércoles", "viernes"])
+        self.especialidad2 = Especialidad("Neurología", ["martes", "jueves"])
+        self.especialidad3 = Especialidad("Cardiología", ["sábado"])
+    
+    def test_agregar_especialidades_nuevas(self):
+        self.medico.agregar_especialidad(self.especialidad1)
+        especialidades = self.medico.especialidades
+        self.assertEqual(len(especialidades), 1)
+        self.assertIn(self.especialidad1, especialidades)
+        
+        self.medico.agregar_especialidad(self.especialidad2)
+        especialidades = self.medico.especialidades
+        self.assertEqual(len(especialidades), 2)
+        self.assertIn(self.especialidad2, especialidades)
+    
+    def test_evitar_duplicados_especialidad(self):
+        self.medico.agregar_especialidad(self.especialidad1)
+        especialidades_antes = len(self.medico.especialidades)
+        
+        self.medico.agregar_especialidad(self.especialidad1)
+        especialidades_despues = len(self.medico.especialidades)
+        
+        self.assertEqual(especialidades_antes, especialidades_despues)
+    
+    def test_deteccion_especialidades_dias_invalidos(self):
+        especialidad_invalida = Especialidad("Pediatría", ["día_inexistente", "otro_día_malo"])
+        self.medico.agregar_especialidad(especialidad_invalida)
+        
+        self.assertIsNone(self.medico.obtener_especialidad_para_dia("lunes"))
+        self.assertIsNone(self.medico.obtener_especialidad_para_dia("martes"))
+    
+    def test_tabla_de_dias_precalculada(self):
+        self.medico.agregar_especialidad(self.especialidad1)
+        self.medico.agregar_especialidad(self.especialidad2)
+        self.assertEqual(self.medico.obtener_especialidades_para_dia_semana(0), ("Cardiología",))
+        self.assertEqual(self.medico.obtener_especialidades_para_dia_semana(3), ("Neurología",))
+        self.assertEqual(self.medico.obtener_especialidades_para_dia_semana(6), ())
+        self.assertEqual(self.medico.obtener_especialidad_para_dia("Martes"), "Neurología")
+    
+    def test_varias_especialidades_mismo_dia(self):
+        self.medico.agregar_especialidad(self.especialidad1)
+        self.medico.agregar_especialidad(Especialidad("Clínica Médica", ["lunes"]))
+        self.assertEqual(self.medico.obtener_especialidades_para_dia("lunes"), ("Cardiología", "Clínica Médica"))
+        self.assertTrue(self.medico.atiende_varias_especialidades(0))
+        self.assertFalse(self.medico.atiende_varias_especialidades(2))
+        
+        clinica = Clinica()
+        clinica.agregar_medico(self.medico)
+        clinica.agregar_paciente(Paciente("Ana Torres", "11111111", "20/03/1992"))
+        turno = clinica.agendar_turno("11111111", "MAT003", "Clínica Médica", datetime(2024, 1, 8, 10, 0))
+        self.assertEqual(turno.especialidad, "Clínica Médica")
+        self.assertTrue(clinica.validar_especialidad_y_disponibilidad(self.medico, "Clínica Médica", "lunes"))
+    
+    def test_error_agregar_especialidad_medico_no_registrado(self):
+        clinica = Clinica()
+        self.medico.agregar_especialidad(self.especialidad1)
+        self.assertEqual(len(self.medico.especialidades), 1)
+    
+    def test_agregar_especialidad_desde_clinica(self):
+        clinica = Clinica()
+        with self.assertRaises(ValueError) as context:
+            clinica.agregar_especialidad("MAT003", self.especialidad1)
+        self.assertIn("No existe médico con matrícula", str(context.exception))
+        
+        clinica.agregar_medico(self.medico)
+        clinica.agregar_especialidad("MAT003", self.especialidad2)
+        clinica.agregar_especialidad("MAT003", self.especialidad2)
+        self.assertEqual(self.medico.especialidades, [self.especialidad2])
+
+
+class TestBusquedaPorNombre(unittest.TestCase):
+    def setUp(self):
+        self.clinica = Clinica()
+        for nombre, dni in (("Ana García", "30111222"), ("José Pérez", "30999888"), ("Ángela Garcés", "28111222"),
+                            ("María José Gómez", "41000111")):
+            self.clinica.agregar_paciente(Paciente(nombre, dni, "01/01/1990"))
+        medico = Medico("Dra. Lucía Núñez", "MAT020")
+        self.clinica.agregar_medico(medico)
+    
+    def _nombres(self, pacientes) -> List[str]:
+        return [paciente.nombre for paciente in pacientes]
+    
+    def test_prefijo_sin_tildes_ni_mayusculas(self):
+        self.assertEqual(self._nombres(self.clinica.buscar_pacientes("GARC")), ["Ángela Garcés", "Ana García"])
+        self.assertEqual(self._nombres(self.clinica.buscar_pacientes("jose")), ["José Pérez", "María José Gómez"])
+        self.assertEqual(self._nombres(self.clinica.buscar_pacientes("garcia an")), ["Ana García"])
+    
+    def test_dni_parcial(self):
+        self.assertEqual(self._nombres(self.clinica.buscar_pacientes("30.")), ["Ana García", "José Pérez"])
+        self.assertEqual(self._nombres(self.clinica.buscar_pacientes("28.111")), ["Ángela Garcés"])
+    
+    def test_paginado_y_altas_posteriores(self):
+        self.clinica.buscar_pacientes("a")
+        self.clinica.agregar_paciente(Paciente("Andrés Garay", "35000000", "01/01/1990"))
+        self.clinica.agregar_pacientes_bulk([Paciente("Gabriel Garrido", "36000000", "01/01/1990")])
+        encontrados = self._nombres(self.clinica.buscar_pacientes("ga", limite=None))
+        self.assertEqual(len(encontrados), 4)
+        self.assertEqual(self._nombres(self.clinica.buscar_pacientes("ga", 1, 2)), encontrados[1:3])
+        self.assertEqual(self.clinica.buscar_pacientes("zz"), [])
+        self.assertEqual(self.clinica.buscar_pacientes("  "), [])
+    
+    def test_busqueda_de_medicos(self):
+        self.assertEqual([m.obtener_matricula() for m in self.clinica.buscar_medicos("nunez")], ["MAT020"])
+        self.assertEqual([m.obtener_matricula() for m in self.clinica.buscar_medicos("mat02")], ["MAT020"])
+
+
+class TestTurnos(unittest.TestCase):
+    def setUp(self):
+        self.clinica = Clinica()
+        self.paciente = Paciente("Ana Torres", "11111111", "20/03/1992")
+        self.medico = Medico("Dr. Turno", "MAT004")
+        self.especialidad = Especialidad("Dermatología", ["lunes", "miércoles", "viernes"])
+        
+        self.medico.agregar_especialidad(self.especialidad)
+        
+        self.clinica.agregar_paciente(self.paciente)
+        self.clinica.agregar_medico(self.medico)
+        
+        self.fecha_lunes = datetime(2024, 1, 8, 10, 0)
+        self.fecha_martes = datetime(2024, 1, 9, 14, 0)
+    
+    def test_agendamiento_correcto_turno(self):
+        turno = self.clinica.agendar_turno(
+            self.paciente.obtener_dni(),
+            self.medico.obtener_matricula(),
+            "Dermatología",
+            self.fecha_lunes
+        )
+        
+        self.assertIsNotNone(turno)
+        self.assertEqual(turno.paciente.obtener_dni(), self.paciente.obtener_dni())
+        self.assertEqual(turno.medico.obtener_matricula(), self.medico.obtener_matricula())
+        self.assertEqual(turno.especialidad, "Dermatología")
+        self.assertEqual(turno.fecha_hora, self.fecha_lunes)
+    
+    def test_evitar_turnos_duplicados(self):
+        self.clinica.agendar_turno(
+            self.paciente.obtener_dni(),
+            self.medico.obtener_matricula(),
+            "Dermatología",
+            self.fecha_lunes
+        )
+        
+        paciente2 = Paciente("Carlos Ruiz", "22222222", "10/07/1988")
+        self.clinica.agregar_paciente(paciente2)
+        
+        with self.assertRaises(ValueError) as context:
+            self.clinica.agendar_turno(
+                paciente2.obtener_dni(),
+                self.medico.obtener_matricula(),
+                "Dermatología",
+                self.fecha_lunes
+            )
+        self.assertIn("Ya existe un turno", str(context.exception))
+    
+    def test_validar_turno_no_duplicado(self):
+        self.assertTrue(self.clinica.validar_turno_no_duplicado(self.medico, self.fecha_lunes))
+        
+        self.clinica.agendar_turno(
+            self.paciente.obtener_dni(),
+            self.medico.obtener_matricula(),
+            "Dermatología",
+            self.fecha_lunes
+        )
+        
+        self.assertFalse(self.clinica.validar_turno_no_duplicado(self.medico, self.fecha_lunes))
+        otro_medico = Medico("Dr. Otro", "MAT010")
+        self.assertTrue(self.clinica.validar_turno_no_duplicado(otro_medico, self.fecha_lunes))
+    
+    def test_error_paciente_no_existe(self):
+        with self.assertRaises(ValueError) as context:
+            self.clinica.agendar_turno(
+                "99999999",
+                self.medico.obtener_matricula(),
+                "Dermatología",
+                self.fecha_lunes
+            )
+        self.assertIn("No existe paciente con DNI", str(context.exception))
+    
+    def test_error_medico_no_existe(self):
+        with self.assertRaises(ValueError) as context:
+            self.clinica.agendar_turno(
+                self.paciente.obtener_dni(),
+                "MAT999",
+                "Dermatología",
+                self.fecha_lunes
+            )
+        self.assertIn("No existe médico con matrícula", str(context.exception))
+    
+    def test_error_medico_no_atiende_especialidad(self):
+        with self.assertRaises(ValueError) as context:
+            self.clinica.agendar_turno(
+                self.paciente.obtener_dni(),
+                self.medico.obtener_matricula(),
+                "Cardiología",
+                self.fecha_lunes
+            )
+        self.assertIn("El médico no atiende", str(context.exception))
+    
+    def test_error_medico_no_trabaja_dia(self):
+        with self.assertRaises(ValueError) as context:
+            self.clinica.agendar_turno(
+                self.paciente.obtener_dni(),
+                self.medico.obtener_matricula(),
+                "Dermatología",
+                self.fecha_martes
+            )
+        self.assertIn("El médico no atiende", str(context.exception))
+
+
+class TestAgendaMedico(unittest.TestCase):
+    def setUp(self):
+        self.clinica = Clinica()
+        self.paciente = Paciente("Ana Torres", "11111111", "20/03/1992")
+        self.medico = Medico("Dr. Agenda", "MAT007")
+        self.medico.agregar_especialidad(Especialidad("Dermatología", ["lunes", "miércoles"]))
+        
+        self.clinica.agregar_paciente(self.paciente)
+        self.clinica.agregar_medico(self.medico)
+        
+        self.lunes = datetime(2024, 1, 8, 10, 0)
+        for minutos in (60, 0, 30):
+            self.clinica.agendar_turno("11111111", "MAT007", "Dermatología", self.lunes + timedelta(minutes=minutos))
+        self.clinica.agendar_turno("11111111", "MAT007", "Dermatología", datetime(2024, 1, 10, 9, 0))
+    
+    def test_turnos_ordenados_por_fecha(self):
+        fechas = [turno.fecha_hora for turno in self.clinica.obtener_turnos_medico("MAT007")]
+        self.assertEqual(fechas, sorted(fechas))
+        self.assertEqual(len(fechas), 4)
+    
+    def test_turnos_en_rango(self):
+        turnos = self.clinica.obtener_turnos_medico("MAT007", self.lunes + timedelta(minutes=30), datetime(2024, 1, 10))
+        self.assertEqual([turno.fecha_hora.minute for turno in turnos], [30, 0])
+        self.assertEqual(turnos[1].fecha_hora.hour, 11)
+    
+    def test_turnos_del_dia(self):
+        self.assertEqual(len(self.clinica.obtener_turnos_medico_del_dia("MAT007", date(2024, 1, 8))), 3)
+        self.assertEqual(len(self.clinica.obtener_turnos_medico_del_dia("MAT007", date(2024, 1, 9))), 0)
+    
+    def test_proximo_horario_libre(self):
+        self.assertEqual(self.clinica.proximo_horario_libre("MAT007", self.lunes), datetime(2024, 1, 8, 11, 30))
+        # El martes no atiende y el miércoles empieza a las 8
+        self.assertEqual(self.clinica.proximo_horario_libre("MAT007", datetime(2024, 1, 9, 10, 0)),
+                         datetime(2024, 1, 10, 8, 0))
+        self.assertEqual(self.clinica.proximo_horario_libre("MAT007", datetime(2024, 1, 8, 17, 45)),
+                         datetime(2024, 1, 10, 8, 0))
+        self.assertEqual(self.clinica.proximo_horario_libre("MAT007", datetime(2024, 1, 8, 6, 0)),
+                         datetime(2024, 1, 8, 8, 0))
+    
+    def test_error_agenda_medico_no_existe(self):
+        with self.assertRaises(ValueError) as context:
+            self.clinica.obtener_turnos_medico("MAT999")
+        self.assertIn("No existe médico con matrícula", str(context.exception))
+
+
+class TestBusquedaHorariosLibres(unittest.TestCase):
+    def setUp(self):
+        self.clinica = Clinica()
+        for matricula, dias in (("MAT017", ["lunes"]), ("MAT018", ["lunes", "martes"])):
+            medico = Medico(f"Dr. {matricula}", matricula)
+            medico.agregar_especialidad(Especialidad("Cardiología", dias))
+            self.clinica.agregar_medico(medico)
+        otro = Medico("Dra. Piel", "MAT019")
+        otro.agregar_especialidad(Especialidad("Dermatología", ["lunes"]))
+        self.clinica.agregar_medico(otro)
+        self.clinica.agregar_paciente(Paciente("Ana Torres", "11111111", "20/03/1992"))
+        
+        self.lunes = datetime(2024, 1, 8)
+        self.clinica.agendar_turno("11111111", "MAT017", "Cardiología", self.lunes + timedelta(hours=8))
+        self.clinica.agendar_turno("11111111", "MAT018", "Cardiología", self.lunes + timedelta(hours=8, minutes=30))
+    
+    def test_primeros_horarios_intercalados_por_fecha(self):
+        horarios = [(fecha.strftime("%H:%M"), medico.obtener_matricula())
+                    for fecha, medico in self.clinica.buscar_horarios_libres("Cardiología", self.lunes, 4)]
+        self.assertEqual(horarios, [("08:00", "MAT018"), ("08:30", "MAT017"), ("09:00", "MAT017"), ("09:00", "MAT018")])
+    
+    def test_limitar_medicos_y_horario(self):
+        horarios = list(self.clinica.buscar_horarios_libres(
+            "Cardiología", self.lunes + timedelta(hours=17, minutes=10), matriculas=["MAT018"],
+            duracion=timedelta(minutes=20), cierre=timedelta(hours=18), dias_maximos=2))
+        fechas = [fecha for fecha, _ in horarios]
+        self.assertEqual(fechas[:2], [self.lunes + timedelta(hours=17, minutes=20),
+                                      self.lunes + timedelta(hours=17, minutes=40)])
+        self.assertEqual(fechas[2], self.lunes + timedelta(days=1, hours=8))
+        self.assertEqual(len(fechas), 2 + 30)
+    
+    def test_horario_encontrado_se_puede_agendar(self):
+        fecha, medico = next(self.clinica.buscar_horarios_libres("Dermatología", self.lunes + timedelta(hours=12)))
+        turno = self.clinica.agendar_turno("11111111", medico.obtener_matricula(), "Dermatología", fecha)
+        self.assertEqual(turno.fecha_hora, self.lunes + timedelta(hours=12))
+    
+    def test_errores_busqueda(self):
+        self.assertEqual(list(self.clinica.buscar_horarios_libres("Neurología", self.lunes)), [])
+        with self.assertRaises(ValueError):
+            self.clinica.buscar_horarios_libres("Cardiología", self.lunes, matriculas=["MAT999"])
+        with self.assertRaises(ValueError):
+            self.clinica.buscar_horarios_libres("Cardiología", self.lunes, duracion=timedelta(0))
+
+
+class TestCargaMasiva(unittest.TestCase):
+    def setUp(self):
+        self.clinica = Clinica()
+        self.medico = Medico("Dr. Masivo", "MAT008")
+        self.medico.agregar_especialidad(Especialidad("Pediatría", ["lunes"]))
+        self.clinica.agregar_medico(self.medico)
+        self.clinica.agregar_paciente(Paciente("Ana Torres", "11111111", "20/03/1992"))
+        self.lunes = datetime(2024, 1, 8, 10, 0)
+    
+    def test_carga_masiva_pacientes(self):
+        resultado = self.clinica.agregar_pacientes_bulk(
+            Paciente(f"Paciente {i}", str(20000000 + i), "01/01/2000") for i in range(100)
+        )
+        self.assertTrue(resultado.exitoso)
+        self.assertEqual(len(resultado.registros), 100)
+        self.assertEqual(len(self.clinica.obtener_pacientes()), 101)
+        self.assertIsNotNone(self.clinica.obtener_historia_clinica("20000042"))
+    
+    def test_carga_masiva_rechaza_lote_completo(self):
+        resultado = self.clinica.agregar_pacientes_bulk([
+            Paciente("Nuevo", "22222222", "01/01/2000"),
+            Paciente("Existente", "11111111", "01/01/2000"),
+            Paciente("Repetido", "22222222", "01/01/2000"),
+        ])
+        self.assertFalse(resultado.exitoso)
+        self.assertEqual([fila for fila, _ in resultado.errores], [1, 2])
+        self.assertEqual(len(self.clinica.obtener_pacientes()), 1)
+    
+    def test_carga_masiva_medicos_duplicados(self):
+        resultado = self.clinica.agregar_medicos_bulk([Medico("Otro", "MAT008"), Medico("Nuevo", "MAT009")])
+        self.assertFalse(resultado.exitoso)
+        self.assertIn("Ya existe un médico con matrícula", resultado.errores[0][1])
+        self.assertIsNone(self.clinica.obtener_medico_por_matricula("MAT009"))
+    
+    def test_carga_masiva_turnos(self):
+        filas = [("11111111", "MAT008", "Pediatría", self.lunes + timedelta(minutes=30 * i)) for i in (3, 1, 2)]
+        resultado = self.clinica.agendar_turnos_bulk(filas)
+        
+        self.assertTrue(resultado.exitoso)
+        self.assertEqual(len(self.clinica.obtener_turnos()), 3)
+        fechas = [turno.fecha_hora for turno in self.clinica.obtener_turnos_medico("MAT008")]
+        self.assertEqual(fechas, sorted(fechas))
+        self.assertFalse(self.clinica.validar_turno_no_duplicado(self.medico, self.lunes + timedelta(minutes=30)))
+    
+    def test_carga_masiva_turnos_con_errores(self):
+        self.clinica.agendar_turno("11111111", "MAT008", "Pediatría", self.lunes)
+        resultado = self.clinica.agendar_turnos_bulk([
+            ("11111111", "MAT008", "Pediatría", self.lunes),
+            ("99999999", "MAT008", "Pediatría", self.lunes + timedelta(hours=1)),
+            ("11111111", "MAT008", "Pediatría", self.lunes + timedelta(hours=2)),
+            ("11111111", "MAT008", "Pediatría", self.lunes + timedelta(hours=2)),
+            ("11111111", "MAT008", "Pediatría", self.lunes + timedelta(days=1)),
+        ])
+        
+        self.assertFalse(resultado.exitoso)
+        self.assertEqual([fila for fila, _ in resultado.errores], [0, 1, 3, 4])
+        self.assertIn("Ya existe un turno", resultado.errores[0][1])
+        self.assertIn("repetido dentro del lote", resultado.errores[2][1])
+        self.assertEqual(len(self.clinica.obtener_turnos()), 1)
+
+
+class TestPersistencia(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        self.directorio = tempfile.TemporaryDirectory()
+        self.clinica = Clinica()
+        self.medico = Medico("Dra. Persistente", "MAT011")
+        self.medico.agregar_especialidad(Especialidad("Cardiología", ["lunes", "miércoles"]))
+        self.clinica.agregar_medico(self.medico)
+        self.clinica.agregar_paciente(Paciente("Ana Torres", "11111111", "20/03/1992"))
+        self.clinica.agregar_paciente(Paciente("Carlos Ruiz", "22222222", "10/07/1988"))
+        self.clinica.agendar_turno("11111111", "MAT011", "Cardiología", datetime(2024, 1, 8, 10, 0))
+        self.clinica.agendar_turno("22222222", "MAT011", "Cardiología", datetime(2024, 1, 10, 11, 30))
+        self.clinica.emitir_receta("11111111", "MAT011", ["Aspirina 100mg", "Enalapril 10mg"],
+                                   datetime(2024, 1, 8, 10, 45))
+    
+    def tearDown(self):
+        self.directorio.cleanup()
+    
+    def _verificar_restauracion(self, restaurada: Clinica):
+        self.assertEqual(str(restaurada), str(self.clinica))
+        medico = restaurada.obtener_medico_por_matricula("MAT011")
+        self.assertEqual(str(medico), str(self.medico))
+        self.assertEqual(medico.obtener_especialidad_para_dia("miércoles"), "Cardiología")
+        self.assertEqual([str(t) for t in restaurada.obtener_turnos()], [str(t) for t in self.clinica.obtener_turnos()])
+        
+        receta = restaurada.obtener_historia_clinica("11111111").obtener_recetas()[0]
+        self.assertEqual(receta.medicamentos, ["Aspirina 100mg", "Enalapril 10mg"])
+        self.assertEqual(receta.fecha, datetime(2024, 1, 8, 10, 45))
+    
+    def test_exportar_e_importar_jsonl(self):
+        ruta = os.path.join(self.directorio.name, "clinica.jsonl")
+        resumen = PersistenciaClinica(self.clinica).exportar_jsonl(ruta)
+        self.assertEqual(resumen.filas, 7)
+        
+        restaurada = Clinica()
+        resumen = PersistenciaClinica(restaurada).importar_jsonl(ruta)
+        self.assertEqual(resumen.filas, 7)
+        self.assertIn("filas/s", str(resumen))
+        self._verificar_restauracion(restaurada)
+    
+    def test_exportar_e_importar_csv(self):
+        PersistenciaClinica(self.clinica).exportar_csv(self.directorio.name)
+        
+        restaurada = Clinica()
+        resumen = PersistenciaClinica(restaurada).importar_csv(self.directorio.name)
+        self.assertEqual(resumen.filas, 7)
+        self._verificar_restauracion(restaurada)
+    
+    def test_error_importacion_indica_fila(self):
+        ruta = os.path.join(self.directorio.name, "clinica.jsonl")
+        with open(ruta, "w", encoding="utf-8") as archivo:
+            archivo.write(json.dumps({"registro": "paciente", "nombre": "Ana", "dni": "1",
+                                      "fecha_nacimiento": "x"}) + "\n")
+            archivo.write(json.dumps({"registro": "turno", "dni": "1", "matricula": "MAT999",
+                                      "especialidad": "Cardiología", "fecha_hora": "2024-01-08T10:00:00"}) + "\n")
+        
+        with self.assertRaises(ValueError) as context:
+            PersistenciaClinica(Clinica()).importar_jsonl(ruta)
+        self.assertIn("Fila 2 (turno)", str(context.exception))
+
+
+class TestDiarioOperaciones(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        self.directorio = tempfile.TemporaryDirectory()
+    
+    def tearDown(self):
+        self.directorio.cleanup()
+    
+    def _poblar(self, clinica: Clinica, desde: int = 0, cantidad: int = 3):
+        for i in range(desde, desde + cantidad):
+            clinica.agregar_paciente(Paciente(f"Paciente {i}", f"{i:08d}", "01/01/1990"))
+            clinica.agendar_turno(f"{i:08d}", "MAT012", "Pediatría", datetime(2024, 1, 8, 8, 0) + timedelta(days=7 * i))
+    
+    def _clinica_con_diario(self, **opciones) -> Clinica:
+        clinica = Clinica(diario=DiarioOperaciones(self.directorio.name, **opciones))
+        medico = Medico("Dr. Diario", "MAT012")
+        medico.agregar_especialidad(Especialidad("Pediatría", ["lunes"]))
+        clinica.agregar_medico(medico)
+        return clinica
+    
+    def test_restaurar_reproduce_operaciones(self):
+        clinica = self._clinica_con_diario()
+        self._poblar(clinica)
+        clinica.agregar_especialidad("MAT012", Especialidad("Clínica Médica", ["martes"]))
+        clinica.emitir_receta("00000001", "MAT012", ["Amoxicilina 500mg"], datetime(2024, 1, 15, 8, 30))
+        clinica.cerrar()
+        
+        restaurada = Clinica.restaurar(DiarioOperaciones(self.directorio.name))
+        self.assertEqual(str(restaurada), str(clinica))
+        medico = restaurada.obtener_medico_por_matricula("MAT012")
+        self.assertEqual(medico.obtener_especialidad_para_dia("martes"), "Clínica Médica")
+        receta = restaurada.obtener_historia_clinica("00000001").obtener_recetas()[0]
+        self.assertEqual(receta.fecha, datetime(2024, 1, 15, 8, 30))
+        restaurada.cerrar()
+    
+    def test_restaurar_desde_instantanea_y_cola(self):
+        clinica = self._clinica_con_diario(operaciones_por_instantanea=4)
+        self._poblar(clinica, cantidad=5)
+        clinica.cerrar()
+        
+        diario = DiarioOperaciones(self.directorio.name)
+        self.assertEqual(diario.secuencia, 12)
+        # Solo se reproducen los registros posteriores a la última instantánea
+        self.assertLess(len(list(diario.leer_cola())), 4)
+        restaurada = Clinica.restaurar(diario)
+        self.assertEqual(str(restaurada), str(clinica))
+        
+        # La clínica restaurada sigue registrando a continuación
+        self._poblar(restaurada, desde=5, cantidad=1)
+        restaurada.cerrar()
+        self.assertEqual(len(Clinica.restaurar(DiarioOperaciones(self.directorio.name)).obtener_turnos()), 6)
+    
+    def test_corte_durante_la_instantanea(self):
+        from unittest import mock
+        # Un corte antes de activar la instantánea nueva o antes de vaciar el diario no debe duplicar registros
+        for paso in ("_escribir_metadatos", "_vaciar_diario"):
+            with self.subTest(paso=paso):
+                directorio = os.path.join(self.directorio.name, paso)
+                clinica = Clinica(diario=DiarioOperaciones(directorio))
+                medico = Medico("Dr. Diario", "MAT012")
+                medico.agregar_especialidad(Especialidad("Pediatría", ["lunes"]))
+                clinica.agregar_medico(medico)
+                self._poblar(clinica, cantidad=2)
+                clinica.crear_instantanea()
+                self._poblar(clinica, desde=2, cantidad=2)
+                with mock.patch.object(DiarioOperaciones, paso, side_effect=OSError("corte")):
+                    with self.assertRaises(OSError):
+                        clinica.crear_instantanea()
+                clinica.cerrar()
+                
+                restaurada = Clinica.restaurar(DiarioOperaciones(directorio))
+                self.assertEqual(str(restaurada), str(clinica))
+                self.assertEqual(len(restaurada.obtener_turnos()), 4)
+                restaurada.cerrar()
+                self.assertEqual(len([nombre for nombre in os.listdir(directorio)
+                                      if nombre.startswith("instantanea-")]), 1)
+    
+    def test_registro_incompleto_se_descarta(self):
+        clinica = self._clinica_con_diario()
+        self._poblar(clinica, cantidad=2)
+        clinica.cerrar()
+        ruta = os.path.join(self.directorio.name, DiarioOperaciones.ARCHIVO_DIARIO)
+        with open(ruta, "a", encoding="utf-8") as archivo:
+            archivo.write('{"seq": 99, "registro": "paci')
+        
+        restaurada = Clinica.restaurar(DiarioOperaciones(self.directorio.name))
+        self.assertEqual(len(restaurada.obtener_pacientes()), 2)
+        self._poblar(restaurada, desde=2, cantidad=1)
+        restaurada.cerrar()
+        self.assertEqual(len(Clinica.restaurar(DiarioOperaciones(self.directorio.name)).obtener_pacientes()), 3)
+    
+    def test_operacion_rechazada_no_se_registra(self):
+        clinica = self._clinica_con_diario()
+        self._poblar(clinica, cantidad=1)
+        with self.assertRaises(ValueError):
+            clinica.agendar_turno("00000000", "MAT012", "Pediatría", datetime(2024, 1, 8, 8, 0))
+        clinica.cerrar()
+        self.assertEqual(DiarioOperaciones(self.directorio.name).secuencia, 4)
+
+
+class TestArchivoTurnos(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        self.directorio = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.directorio.name, "turnos.bin")
+        self.clinica = Clinica()
+        for matricula in ("MAT013", "MAT014"):
+            medico = Medico(f"Dr. {matricula}", matricula)
+            medico.agregar_especialidad(Especialidad("Clínica Médica", ["lunes", "martes"]))
+            self.clinica.agregar_medico(medico)
+        for i in range(4):
+            self.clinica.agregar_paciente(Paciente(f"Paciente {i}", f"{i:08d}", "01/01/1990"))
+        self.lunes = datetime(2024, 1, 8, 9, 0)
+        for semana in range(6):
+            for i in range(4):
+                self.clinica.agendar_turno(f"{i:08d}", ("MAT013", "MAT014")[i % 2], "Clínica Médica",
+                                           self.lunes + timedelta(weeks=semana, minutes=30 * i))
+        self.antes = [str(turno) for turno in self.clinica.obtener_turnos()]
+    
+    def tearDown(self):
+        self.directorio.cleanup()
+    
+    def test_archivar_conserva_consultas(self):
+        corte = self.lunes + timedelta(weeks=3)
+        historia_antes = [str(t) for t in self.clinica.obtener_historia_clinica("00000001").obtener_turnos()]
+        medico_antes = [str(t) for t in self.clinica.obtener_turnos_medico("MAT014", self.lunes + timedelta(weeks=1))]
+        
+        self.assertEqual(self.clinica.archivar_turnos(self.ruta, corte), 12)
+        self.assertEqual([str(turno) for turno in self.clinica.obtener_turnos()], self.antes)
+        self.assertEqual([str(t) for t in self.clinica.obtener_historia_clinica("00000001").obtener_turnos()],
+                         historia_antes)
+        self.assertEqual([str(t) for t in
+                          self.clinica.obtener_turnos_medico("MAT014", self.lunes + timedelta(weeks=1))], medico_antes)
+        self.assertEqual(len(self.clinica.obtener_turnos_medico_del_dia("MAT013", self.lunes.date())), 2)
+        self.assertIn("Turnos: 24", str(self.clinica))
+    
+    def test_turno_archivado_sigue_ocupando_el_horario(self):
+        self.clinica.archivar_turnos(self.ruta, self.lunes + timedelta(weeks=3))
+        with self.assertRaises(ValueError):
+            self.clinica.agendar_turno("00000002", "MAT013", "Clínica Médica", self.lunes)
+        self.assertEqual(self.clinica.proximo_horario_libre("MAT013", self.lunes), self.lunes + timedelta(minutes=30))
+    
+    def test_archivar_en_varias_etapas(self):
+        self.clinica.archivar_turnos(self.ruta, self.lunes + timedelta(weeks=2))
+        self.clinica.archivar_turnos(self.ruta, self.lunes + timedelta(weeks=5))
+        self.assertEqual(self.clinica.archivar_turnos(self.ruta, self.lunes), 0)
+        self.assertEqual([str(turno) for turno in self.clinica.obtener_turnos()], self.antes)
+        self.assertEqual(len(self.clinica.obtener_historia_clinica("00000000").obtener_turnos()), 6)
+    
+    def test_rearchivar_conserva_ids_y_las_vistas_anteriores(self):
+        ids = [turno.id for turno in self.clinica.obtener_turnos()]
+        self.clinica.archivar_turnos(self.ruta, self.lunes + timedelta(weeks=2))
+        vieja = self.clinica.obtener_historia_clinica("00000000").obtener_turnos()
+        self.assertEqual(vieja[0].fecha_hora, self.lunes)
+        
+        self.clinica.archivar_turnos(self.ruta, self.lunes + timedelta(weeks=5))
+        self.assertEqual([turno.id for turno in self.clinica.obtener_turnos()], ids)
+        self.assertEqual([str(turno) for turno in self.clinica.obtener_turnos()], self.antes)
+        # Las vistas entregadas antes de volver a archivar se siguen leyendo
+        self.assertEqual(vieja[0].fecha_hora, self.lunes)
+        self.assertEqual([turno.fecha_hora for turno in vieja][:2], [self.lunes, self.lunes + timedelta(weeks=1)])
+        
+        vigente = self.clinica.obtener_historia_clinica("00000000").obtener_turnos()
+        self.clinica.cerrar()
+        with self.assertRaises(ValueError):
+            vigente[0]
+    
+    def test_archivar_con_sqlite_informa_el_error(self):
+        clinica = Clinica(RepositorioSQLite(":memory:"))
+        with self.assertRaisesRegex(ValueError, "archivo histórico"):
+            clinica.archivar_turnos(self.ruta, self.lunes)
+        clinica.cerrar()
+    
+    def test_turnos_se_materializan_bajo_demanda(self):
+        self.clinica.archivar_turnos(self.ruta, self.lunes + timedelta(weeks=3))
+        archivados = self.clinica.obtener_historia_clinica("00000003").obtener_turnos(0, 2)
+        self.assertIsNot(archivados[0], archivados[0])
+        self.assertIs(archivados[0].paciente, self.clinica.obtener_pacientes()[3])
+        self.assertEqual(archivados[1].fecha_hora, self.lunes + timedelta(weeks=1, minutes=90))
+
+
+@unittest.skipIf(np is None, "NumPy no está instalado")
+class TestAnaliticaClinica(unittest.TestCase):
+    def setUp(self):
+        self.clinica = Clinica()
+        for matricula, dias in (("MAT015", ["lunes", "martes"]), ("MAT016", ["miércoles"])):
+            medico = Medico(f"Dr. {matricula}", matricula)
+            medico.agregar_especialidad(Especialidad("Pediatría" if matricula == "MAT015" else "Cardiología", dias))
+            self.clinica.agregar_medico(medico)
+        for i in range(3):
+            self.clinica.agregar_paciente(Paciente(f"Paciente {i}", f"{i:08d}", "01/01/1990"))
+        
+        lunes = datetime(2024, 1, 29, 9, 0)
+        self.clinica.agendar_turno("00000000", "MAT015", "Pediatría", lunes)
+        self.clinica.agendar_turno("00000001", "MAT015", "Pediatría", lunes + timedelta(minutes=30))
+        self.clinica.agendar_turno("00000002", "MAT015", "Pediatría", lunes + timedelta(hours=3))
+        self.clinica.agendar_turno("00000000", "MAT015", "Pediatría", lunes + timedelta(days=1))
+        self.clinica.agendar_turno("00000001", "MAT016", "Cardiología", lunes + timedelta(days=2))
+        self.clinica.agendar_turno("00000002", "MAT016", "Cardiología", lunes + timedelta(days=9))
+        self.clinica.emitir_receta("00000000", "MAT015", ["Paracetamol 500mg", "Ibuprofeno 400mg"])
+        self.clinica.emitir_receta("00000001", "MAT015", ["Paracetamol 500mg"])
+        self.analitica = AnaliticaClinica.desde_clinica(self.clinica)
+    
+    def test_ocupacion_por_medico_y_dia(self):
+        ocupacion = self.analitica.ocupacion_por_medico_y_dia()
+        self.assertEqual(ocupacion["MAT015"], (3, 1, 0, 0, 0, 0, 0))
+        self.assertEqual(ocupacion["MAT016"], (0, 0, 2, 0, 0, 0, 0))
+    
+    def test_turnos_por_especialidad_y_mes(self):
+        self.assertEqual(self.analitica.turnos_por_especialidad_y_mes(),
+                         {("Pediatría", "2024-01"): 4, ("Cardiología", "2024-01"): 1, ("Cardiología", "2024-02"): 1})
+    
+    def test_huecos_por_medico(self):
+        huecos = self.analitica.huecos_por_medico()
+        self.assertEqual(huecos["MAT015"], (1, timedelta(hours=2)))
+        self.assertEqual(huecos["MAT016"], (0, timedelta(0)))
+    
+    def test_huecos_usan_la_duracion_de_cada_turno(self):
+        self.clinica.agregar_especialidad("MAT016", Especialidad("Cirugía", ["jueves"], timedelta(hours=1)))
+        jueves = datetime(2024, 2, 1, 9, 0)
+        for horas in (0, 1, 2.5):
+            self.clinica.agendar_turno("00000000", "MAT016", "Cirugía", jueves + timedelta(hours=horas))
+        analitica = AnaliticaClinica.desde_clinica(self.clinica)
+        
+        self.assertEqual(analitica.huecos_por_medico()["MAT016"], (1, timedelta(minutes=30)))
+        self.assertEqual(analitica.huecos_por_medico(timedelta(minutes=30))["MAT016"],
+                         (2, timedelta(hours=1, minutes=30)))
+    
+    def test_medicamentos_mas_recetados(self):
+        self.assertEqual(self.analitica.medicamentos_mas_recetados(1), [("Paracetamol 500mg", 2)])
+        self.assertEqual(len(self.analitica.medicamentos_mas_recetados()), 2)
+
+
+class TestCacheRender(unittest.TestCase):
+    def setUp(self):
+        self.clinica = Clinica()
+        self.medico = Medico("Dra. Vista", "MAT021")
+        self.medico.agregar_especialidad(Especialidad("Pediatría", ["lunes"]))
+        self.clinica.agregar_medico(self.medico)
+        self.clinica.agregar_paciente(Paciente("Ana Torres", "11111111", "20/03/1992"))
+        self.clinica.agendar_turno("11111111", "MAT021", "Pediatría", datetime(2024, 1, 8, 9, 0))
+        self.cache = CacheRender(capacidad=3)
+    
+    def test_historia_se_invalida_con_cada_alta(self):
+        historia = self.clinica.obtener_historia_clinica("11111111")
+        encabezado, turnos, recetas = self.cache.historia(historia)
+        self.assertEqual((self.cache.aciertos, self.cache.fallos), (0, 1))
+        self.assertEqual(self.cache.historia(historia)[1], turnos)
+        self.assertEqual((self.cache.aciertos, self.cache.fallos), (1, 1))
+        
+        self.clinica.agendar_turno("11111111", "MAT021", "Pediatría", datetime(2024, 1, 15, 9, 0))
+        self.clinica.emitir_receta("11111111", "MAT021", ["Ibuprofeno 400mg"])
+        encabezado, turnos, recetas = self.cache.historia(historia)
+        self.assertEqual(self.cache.fallos, 2)
+        self.assertEqual(encabezado, str(historia))
+        self.assertEqual(list(turnos), [str(turno) for turno in historia.obtener_turnos()])
+        self.assertEqual(list(recetas), [str(receta) for receta in historia.obtener_recetas()])
+    
+    def test_historia_renderiza_solo_lo_nuevo(self):
+        historia = self.clinica.obtener_historia_clinica("11111111")
+        primer_turno = self.cache.historia(historia)[1][0]
+        self.clinica.agendar_turno("11111111", "MAT021", "Pediatría", datetime(2024, 1, 15, 9, 0))
+        self.assertIs(self.cache.historia(historia)[1][0], primer_turno)
+    
+    def test_medico_se_invalida_al_agregar_especialidad(self):
+        self.assertEqual(self.cache.texto(self.medico), str(self.medico))
+        self.cache.texto(self.medico)
+        self.clinica.agregar_especialidad("MAT021", Especialidad("Clínica Médica", ["martes"]))
+        self.assertIn("Clínica Médica", self.cache.texto(self.medico))
+        self.assertEqual((self.cache.aciertos, self.cache.fallos), (1, 2))
+    
+    def test_acierta_con_objetos_armados_en_cada_consulta(self):
+        clinica = Clinica(RepositorioSQLite(":memory:"))
+        clinica.agregar_medico(Medico("Dra. Vista", "MAT022"))
+        clinica.agregar_especialidad("MAT022", Especialidad("Pediatría", ["lunes"]))
+        clinica.agregar_paciente(Paciente("Ana Torres", "11111111", "20/03/1992"))
+        turno = clinica.agendar_turno("11111111", "MAT022", "Pediatría", datetime(2024, 1, 8, 9, 0))
+        cache = CacheRender()
+        
+        for _ in range(10):
+            cache.historia(clinica.obtener_historia_clinica("11111111"))
+            cache.texto(clinica.obtener_turnos()[0])
+        self.assertEqual((cache.aciertos, cache.fallos), (18, 2))
+        
+        # Cancelar y agendar deja la misma cantidad de turnos, pero la historia se vuelve a renderizar
+        clinica.cancelar_turno(turno.id)
+        clinica.agendar_turno("11111111", "MAT022", "Pediatría", datetime(2024, 1, 15, 9, 0))
+        _, turnos, _ = cache.historia(clinica.obtener_historia_clinica("11111111"))
+        self.assertIn("15/01/2024", turnos[0])
+        self.assertIn("15/01/2024", cache.texto(clinica.obtener_turnos()[0]))
+        self.assertEqual(len(cache), 3)
+        clinica.cerrar()
+    
+    def test_acierto_no_recorre_la_historia(self):
+        from unittest import mock
+        clinica = Clinica(RepositorioSQLite(":memory:"))
+        clinica.agregar_medico(Medico("Dra. Vista", "MAT022"))
+        clinica.agregar_especialidad("MAT022", Especialidad("Pediatría", ["lunes"]))
+        clinica.agregar_paciente(Paciente("Ana Torres", "11111111", "20/03/1992"))
+        clinica.agendar_turno("11111111", "MAT022", "Pediatría", datetime(2024, 1, 8, 9, 0))
+        self.cache.historia(clinica.obtener_historia_clinica("11111111"))
+        
+        historia = clinica.obtener_historia_clinica("11111111")
+        with mock.patch.object(HistoriaClinica, "turnos", new_callable=mock.PropertyMock) as turnos:
+            self.cache.historia(historia)
+        turnos.assert_not_called()
+        self.assertEqual(self.cache.aciertos, 1)
+        clinica.cerrar()
+    
+    def test_capacidad_acotada(self):
+        for paciente in self.clinica.obtener_pacientes() + self.clinica.obtener_medicos():
+            self.cache.texto(paciente)
+        for turno in self.clinica.obtener_turnos():
+            self.cache.texto(turno)
+        self.cache.historia(self.clinica.obtener_historia_clinica("11111111"))
+        self.assertEqual(len(self.cache), 3)
+        self.cache.texto(self.clinica.obtener_pacientes()[0])
+        self.assertEqual(self.cache.fallos, 5)
+        self.assertIn("Entradas: 3/3", str(self.cache))
+        with self.assertRaises(ValueError):
+            CacheRender(0)
+        self.assertIn("Entradas: 0/2", str(ClinicaCLI(self.clinica, capacidad_cache=2).cache))
+
+
+class TestEstadisticasClinica(unittest.TestCase):
+    def setUp(self):
+        self.clinica = Clinica()
+        for matricula, tipo in (("MAT022", "Pediatría"), ("MAT023", "Cardiología")):
+            medico = Medico(f"Dr. {matricula}", matricula)
+            medico.agregar_especialidad(Especialidad(tipo, ["lunes"]))
+            self.clinica.agregar_medico(medico)
+        self.clinica.agregar_pacientes_bulk(Paciente(f"Paciente {i}", f"{i:08d}", "01/01/1990") for i in range(2))
+        self.lunes = datetime(2024, 1, 8, 9, 0)
+        self.clinica.agendar_turno("00000000", "MAT022", "Pediatría", self.lunes)
+        self.clinica.emitir_receta("00000000", "MAT022", ["Paracetamol 500mg"], self.lunes)
+    
+    def test_construccion_inicial_desde_los_datos(self):
+        estadisticas = self.clinica.obtener_estadisticas()
+        self.assertEqual((estadisticas.turnos, estadisticas.recetas), (1, 1))
+        self.assertEqual(estadisticas.turnos_medico("MAT022"), 1)
+        self.assertEqual(estadisticas.recetas_paciente_en_mes("00000000", 2024, 1), 1)
+        self.assertIs(self.clinica.obtener_estadisticas(), estadisticas)
+    
+    def test_altas_actualizan_contadores(self):
+        estadisticas = self.clinica.obtener_estadisticas()
+        self.clinica.agendar_turno("00000001", "MAT022", "Pediatría", self.lunes + timedelta(weeks=1))
+        self.clinica.agendar_turnos_bulk([("00000001", "MAT023", "Cardiología", self.lunes + timedelta(weeks=2)),
+                                          ("00000000", "MAT023", "Cardiología", self.lunes + timedelta(weeks=3))])
+        self.clinica.emitir_receta("00000001", "MAT023", ["Aspirina 100mg"], self.lunes + timedelta(weeks=4))
+        
+        self.assertEqual(estadisticas.turnos, 4)
+        self.assertEqual(estadisticas.turnos_medico("MAT023"), 2)
+        self.assertEqual(estadisticas.turnos_paciente("00000001"), 2)
+        self.assertEqual(estadisticas.recetas_paciente_en_mes("00000001", 2024, 2), 1)
+        self.assertEqual(estadisticas.turnos_proximos_por_especialidad(self.lunes + timedelta(days=1)),
+                         {"Pediatría": 1, "Cardiología": 2})
+    
+    def test_turno_rechazado_no_cuenta(self):
+        estadisticas = self.clinica.obtener_estadisticas()
+        with self.assertRaises(ValueError):
+            self.clinica.agendar_turno("00000001", "MAT022", "Pediatría", self.lunes)
+        resumen = estadisticas.resumen(self.lunes)
+        self.assertEqual(resumen["turnos"], 1)
+        self.assertEqual(resumen["turnos_por_medico"], {"MAT022": 1})
+
+
+class TestRepositorioSQLite(unittest.TestCase):
+    def setUp(self):
+        import tempfile
+        self.directorio = tempfile.TemporaryDirectory()
+        self.ruta = os.path.join(self.directorio.name, "clinica.db")
+        self.clinica = Clinica(RepositorioSQLite(self.ruta))
+        self.paciente = Paciente("Ana Torres", "11111111", "20/03/1992")
+        self.medico = Medico("Dr. SQLite", "MAT012")
+        self.medico.agregar_especialidad(Especialidad("Dermatología", ["lunes", "miércoles"]))
+        self.clinica.agregar_paciente(self.paciente)
+        self.clinica.agregar_medico(self.medico)
+        self.lunes = datetime(2024, 1, 8, 10, 0)
+    
+    def tearDown(self):
+        self.clinica.cerrar()
+        self.directorio.cleanup()
+    
+    def test_registro_y_duplicados(self):
+        self.assertIn(self.paciente, self.clinica.obtener_pacientes())
+        self.assertIn(self.medico, self.clinica.obtener_medicos())
+        
+        with self.assertRaises(ValueError) as context:
+            self.clinica.agregar_paciente(Paciente("Otro", "11111111", "01/01/2000"))
+        self.assertIn("Ya existe un paciente con DNI", str(context.exception))
+        
+        with self.assertRaises(ValueError) as context:
+            self.clinica.agregar_medico(Medico("Otro", "MAT012"))
+        self.assertIn("Ya existe un médico con matrícula", str(context.exception))
+    
+    def test_turnos_duplicados_y_agenda(self):
+        self.clinica.agendar_turno("11111111", "MAT012", "Dermatología", self.lunes)
+        self.clinica.agendar_turno("11111111", "MAT012", "Dermatología", self.lunes - timedelta(hours=1))
+        
+        with self.assertRaises(ValueError) as context:
+            self.clinica.agendar_turno("11111111", "MAT012", "Dermatología", self.lunes)
+        self.assertIn("Ya existe un turno", str(context.exception))
+        
+        fechas = [turno.fecha_hora for turno in self.clinica.obtener_turnos_medico("MAT012")]
+        self.assertEqual(fechas, [self.lunes - timedelta(hours=1), self.lunes])
+        self.assertEqual(self.clinica.proximo_horario_libre("MAT012", self.lunes), self.lunes + timedelta(minutes=30))
+    
+    def test_restricciones_de_unicidad(self):
+        turno = Turno(self.paciente, self.medico, self.lunes, "Dermatología")
+        repositorio = RepositorioSQLite(self.ruta)
+        repositorio.guardar_turnos([turno])
+        with self.assertRaises(ValueError):
+            repositorio.guardar_turnos([turno])
+        repositorio.cerrar()
+    
+    def test_estado_persiste_al_reabrir(self):
+        self.clinica.agregar_especialidad("MAT012", Especialidad("Cardiología", ["viernes"]))
+        self.clinica.agendar_turno("11111111", "MAT012", "Dermatología", self.lunes)
+        self.clinica.emitir_receta("11111111", "MAT012", ["Aspirina 100mg"], self.lunes)
+        self.clinica.cerrar()
+        
+        self.clinica = Clinica(RepositorioSQLite(self.ruta))
+        self.assertEqual(str(self.clinica), "Clínica - Pacientes: 1, Médicos: 1, Turnos: 1")
+        medico = self.clinica.obtener_medico_por_matricula("MAT012")
+        self.assertEqual(medico.obtener_especialidad_para_dia("viernes"), "Cardiología")
+        
+        historia = self.clinica.obtener_historia_clinica("11111111")
+        self.assertEqual(historia.obtener_turnos()[0].fecha_hora, self.lunes)
+        self.assertEqual(historia.obtener_recetas()[0].medicamentos, ["Aspirina 100mg"])
+        self.assertEqual(historia.obtener_recetas()[0].fecha, self.lunes)
+    
+    def test_carga_masiva(self):
+        resultado = self.clinica.agendar_turnos_bulk(
+            ("11111111", "MAT012", "Dermatología", self.lunes + timedelta(minutes=30 * i)) for i in range(10)
+        )
+        self.assertTrue(resultado.exitoso)
+        self.assertEqual(len(self.clinica.obtener_turnos_medico_del_dia("MAT012", self.lunes.date())), 10)
+
+
+class TestVistasSoloLectura(unittest.TestCase):
+    def setUp(self):
+        self.clinica = Clinica()
+        self.medico = Medico("Dr. Vistas", "MAT013")
+        self.medico.agregar_especialidad(Especialidad("Clínica Médica", list(DIAS_SEMANA)))
+        self.clinica.agregar_medico(self.medico)
+        self.clinica.agregar_paciente(Paciente("Ana Torres", "11111111", "20/03/1992"))
+        self.inicio = datetime(2024, 1, 8, 8, 0)
+        for i in range(10):
+            self.clinica.agendar_turno("11111111", "MAT013", "Clínica Médica", self.inicio + timedelta(hours=i))
+            self.clinica.emitir_receta("11111111", "MAT013", [f"Medicamento {i}"])
+    
+    def test_vistas_no_modificables(self):
+        turnos = self.clinica.obtener_turnos()
+        with self.assertRaises(TypeError):
+            turnos[0] = None
+        self.assertFalse(hasattr(turnos, "append"))
+        self.assertFalse(hasattr(self.medico.especialidades, "append"))
+    
+    def test_vista_es_una_instantanea(self):
+        turnos = self.clinica.obtener_turnos()
+        self.clinica.agendar_turno("11111111", "MAT013", "Clínica Médica", self.inicio + timedelta(days=1))
+        self.assertEqual(len(turnos), 10)
+        self.assertEqual(len(self.clinica.obtener_turnos()), 11)
+    
+    def test_paginado(self):
+        pagina = self.clinica.obtener_turnos(offset=3, limite=4)
+        self.assertEqual([turno.fecha_hora.hour for turno in pagina], [11, 12, 13, 14])
+        self.assertEqual(pagina[-1].fecha_hora.hour, 14)
+        self.assertEqual(len(self.clinica.obtener_turnos(offset=8, limite=5)), 2)
+        
+        historia = self.clinica.obtener_historia_clinica("11111111")
+        recetas = historia.obtener_recetas(offset=9)
+        self.assertEqual(recetas[0].medicamentos, ["Medicamento 9"])
+        self.assertEqual(len(historia.obtener_turnos(limite=2)), 2)
+        self.assertEqual(len(historia.turnos.pagina(5, 100)), 5)
+    
+    def test_comparacion_con_listas(self):
+        receta = self.clinica.obtener_historia_clinica("11111111").obtener_recetas()[0]
+        self.assertEqual(receta.medicamentos, ["Medicamento 0"])
+        self.assertNotEqual(receta.medicamentos, ["Otro"])
+        self.assertEqual(list(self.clinica.obtener_turnos()[2:4]), list(self.clinica.obtener_turnos())[2:4])
+
+
+class TestConcurrencia(unittest.TestCase):
+    def setUp(self):
+        self.clinica = Clinica(concurrente=True)
+        for i in range(4):
+            medico = Medico(f"Dr. Concurrente {i}", f"MATC{i}")
+            medico.agregar_especialidad(Especialidad("Clínica Médica", list(DIAS_SEMANA)))
+            self.clinica.agregar_medico(medico)
+        for i in range(8):
+            self.clinica.agregar_paciente(Paciente(f"Paciente {i}", f"3000000{i}", "01/01/1990"))
+        self.inicio = datetime(2024, 1, 8, 8, 0)
+    
+    def test_sin_turnos_duplicados_con_varios_hilos(self):
+        exitos = []
+        barrera = threading.Barrier(8)
+        
+        def reservar(numero: int):
+            barrera.wait()
+            for slot in range(50):
+                for medico in range(4):
+                    try:
+                        exitos.append(self.clinica.agendar_turno(
+                            f"3000000{numero}", f"MATC{medico}", "Clínica Médica",
+                            self.inicio + timedelta(minutes=30 * slot)
+                        ))
+                    except ValueError:
+                        pass
+        
+        hilos = [threading.Thread(target=reservar, args=(numero,)) for numero in range(8)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        
+        horarios = [(turno.medico.obtener_matricula(), turno.fecha_hora) for turno in self.clinica.obtener_turnos()]
+        self.assertEqual(len(exitos), 200)
+        self.assertEqual(len(horarios), 200)
+        self.assertEqual(len(set(horarios)), 200)
+        for i in range(4):
+            self.assertEqual(len(self.clinica.obtener_turnos_medico(f"MATC{i}")), 50)
+    
+    def test_registro_concurrente_de_pacientes(self):
+        errores = []
+        
+        def registrar():
+            try:
+                self.clinica.agregar_paciente(Paciente("Repetido", "99999999", "01/01/1990"))
+            except ValueError as e:
+                errores.append(e)
+        
+        hilos = [threading.Thread(target=registrar) for _ in range(8)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        self.assertEqual(len(errores), 7)
+    
+    def test_altas_en_una_historia_se_serializan(self):
+        # Dos médicos pueden escribir a la vez en la misma historia: cada alta espera el lock de esa historia
+        historia = self.clinica.obtener_historia_clinica("30000000")
+        with historia._bloqueo():
+            hilo = threading.Thread(target=self.clinica.emitir_receta, args=("30000000", "MATC0", ["Paracetamol"]))
+            hilo.start()
+            hilo.join(timeout=0.1)
+            self.assertTrue(hilo.is_alive())
+            self.assertEqual(len(historia.recetas), 0)
+        hilo.join()
+        self.assertEqual((len(historia.recetas), historia.version), (1, 1))
+    
+    def test_operaciones_globales_en_modo_concurrente(self):
+        # Instantánea, archivo, estadísticas e índice toman todos los locks: no deben quedar esperándose a sí mismos
+        import tempfile
+        with tempfile.TemporaryDirectory() as directorio:
+            diario = DiarioOperaciones(directorio, operaciones_por_instantanea=5)
+            clinica = Clinica(concurrente=True, diario=diario)
+            resultados = {}
+            
+            def operar():
+                for i in range(3):
+                    medico = Medico(f"Dr. Global {i}", f"MATG{i}")
+                    medico.agregar_especialidad(Especialidad("Clínica Médica", list(DIAS_SEMANA)))
+                    clinica.agregar_medico(medico)
+                clinica.agregar_paciente(Paciente("Paciente Global", "40000000", "01/01/1990"))
+                for i in range(3):
+                    clinica.agendar_turno("40000000", f"MATG{i}", "Clínica Médica", self.inicio + timedelta(hours=i))
+                clinica.emitir_receta("40000000", "MATG0", ["Ibuprofeno"], self.inicio)
+                clinica.crear_instantanea()
+                resultados["estadisticas"] = clinica.obtener_estadisticas().turnos_paciente("40000000")
+                resultados["indice"] = len(clinica.pacientes_con_medicamento("ibuprofeno"))
+                resultados["archivados"] = clinica.archivar_turnos(os.path.join(directorio, "turnos.bin"),
+                                                                   self.inicio + timedelta(hours=2))
+                clinica.cerrar()
+            
+            hilo = threading.Thread(target=operar, daemon=True)
+            hilo.start()
+            hilo.join(timeout=10)
+            self.assertFalse(hilo.is_alive())
+            self.assertEqual(resultados, {"estadisticas": 3, "indice": 1, "archivados": 2})
+
+
+class TestServicioAsincrono(unittest.TestCase):
+    def setUp(self):
+        self.servicio = ServicioClinica()
+        asyncio.run(self._preparar())
+    
+    async def _preparar(self):
+        await self.servicio.agregar_medico("Dra. Async", "MAT014")
+        await self.servicio.agregar_especialidad("MAT014", "Pediatría", ["lunes"])
+        await self.servicio.agregar_paciente("Ana Torres", "11111111", "20/03/1992")
+    
+    def test_reservas_concurrentes_mismo_horario(self):
+        async def reservar_todos():
+            fecha = datetime(2024, 1, 8, 10, 0)
+            return await asyncio.gather(
+                *(self.servicio.agendar_turno("11111111", "MAT014", "Pediatría", fecha) for _ in range(20)),
+                return_exceptions=True
+            )
+        
+        resultados = asyncio.run(reservar_todos())
+        self.assertEqual(sum(isinstance(r, Turno) for r in resultados), 1)
+        self.assertEqual(sum(isinstance(r, ValueError) for r in resultados), 19)
+    
+    def test_protocolo_json(self):
+        respuesta = asyncio.run(self.servicio.atender({
+            "op": "agendar_turno",
+            "args": {"dni": "11111111", "matricula": "MAT014", "especialidad": "Pediatría",
+                     "fecha_hora": "2024-01-08T10:00:00"}
+        }))
+        self.assertTrue(respuesta["ok"])
+        self.assertEqual(respuesta["resultado"]["fecha_hora"], "2024-01-08T10:00:00")
+        
+        respuesta = asyncio.run(self.servicio.atender({"op": "obtener_historia_clinica", "args": {"dni": "11111111"}}))
+        self.assertEqual(len(respuesta["resultado"]["turnos"]), 1)
+        
+        respuesta = asyncio.run(self.servicio.atender({"op": "borrar_todo"}))
+        self.assertFalse(respuesta["ok"])
+        respuesta = asyncio.run(self.servicio.atender({"op": "agregar_paciente", "args": {"dni": "1"}}))
+        self.assertFalse(respuesta["ok"])
+        for argumentos in ("xy", [1, 2], None):
+            respuesta = asyncio.run(self.servicio.atender({"op": "obtener_turnos", "args": argumentos}))
+            self.assertFalse(respuesta["ok"])
+        respuesta = asyncio.run(self.servicio.atender({"op": "agendar_turno", "args": {
+            "dni": "11111111", "matricula": "MAT014", "especialidad": "Pediatría", "fecha_hora": 5}}))
+        self.assertFalse(respuesta["ok"])
+    
+    def test_servidor_tcp(self):
+        async def conversar():
+            servidor = await self.servicio.servir(puerto=0)
+            puerto = servidor.sockets[0].getsockname()[1]
+            lector, escritor = await asyncio.open_connection("127.0.0.1", puerto)
+            escritor.write(b'{"op": "emitir_receta", "args": {"dni": "11111111", "matricula": "MAT014", '
+                           b'"medicamentos": ["Ibuprofeno"]}}\n')
+            escritor.write(b"no es json\n")
+            await escritor.drain()
+            respuestas = [json.loads(await lector.readline()) for _ in range(2)]
+            escritor.close()
+            await escritor.wait_closed()
+            await asyncio.sleep(0.01)
+            servidor.close()
+            await servidor.wait_closed()
+            return respuestas
+        
+        receta, error = asyncio.run(conversar())
+        self.assertEqual(receta["resultado"]["medicamentos"], ["Ibuprofeno"])
+        self.assertIn("JSON inválido", error["error"])
+
+
+class TestProcesadorLotes(unittest.TestCase):
+    def setUp(self):
+        import io
+        self.salida = io.StringIO()
+        self.clinica = Clinica()
+        self.lineas = [
+            '{"op": "agregar_medico", "args": {"nombre": "Dra. Lote", "matricula": "MAT024"}}',
+            '{"op": "agregar_especialidad", "args": {"matricula": "MAT024", "tipo": "Pediatría", "dias": ["lunes"]}}',
+            '{"op": "agregar_paciente", "args": {"nombre": "Ana Torres", "dni": "11111111", '
+            '"fecha_nacimiento": "20/03/1992"}}',
+            "",
+            '{"op": "agendar_turno", "args": {"dni": "11111111", "matricula": "MAT024", "especialidad": "Pediatría", '
+            '"fecha_hora": "2024-01-08T10:00:00"}}',
+            '{"op": "agendar_turno", "args": {"dni": "11111111", "matricula": "MAT024", "especialidad": "Pediatría", '
+            '"fecha_hora": "2024-01-08T10:00:00"}}',
+            "no es json",
+            "[1, 2]",
+        ]
+    
+    def test_procesa_todas_las_lineas(self):
+        procesador = ProcesadorLotes(self.clinica, self.salida)
+        resumen = procesador.procesar(self.lineas)
+        respuestas = [json.loads(linea) for linea in self.salida.getvalue().splitlines()]
+        
+        self.assertEqual(resumen.filas, 7)
+        self.assertEqual(procesador.errores, 3)
+        self.assertEqual([r["linea"] for r in respuestas], [1, 2, 3, 5, 6, 7, 8])
+        self.assertEqual([r["ok"] for r in respuestas], [True, True, True, True, False, False, False])
+        self.assertEqual(len(self.clinica.obtener_turnos()), 1)
+    
+    def test_argumentos_invalidos_no_cortan_el_lote(self):
+        procesador = ProcesadorLotes(self.clinica, self.salida)
+        procesador.procesar(['{"op": "obtener_turnos", "args": "xy"}'] + self.lineas[:3])
+        respuestas = [json.loads(linea) for linea in self.salida.getvalue().splitlines()]
+        self.assertEqual([r["ok"] for r in respuestas], [False, True, True, True])
+    
+    def test_tipos_invalidos_responden_error_y_el_lote_sigue(self):
+        procesador = ProcesadorLotes(self.clinica, self.salida)
+        procesador.procesar([
+            '{"op": "agregar_especialidad", "args": {"matricula": "MAT024", "tipo": "Clínica", "dias": [1]}}',
+            '{"op": "agregar_paciente", "args": {"nombre": "Sin DNI", "dni": 123, "fecha_nacimiento": "01/01/1990"}}',
+            '{"op": "emitir_receta", "args": {"dni": "1", "matricula": "MAT024", "medicamentos": "Ibuprofeno"}}',
+        ] + self.lineas[:3])
+        respuestas = [json.loads(linea) for linea in self.salida.getvalue().splitlines()]
+        self.assertEqual([r["ok"] for r in respuestas], [False, False, False, True, True, True])
+        self.assertIn("dias", respuestas[0]["error"])
+        self.assertEqual([p.obtener_dni() for p in self.clinica.obtener_pacientes()], ["11111111"])
+    
+    def test_solo_errores(self):
+        ProcesadorLotes(self.clinica, self.salida, solo_errores=True).procesar(self.lineas)
+        self.assertEqual([json.loads(l)["linea"] for l in self.salida.getvalue().splitlines()], [6, 7, 8])
+
+
+class TestRecetas(unittest.TestCase):
+    def setUp(self):
+        self.clinica = Clinica()
+        self.paciente = Paciente("Luis Medina", "33333333", "12/12/1975")
+        self.medico = Medico("Dra. Recetas", "MAT005")
+        
+        self.clinica.agregar_paciente(self.paciente)
+        self.clinica.agregar_medico(self.medico)
+        
+        self.medicamentos = ["Paracetamol 500mg", "Ibuprofeno 400mg", "Amoxicilina 250mg"]
+    
+    def test_emision_receta_valida(self):
+        receta = self.clinica.emitir_receta(
+            self.paciente.obtener_dni(),
+            self.medico.obtener_matricula(),
+            self.medicamentos
+        )
+        
+        self.assertIsNotNone(receta)
+        self.assertEqual(receta.paciente.obtener_dni(), self.paciente.obtener_dni())
+        self.assertEqual(receta.medico.obtener_matricula(), self.medico.obtener_matricula())
+        self.assertEqual(receta.medicamentos, self.medicamentos)
+        self.assertIsInstance(receta.fecha, datetime)
+    
+    def test_error_paciente_no_existe_receta(self):
+        with self.assertRaises(ValueError) as context:
+            self.clinica.emitir_receta(
+                "99999999",
+                self.medico.obtener_matricula(),
+                self.medicamentos
+            )
+        self.assertIn("No existe paciente con DNI", str(context.exception))
+    
+    def test_error_medico_no_existe_receta(self):
+        with self.assertRaises(ValueError) as context:
+            self.clinica.emitir_receta(
+                self.paciente.obtener_dni(),
+                "MAT999",
+                self.medicamentos
+            )
+        self.assertIn("No existe médico con matrícula", str(context.exception))
+    
+    def test_error_medicamentos_vacios(self):
+        with self.assertRaises(Exception):
+            self.clinica.emitir_receta(
+                self.paciente.obtener_dni(),
+                self.medico.obtener_matricula(),
+                []  # Lista vacía
+            )
+
+
+class TestHistoriaClinica(unittest.TestCase):
+    def setUp(self):
+        self.clinica = Clinica()
+        self.paciente = Paciente("Roberto Silva", "44444444", "05/09/1980")
+        self.medico = Medico("Dr. Historia", "MAT006")
+        self.especialidad = Especialidad("Medicina General", ["lunes", "martes", "miércoles", "jueves", "viernes"])
+        
+        self.medico.agregar_especialidad(self.especialidad)
+        
+        self.clinica.agregar_paciente(self.paciente)
+        self.clinica.agregar_medico(self.medico)
+    
+    def test_historia_clinica_completa(self):
+        fecha_turno = datetime(2024, 2, 5, 9, 30)
+        turno = self.clinica.agendar_turno(
+            self.paciente.obtener_dni(),
+            self.medico.obtener_matricula(),
+            "Medicina General",
+            fecha_turno
+        )
+        
+        medicamentos = ["Aspirina 100mg", "Vitamina D"]
+        receta = self.clinica.emitir_receta(
+            self.paciente.obtener_dni(),
+            self.medico.obtener_matricula(),
+            medicamentos
+        )
+        
+        historia = self.clinica.obtener_historia_clinica(self.paciente.obtener_dni())
+        
+        self.assertIsNotNone(historia)
+        
+        turnos = historia.obtener_turnos()
+        self.assertEqual(len(turnos), 1)
+        self.assertEqual(turnos[0].fecha_hora, fecha_turno)
+        
+        recetas = historia.obtener_recetas()
+        self.assertEqual(len(recetas), 1)
+        self.assertEqual(recetas[0].medicamentos, medicamentos)
+
+
+class TestCancelacionYReprogramacion(unittest.TestCase):
+    
+    def setUp(self):
+        self.lunes = datetime(2024, 1, 8, 9, 0)
+        self.clinica = self._clinica()
+    
+    def _clinica(self, **opciones) -> Clinica:
+        clinica = Clinica(**opciones)
+        if not clinica.obtener_medicos():
+            medico = Medico("Dra. Ruiz", "MAT030")
+            medico.agregar_especialidad(Especialidad("Pediatría", ["lunes", "miércoles"]))
+            clinica.agregar_medico(medico)
+            clinica.agregar_paciente(Paciente("Ana Gómez", "11111111", "01/01/1990"))
+            clinica.agregar_paciente(Paciente("Luis Díaz", "22222222", "02/02/1985"))
+        return clinica
+    
+    def test_ids_estables_y_unicos(self):
+        primero = self.clinica.agendar_turno("11111111", "MAT030", "Pediatría", self.lunes)
+        segundo = self.clinica.agendar_turno("22222222", "MAT030", "Pediatría", self.lunes + timedelta(hours=1))
+        
+        self.assertNotEqual(primero.id, segundo.id)
+        self.assertIs(self.clinica.obtener_turno(primero.id), primero)
+        self.assertIsNone(self.clinica.obtener_turno(999))
+    
+    def test_cancelar_libera_el_horario_en_todas_las_vistas(self):
+        turno = self.clinica.agendar_turno("11111111", "MAT030", "Pediatría", self.lunes)
+        otro = self.clinica.agendar_turno("22222222", "MAT030", "Pediatría", self.lunes + timedelta(hours=1))
+        estadisticas = self.clinica.obtener_estadisticas()
+        
+        self.assertIs(self.clinica.cancelar_turno(turno.id), turno)
+        
+        self.assertEqual(list(self.clinica.obtener_turnos()), [otro])
+        self.assertEqual(len(self.clinica.obtener_historia_clinica("11111111").turnos), 0)
+        self.assertEqual(list(self.clinica.obtener_turnos_medico("MAT030")), [otro])
+        self.assertEqual(estadisticas.turnos_medico("MAT030"), 1)
+        self.assertEqual(self.clinica.proximo_horario_libre("MAT030", self.lunes), self.lunes)
+        
+        with self.assertRaises(ValueError):
+            self.clinica.cancelar_turno(turno.id)
+        nuevo = self.clinica.agendar_turno("22222222", "MAT030", "Pediatría", self.lunes)
+        self.assertNotEqual(nuevo.id, turno.id)
+    
+    def test_vistas_previas_no_cambian_al_cancelar(self):
+        turnos = [self.clinica.agendar_turno("11111111", "MAT030", "Pediatría", self.lunes + timedelta(hours=i))
+                  for i in range(3)]
+        historia = self.clinica.obtener_historia_clinica("11111111").obtener_turnos()
+        listado = self.clinica.obtener_turnos()
+        
+        self.clinica.cancelar_turno(turnos[0].id)
+        self.clinica.reprogramar_turno(turnos[1].id, self.lunes + timedelta(days=2))
+        
+        self.assertEqual(list(historia), turnos)
+        self.assertEqual(list(listado), turnos)
+        self.assertEqual([turno.id for turno in self.clinica.obtener_turnos()], [turnos[1].id, turnos[2].id])
+    
+    def test_lista_por_bloques_equivale_a_una_lista(self):
+        import random
+        aleatorio = random.Random(3)
+        lista = ListaPorBloques()
+        lista.TAMANO_BLOQUE = 8
+        modelo = {}
+        instantaneas = []
+        for paso in range(600):
+            if modelo and aleatorio.random() < 0.4:
+                ranura = aleatorio.choice(list(modelo))
+                if aleatorio.random() < 0.5:
+                    lista.quitar(ranura)
+                    del modelo[ranura]
+                else:
+                    lista.reemplazar(ranura, -paso)
+                    modelo[ranura] = -paso
+            else:
+                modelo[lista.agregar(paso)] = paso
+            if paso % 50 == 0:
+                instantaneas.append((lista.instantanea(), list(modelo.values())))
+        
+        vista = lista.instantanea()
+        self.assertEqual(list(vista), list(modelo.values()))
+        self.assertEqual([vista[i] for i in range(len(vista))], list(modelo.values()))
+        self.assertEqual(list(vista[10:20]), list(modelo.values())[10:20])
+        for instantanea, esperado in instantaneas:
+            self.assertEqual(list(instantanea), esperado)
+    
+    def test_cancelar_mientras_otro_medico_agenda(self):
+        clinica = Clinica(concurrente=True)
+        for matricula in ("MAT035", "MAT036"):
+            medico = Medico(f"Dr. {matricula}", matricula)
+            medico.agregar_especialidad(Especialidad("Pediatría", list(DIAS_SEMANA)))
+            clinica.agregar_medico(medico)
+        clinica.agregar_paciente(Paciente("Ana Gómez", "11111111", "01/01/1990"))
+        clinica.agregar_paciente(Paciente("Luis Díaz", "22222222", "02/02/1985"))
+        a_cancelar = [clinica.agendar_turno("11111111", "MAT035", "Pediatría", self.lunes + DURACION_TURNO * i)
+                      for i in range(300)]
+        errores = []
+        
+        def cancelar():
+            try:
+                for turno in a_cancelar:
+                    clinica.cancelar_turno(turno.id)
+                    clinica.obtener_turnos(0, 5)
+            except Exception as e:
+                errores.append(e)
+        
+        def agendar():
+            try:
+                for i in range(300):
+                    clinica.agendar_turno("22222222", "MAT036", "Pediatría", self.lunes + DURACION_TURNO * i)
+            except Exception as e:
+                errores.append(e)
+        
+        hilos = [threading.Thread(target=cancelar), threading.Thread(target=agendar)]
+        for hilo in hilos:
+            hilo.start()
+        for hilo in hilos:
+            hilo.join()
+        self.assertEqual(errores, [])
+        self.assertEqual([turno.medico.obtener_matricula() for turno in clinica.obtener_turnos()], ["MAT036"] * 300)
+    
+    def test_reprogramar_conserva_id_y_orden(self):
+        primero = self.clinica.agendar_turno("11111111", "MAT030", "Pediatría", self.lunes)
+        segundo = self.clinica.agendar_turno("22222222", "MAT030", "Pediatría", self.lunes + timedelta(hours=1))
+        
+        movido = self.clinica.reprogramar_turno(primero.id, self.lunes + timedelta(days=2))
+        
+        self.assertEqual(movido.id, primero.id)
+        self.assertEqual([turno.id for turno in self.clinica.obtener_turnos()], [primero.id, segundo.id])
+        self.assertEqual(self.clinica.obtener_historia_clinica("11111111").turnos[0].fecha_hora,
+                         self.lunes + timedelta(days=2))
+        self.assertFalse(self.clinica.validar_turno_no_duplicado(movido.medico, self.lunes + timedelta(days=2)))
+        self.assertTrue(self.clinica.validar_turno_no_duplicado(movido.medico, self.lunes))
+    
+    def test_reprogramar_repite_las_validaciones_de_agendar(self):
+        turno = self.clinica.agendar_turno("11111111", "MAT030", "Pediatría", self.lunes)
+        self.clinica.agendar_turno("22222222", "MAT030", "Pediatría", self.lunes + timedelta(hours=1))
+        
+        with self.assertRaises(ValueError) as contexto:
+            self.clinica.reprogramar_turno(turno.id, self.lunes + timedelta(days=1))
+        self.assertIn("no atiende", str(contexto.exception))
+        with self.assertRaises(ValueError):
+            self.clinica.reprogramar_turno(turno.id, self.lunes + timedelta(hours=1))
+        with self.assertRaises(ValueError):
+            self.clinica.reprogramar_turno(999, self.lunes)
+        self.assertIs(self.clinica.obtener_turno(turno.id), turno)
+    
+    def test_diario_e_instantanea_conservan_ids(self):
+        import tempfile
+        with tempfile.TemporaryDirectory() as directorio:
+            clinica = self._clinica(diario=DiarioOperaciones(directorio))
+            turnos = [clinica.agendar_turno("11111111", "MAT030", "Pediatría", self.lunes + timedelta(days=7 * i))
+                      for i in range(4)]
+            clinica.cancelar_turno(turnos[0].id)
+            clinica.cancelar_turno(turnos[-1].id)
+            clinica.crear_instantanea()
+            clinica.reprogramar_turno(turnos[2].id, self.lunes + timedelta(days=2))
+            clinica.cerrar()
+            
+            restaurada = Clinica.restaurar(DiarioOperaciones(directorio))
+            self.assertIsNone(restaurada.obtener_turno(turnos[0].id))
+            self.assertEqual(restaurada.obtener_turno(turnos[2].id).fecha_hora, self.lunes + timedelta(days=2))
+            self.assertEqual([turno.id for turno in restaurada.obtener_turnos()], [turno.id for turno in turnos[1:-1]])
+            self.assertGreater(restaurada.agendar_turno("22222222", "MAT030", "Pediatría", self.lunes).id,
+                               max(turno.id for turno in turnos))
+            restaurada.cerrar()
+    
+    def test_cancelar_y_reprogramar_en_sqlite(self):
+        clinica = self._clinica(repositorio=RepositorioSQLite())
+        turno = clinica.agendar_turno("11111111", "MAT030", "Pediatría", self.lunes)
+        otro = clinica.agendar_turno("22222222", "MAT030", "Pediatría", self.lunes + timedelta(hours=1))
+        
+        clinica.reprogramar_turno(turno.id, self.lunes + timedelta(days=2))
+        self.assertEqual(clinica.obtener_turno(turno.id).fecha_hora, self.lunes + timedelta(days=2))
+        clinica.cancelar_turno(otro.id)
+        self.assertEqual([t.id for t in clinica.obtener_turnos()], [turno.id])
+        clinica.cerrar()
+    
+    def test_sqlite_no_reutiliza_el_id_cancelado_al_reabrir(self):
+        import tempfile
+        with tempfile.TemporaryDirectory() as directorio:
+            ruta = os.path.join(directorio, "clinica.db")
+            clinica = self._clinica(repositorio=RepositorioSQLite(ruta))
+            clinica.agendar_turno("11111111", "MAT030", "Pediatría", self.lunes)
+            ultimo = clinica.agendar_turno("22222222", "MAT030", "Pediatría", self.lunes + timedelta(hours=1))
+            clinica.cancelar_turno(ultimo.id)
+            clinica.cerrar()
+            
+            reabierta = self._clinica(repositorio=RepositorioSQLite(ruta))
+            nuevo = reabierta.agendar_turno("22222222", "MAT030", "Pediatría", self.lunes + timedelta(days=2))
+            self.assertGreater(nuevo.id, ultimo.id)
+            reabierta.cerrar()
+
+
+class TestDuracionTurnos(unittest.TestCase):
+    
+    def setUp(self):
+        self.lunes = datetime(2024, 1, 8, 10, 0)
+        self.clinica = self._clinica()
+    
+    def _clinica(self, **opciones) -> Clinica:
+        clinica = Clinica(**opciones)
+        if not clinica.obtener_medicos():
+            medico = Medico("Dr. Pulso", "MAT031")
+            medico.agregar_especialidad(Especialidad("Cardiología", ["lunes"], timedelta(minutes=45)))
+            medico.agregar_especialidad(Especialidad("Clínica Médica", ["lunes"]))
+            clinica.agregar_medico(medico)
+            clinica.agregar_paciente(Paciente("Ana Gómez", "11111111", "01/01/1990"))
+        return clinica
+    
+    def _agendar(self, especialidad: str, minutos: int):
+        return self.clinica.agendar_turno("11111111", "MAT031", especialidad, self.lunes + timedelta(minutes=minutos))
+    
+    def test_duracion_por_especialidad(self):
+        self.assertEqual(self._agendar("Cardiología", 0).fin, self.lunes + timedelta(minutes=45))
+        self.assertEqual(self._agendar("Clínica Médica", 60).duracion, DURACION_TURNO)
+        with self.assertRaises(ValueError):
+            Especialidad("Pediatría", ["lunes"], timedelta(0))
+        with self.assertRaises(ValueError):
+            Especialidad("Pediatría", ["lunes"], timedelta(seconds=90))
+    
+    def test_duracion_distinta_para_el_mismo_tipo(self):
+        with self.assertRaises(ValueError):
+            self.clinica.agregar_especialidad("MAT031", Especialidad("Cardiología", ["sábado"], timedelta(minutes=60)))
+        self.assertIsNone(self.clinica.obtener_medico_por_matricula("MAT031").obtener_especialidad_para_dia("sábado"))
+        
+        self.clinica.agregar_especialidad("MAT031", Especialidad("Cardiología", ["martes"], timedelta(minutes=45)))
+        martes = self.lunes + timedelta(days=1)
+        self.assertEqual(self.clinica.agendar_turno("11111111", "MAT031", "Cardiología", martes).fin,
+                         martes + timedelta(minutes=45))
+    
+    def test_rechaza_turnos_superpuestos(self):
+        self._agendar("Cardiología", 0)
+        for minutos, especialidad in ((5, "Clínica Médica"), (30, "Cardiología"), (-20, "Clínica Médica")):
+            with self.assertRaises(ValueError) as contexto:
+                self._agendar(especialidad, minutos)
+            self.assertIn("se superpone", str(contexto.exception))
+        
+        # Los turnos que solo se tocan en un extremo no se superponen
+        self._agendar("Clínica Médica", -30)
+        self._agendar("Clínica Médica", 45)
+        self.assertFalse(self.clinica.validar_turno_no_duplicado(self.clinica.obtener_medicos()[0],
+                                                                 self.lunes + timedelta(minutes=20)))
+        self.assertEqual(self.clinica.proximo_horario_libre("MAT031", self.lunes - timedelta(minutes=30)),
+                         self.lunes + timedelta(minutes=90))
+    
+    def test_superposicion_dentro_del_lote(self):
+        filas = [("11111111", "MAT031", "Cardiología", self.lunes),
+                 ("11111111", "MAT031", "Clínica Médica", self.lunes + timedelta(minutes=30)),
+                 ("11111111", "MAT031", "Clínica Médica", self.lunes),
+                 ("11111111", "MAT031", "Clínica Médica", self.lunes + timedelta(minutes=45))]
+        resultado = self.clinica.agendar_turnos_bulk(filas)
+        
+        self.assertEqual([fila for fila, _ in resultado.errores], [1, 2])
+        self.assertIn("se superpone con otro turno del lote", resultado.errores[0][1])
+        self.assertIn("repetido dentro del lote", resultado.errores[1][1])
+        self.assertEqual(len(self.clinica.obtener_turnos()), 0)
+    
+    def test_reprogramar_dentro_de_su_propio_horario(self):
+        turno = self._agendar("Cardiología", 0)
+        self._agendar("Clínica Médica", 60)
+        
+        self.assertEqual(self.clinica.reprogramar_turno(turno.id, self.lunes + timedelta(minutes=15)).fin,
+                         self.lunes + timedelta(minutes=60))
+        with self.assertRaises(ValueError):
+            self.clinica.reprogramar_turno(turno.id, self.lunes + timedelta(minutes=30))
+    
+    def test_horarios_libres_usan_la_duracion_de_la_especialidad(self):
+        self._agendar("Clínica Médica", 60)
+        horarios = [fecha for fecha, _ in self.clinica.buscar_horarios_libres("Cardiología", self.lunes, 3)]
+        # La grilla de 45 minutos arranca a las 8: 10:15, 11:00 choca con el turno de las 11, 11:45 y 12:30
+        self.assertEqual(horarios, [self.lunes + timedelta(minutes=15), self.lunes + timedelta(minutes=105),
+                                    self.lunes + timedelta(minutes=150)])
+    
+    def test_turno_archivado_bloquea_su_duracion(self):
+        import tempfile
+        with tempfile.TemporaryDirectory() as directorio:
+            self._agendar("Cardiología", 0)
+            self.clinica.archivar_turnos(os.path.join(directorio, "turnos.bin"), self.lunes + timedelta(minutes=1))
+            with self.assertRaises(ValueError):
+                self._agendar("Clínica Médica", 30)
+            self._agendar("Clínica Médica", 45)
+    
+    def test_duracion_persistida(self):
+        import tempfile
+        with tempfile.TemporaryDirectory() as directorio:
+            self._agendar("Cardiología", 0)
+            PersistenciaClinica(self.clinica).exportar_csv(directorio)
+            restaurada = Clinica()
+            PersistenciaClinica(restaurada).importar_csv(directorio)
+            self.assertEqual(restaurada.obtener_turnos()[0].duracion, timedelta(minutes=45))
+            
+            ruta = os.path.join(directorio, "clinica.sqlite")
+            clinica = self._clinica(repositorio=RepositorioSQLite(ruta))
+            clinica.agendar_turno("11111111", "MAT031", "Cardiología", self.lunes)
+            clinica.cerrar()
+            reabierta = Clinica(repositorio=RepositorioSQLite(ruta))
+            with self.assertRaises(ValueError):
+                reabierta.agendar_turno("11111111", "MAT031", "Clínica Médica", self.lunes + timedelta(minutes=30))
+            reabierta.agendar_turno("11111111", "MAT031", "Clínica Médica", self.lunes + timedelta(minutes=45))
+            self.assertEqual(reabierta.obtener_turno(1).fin, self.lunes + timedelta(minutes=45))
+            reabierta.cerrar()
+
+
+class TestSeriesDeTurnos(unittest.TestCase):
+    
+    def setUp(self):
+        self.clinica = Clinica()
+        medico = Medico("Dra. Crónica", "MAT032")
+        medico.agregar_especialidad(Especialidad("Clínica Médica", ["lunes", "jueves"]))
+        self.clinica.agregar_medico(medico)
+        self.clinica.agregar_paciente(Paciente("Ana Gómez", "11111111", "01/01/1990"))
+        self.clinica.agregar_paciente(Paciente("Luis Díaz", "22222222", "02/02/1985"))
+        self.lunes = datetime(2024, 1, 8, 10, 0)
+    
+    def test_serie_semanal(self):
+        resultado = self.clinica.agendar_serie("11111111", "MAT032", "Clínica Médica", self.lunes, 52)
+        
+        self.assertTrue(resultado.exitoso)
+        self.assertEqual([turno.fecha_hora for turno in resultado.registros],
+                         [self.lunes + timedelta(weeks=i) for i in range(52)])
+        self.assertEqual([turno.id for turno in resultado.registros], list(range(1, 53)))
+        self.assertEqual(len(self.clinica.obtener_historia_clinica("11111111").turnos), 52)
+        self.assertEqual(self.clinica.obtener_estadisticas().turnos_medico("MAT032"), 52)
+    
+    def test_serie_quincenal(self):
+        resultado = self.clinica.agendar_serie("11111111", "MAT032", "Clínica Médica", self.lunes, 4, cada_semanas=2)
+        self.assertEqual([turno.fecha_hora for turno in self.clinica.obtener_turnos_medico("MAT032")],
+                         [self.lunes + timedelta(weeks=2 * i) for i in range(4)])
+        self.assertEqual(len(resultado.registros), 4)
+    
+    def test_serie_con_conflictos_no_agenda_nada(self):
+        for desplazamiento in (timedelta(weeks=3), timedelta(weeks=5, minutes=15)):
+            self.clinica.agendar_turno("22222222", "MAT032", "Clínica Médica", self.lunes + desplazamiento)
+        
+        resultado = self.clinica.agendar_serie("11111111", "MAT032", "Clínica Médica", self.lunes, 8)
+        
+        self.assertFalse(resultado.exitoso)
+        self.assertEqual([fila for fila, _ in resultado.errores], [3, 5])
+        self.assertTrue(resultado.errores[0][1].startswith("29/01/2024 10:00"))
+        self.assertTrue(resultado.errores[1][1].startswith("12/02/2024 10:00"))
+        self.assertEqual(len(self.clinica.obtener_turnos()), 2)
+        self.assertEqual(self.clinica.agendar_turno("11111111", "MAT032", "Clínica Médica", self.lunes).id, 3)
+    
+    def test_serie_invalida(self):
+        with self.assertRaises(ValueError):
+            self.clinica.agendar_serie("11111111", "MAT032", "Clínica Médica", self.lunes + timedelta(days=1), 4)
+        with self.assertRaises(ValueError):
+            self.clinica.agendar_serie("99999999", "MAT032", "Clínica Médica", self.lunes, 4)
+        with self.assertRaises(ValueError):
+            self.clinica.agendar_serie("11111111", "MAT032", "Clínica Médica", self.lunes, 0)
+        with self.assertRaises(ValueError):
+            self.clinica.agendar_serie("11111111", "MAT032", "Clínica Médica", self.lunes, 4, cada_semanas=0)
+        self.assertEqual(len(self.clinica.obtener_turnos()), 0)
+    
+    def test_serie_por_el_servicio(self):
+        servicio = ServicioClinica(self.clinica)
+        argumentos = {"dni": "11111111", "matricula": "MAT032", "especialidad": "Clínica Médica",
+                      "fecha_hora": "2024-01-11T09:00:00", "repeticiones": 3}
+        
+        respuesta = asyncio.run(servicio.atender({"op": "agendar_serie", "args": argumentos}))
+        self.assertEqual([turno["fecha_hora"][:10] for turno in respuesta["resultado"]],
+                         ["2024-01-11", "2024-01-18", "2024-01-25"])
+        
+        respuesta = asyncio.run(servicio.atender({"op": "agendar_serie", "args": argumentos}))
+        self.assertFalse(respuesta["ok"])
+        self.assertIn("18/01/2024 09:00", respuesta["error"])
+
+
+class TestIndiceMedicamentos(unittest.TestCase):
+    
+    def setUp(self):
+        self.clinica = Clinica()
+        for matricula in ("MAT041", "MAT042"):
+            self.clinica.agregar_medico(Medico(f"Dr. {matricula}", matricula))
+        for dni in ("11111111", "22222222", "33333333"):
+            self.clinica.agregar_paciente(Paciente(f"Paciente {dni}", dni, "01/01/1990"))
+        self.enero = datetime(2024, 1, 10, 9, 0)
+    
+    def test_nombres_normalizados_comparten_id(self):
+        self.clinica.emitir_receta("11111111", "MAT041", ["Ibuprofeno 400mg", "Omeprazol"], self.enero)
+        self.clinica.emitir_receta("22222222", "MAT042", ["  IBUPROFENO   400MG "], self.enero)
+        indice = self.clinica.obtener_indice_medicamentos()
+        
+        self.assertEqual(len(indice), 2)
+        self.assertEqual(indice.id_medicamento("ibuprofeno 400mg"), indice.id_medicamento("Ibuprofeno 400MG"))
+        self.assertEqual(indice.nombre(indice.id_medicamento("ibuprofeno 400mg")), "Ibuprofeno 400mg")
+        self.assertEqual(list(indice.catalogo), ["Ibuprofeno 400mg", "Omeprazol"])
+        self.assertEqual([p.obtener_dni() for p in indice.pacientes("IBUPROFENO 400MG")], ["11111111", "22222222"])
+    
+    def test_consulta_por_rango_de_fechas(self):
+        for semanas, dni in enumerate(("11111111", "22222222", "33333333")):
+            self.clinica.emitir_receta(dni, "MAT041", ["Amoxicilina"], self.enero + timedelta(weeks=semanas))
+        
+        pacientes = self.clinica.pacientes_con_medicamento("amoxicilina", self.enero + timedelta(days=1),
+                                                           self.enero + timedelta(weeks=2))
+        self.assertEqual([paciente.obtener_dni() for paciente in pacientes], ["22222222"])
+        self.assertEqual(len(self.clinica.pacientes_con_medicamento("Amoxicilina", desde=self.enero)), 3)
+        self.assertEqual(self.clinica.pacientes_con_medicamento("Amoxicilina", hasta=self.enero), [])
+    
+    def test_recetas_posteriores_actualizan_el_indice(self):
+        self.clinica.emitir_receta("11111111", "MAT041", ["Paracetamol"], self.enero + timedelta(weeks=1))
+        indice = self.clinica.obtener_indice_medicamentos()
+        self.clinica.emitir_receta("22222222", "MAT042", ["paracetamol", "Paracetamol"], self.enero)
+        self.clinica.emitir_receta("11111111", "MAT042", ["Paracetamol"], self.enero + timedelta(weeks=2))
+        
+        recetas = indice.recetas("Paracetamol")
+        self.assertEqual([receta.fecha for receta in recetas],
+                         [self.enero, self.enero + timedelta(weeks=1), self.enero + timedelta(weeks=2)])
+        self.assertEqual([p.obtener_dni() for p in indice.pacientes("Paracetamol")], ["22222222", "11111111"])
+        self.assertEqual([m.obtener_matricula() for m in indice.medicos("Paracetamol")], ["MAT042", "MAT041"])
+        self.assertIs(self.clinica.obtener_indice_medicamentos(), indice)
+    
+    def test_medicamento_desconocido(self):
+        self.clinica.emitir_receta("11111111", "MAT041", ["Loratadina"], self.enero)
+        indice = self.clinica.obtener_indice_medicamentos()
+        
+        self.assertIsNone(indice.id_medicamento("Cetirizina"))
+        self.assertEqual(len(indice.recetas("Cetirizina")), 0)
+        self.assertEqual(indice.pacientes("Cetirizina"), [])
+    
+    def test_consulta_por_el_servicio(self):
+        self.clinica.emitir_receta("33333333", "MAT041", ["Metformina 850mg"], self.enero)
+        servicio = ServicioClinica(self.clinica)
+        
+        respuesta = asyncio.run(servicio.atender({"op": "pacientes_con_medicamento",
+                                                  "args": {"medicamento": "metformina 850 MG",
+                                                           "desde": "2024-01-01T00:00:00"}}))
+        self.assertEqual(respuesta["resultado"], [])
+        respuesta = asyncio.run(servicio.atender({"op": "pacientes_con_medicamento",
+                                                  "args": {"medicamento": "METFORMINA 850mg",
+                                                           "desde": "2024-01-01T00:00:00"}}))
+        self.assertEqual([paciente["dni"] for paciente in respuesta["resultado"]], ["33333333"])
+
+
+class TestSuiteBenchmarks(unittest.TestCase):
+    
+    def test_generador_es_determinista(self):
+        primero = GeneradorClinica(pacientes=50, medicos=5, semilla=7)
+        segundo = GeneradorClinica(pacientes=50, medicos=5, semilla=7)
+        
+        self.assertEqual([primero.proximo_turno() for _ in range(100)], [segundo.proximo_turno() for _ in range(100)])
+        self.assertEqual([primero.proxima_receta() for _ in range(20)], [segundo.proxima_receta() for _ in range(20)])
+    
+    def test_clinica_sintetica_respeta_dias_de_atencion(self):
+        clinica = GeneradorClinica(pacientes=100, medicos=8, semilla=1).construir(turnos=500, recetas=100)
+        
+        self.assertEqual(len(clinica.obtener_turnos()), 500)
+        self.assertEqual(len(clinica.obtener_pacientes()), 100)
+        for turno in clinica.obtener_turnos():
+            dia = DIAS_SEMANA[turno.fecha_hora.weekday()]
+            self.assertIn(turno.especialidad, turno.medico.obtener_especialidades_para_dia(dia))
+            self.assertTrue(8 <= turno.fecha_hora.hour < 18)
+    
+    def test_resultados_en_json_y_comparacion(self):
+        resultado = json.loads(json.dumps(suite_benchmarks(escalas=(200,), muestras=20)))
+        
+        operaciones = {fila["operacion"] for fila in resultado["resultados"]}
+        self.assertIn("agendar_turno", operaciones)
+        self.assertIn("verificar_turno_duplicado", operaciones)
+        self.assertEqual(comparar_benchmarks(resultado, resultado), [])
+        
+        peor = json.loads(json.dumps(resultado))
+        peor["resultados"][0]["us_p50"] = resultado["resultados"][0]["us_p50"] * 3 + 2
+        regresiones = comparar_benchmarks(resultado, peor)
+        self.assertEqual(len(regresiones), 1)
+        self.assertEqual(regresiones[0]["operacion"], resultado["resultados"][0]["operacion"])
+
+
+class TestClinicaFragmentada(unittest.TestCase):
+    
+    @classmethod
+    def setUpClass(cls):
+        cls.clinica = ClinicaFragmentada(3)
+        cls.clinica.agregar_pacientes_bulk([Paciente("Ana Gómez", "11111111", "01/01/1990"),
+                                            Paciente("Luis Díaz", "22222222", "02/02/1985")])
+        medicos = []
+        for i in range(6):
+            medico = Medico(f"Dr. Fragmento {i}", f"MF{i:03d}")
+            medico.agregar_especialidad(Especialidad("Clínica Médica", ["lunes", "martes"]))
+            medicos.append(medico)
+        cls.clinica.agregar_medicos_bulk(medicos)
+    
+    @classmethod
+    def tearDownClass(cls):
+        cls.clinica.cerrar()
+    
+    def test_medicos_repartidos_entre_fragmentos(self):
+        self.assertEqual(len(self.clinica.obtener_medicos()), 6)
+        self.assertEqual(len({self.clinica.fragmento_de(f"MF{i:03d}") for i in range(6)}), 3)
+        self.assertEqual(len(self.clinica.obtener_pacientes()), 2)
+    
+    def test_fragmento_sigue_atendiendo_tras_un_error_inesperado(self):
+        with self.assertRaises(ValueError):
+            self.clinica.agendar_turno("11111111", "MF005", "Clínica Médica", "2024-01-01 09:00")
+        self.assertEqual(len(self.clinica.obtener_medicos()), 6)
+    
+    def test_agendar_y_detectar_duplicado_en_el_fragmento_del_medico(self):
+        fecha = datetime(2024, 1, 1, 9, 0)
+        turno = self.clinica.agendar_turno("11111111", "MF000", "Clínica Médica", fecha)
+        
+        self.assertEqual(turno.medico.obtener_matricula(), "MF000")
+        with self.assertRaises(ValueError):
+            self.clinica.agendar_turno("22222222", "MF000", "Clínica Médica", fecha)
+        with self.assertRaises(ValueError):
+            self.clinica.agendar_turno("99999999", "MF001", "Clínica Médica", fecha)
+    
+    def test_serie_en_el_fragmento_del_medico(self):
+        resultado = self.clinica.agendar_serie("11111111", "MF004", "Clínica Médica", datetime(2024, 2, 5, 11, 0), 3)
+        self.assertEqual([turno.fecha_hora.day for turno in resultado.registros], [5, 12, 19])
+        self.assertFalse(self.clinica.agendar_serie("22222222", "MF004", "Clínica Médica",
+                                                    datetime(2024, 2, 12, 11, 0), 2).exitoso)
+    
+    def test_lote_entre_fragmentos_es_todo_o_nada(self):
+        filas = [("22222222", f"MF{i:03d}", "Clínica Médica", datetime(2024, 1, 2, 10, 0)) for i in range(6)]
+        rechazado = self.clinica.agendar_turnos_bulk(filas + [("22222222", "MF003", "Clínica Médica",
+                                                                  datetime(2024, 1, 3, 10, 0))])
+        
+        self.assertFalse(rechazado.exitoso)
+        self.assertEqual(rechazado.errores[0][0], 6)
+        self.assertEqual(len(self.clinica.obtener_historia_clinica("22222222").turnos), 0)
+        
+        aplicado = self.clinica.agendar_turnos_bulk(filas)
+        self.assertTrue(aplicado.exitoso)
+        self.assertEqual([turno.medico.obtener_matricula() for turno in aplicado.registros],
+                         [f"MF{i:03d}" for i in range(6)])
+    
+    def test_historia_combina_todos_los_fragmentos(self):
+        self.clinica.agendar_turno("11111111", "MF004", "Clínica Médica", datetime(2024, 1, 8, 11, 0))
+        self.clinica.agendar_turno("11111111", "MF002", "Clínica Médica", datetime(2024, 1, 8, 8, 0))
+        self.clinica.emitir_receta("11111111", "MF005", ["Ibuprofeno 400mg"])
+        
+        historia = self.clinica.obtener_historia_clinica("11111111")
+        fechas = [turno.fecha_hora for turno in historia.turnos]
+        
+        self.assertEqual(fechas, sorted(fechas))
+        self.assertIn(datetime(2024, 1, 8, 8, 0), fechas)
+        self.assertEqual(len(historia.recetas), 1)
+        self.assertIsNone(self.clinica.obtener_historia_clinica("99999999"))
+    
+    def test_ids_unicos_y_cancelacion_por_el_servicio(self):
+        servicio = ServicioClinica(self.clinica)
+        for i in range(6):
+            self.clinica.agendar_turno("11111111", f"MF{i:03d}", "Clínica Médica", datetime(2024, 3, 4, 9 + i, 0))
+        listado = [turno for turno in self.clinica.obtener_turnos() if turno.fecha_hora.month == 3]
+        ids = [turno.id for turno in self.clinica.obtener_turnos()]
+        self.assertEqual(len(ids), len(set(ids)))
+        
+        cancelado, movido = listado[0], listado[1]
+        respuesta = asyncio.run(servicio.atender({"op": "cancelar_turno", "args": {"id_turno": cancelado.id}}))
+        self.assertTrue(respuesta["ok"])
+        self.assertEqual(respuesta["resultado"]["matricula"], cancelado.medico.obtener_matricula())
+        respuesta = asyncio.run(servicio.atender({"op": "reprogramar_turno", "args": {
+            "id_turno": movido.id, "fecha_hora": "2024-03-05T15:00:00"}}))
+        self.assertTrue(respuesta["ok"])
+        
+        self.assertIsNone(self.clinica.obtener_turno(cancelado.id))
+        self.assertEqual(self.clinica.obtener_turno(movido.id).fecha_hora, datetime(2024, 3, 5, 15, 0))
+        self.assertNotIn(cancelado.id, [turno.id for turno in self.clinica.obtener_turnos()])
+        with self.assertRaises(ValueError):
+            self.clinica.cancelar_turno(cancelado.id)
+
+
+class TestArranquePerezoso(unittest.TestCase):
+    
+    def test_importar_paquete_no_carga_dependencias_pesadas(self):
+        codigo = ("import sys, sistema_clinica; "
+                  "print(','.join(m for m in ('sqlite3', 'asyncio', 'numpy', 'unittest', 'csv', 'mmap', "
+                  "'multiprocessing') "
+                  "if m in sys.modules))")
+        raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+        salida = subprocess.run([sys.executable, "-c", codigo], cwd=raiz, capture_output=True, text=True, check=True)
+        self.assertEqual(salida.stdout.strip(), "")
+    
+    def test_componentes_perezosos_se_resuelven_al_primer_uso(self):
+        import sistema_clinica
+        
+        self.assertIs(sistema_clinica.RepositorioSQLite, RepositorioSQLite)
+        self.assertIs(sistema_clinica.DiarioOperaciones, DiarioOperaciones)
+        self.assertIn("ClinicaCLI", dir(sistema_clinica))
+        with self.assertRaises(AttributeError):
+            sistema_clinica.Inexistente
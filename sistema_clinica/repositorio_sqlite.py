@@ -0,0 +1,322 @@
+from collections.abc import Sequence
+from datetime import datetime, timedelta
+from typing import List, Optional, Iterable
+import json
+import threading
+
+from .entidades import AgendaMedico, Especialidad, HistoriaClinica, Medico, Paciente, Receta, Turno
+from .nucleo import RepositorioClinica
+
+
+class AgendaSQLite(AgendaMedico):
+    def __init__(self, medico: Medico, repositorio: 'RepositorioSQLite'):
+        super().__init__(medico)
+        self.__repositorio = repositorio
+    
+    def agregar_turno(self, turno: Turno):
+        self.__repositorio.guardar_turnos([turno])
+    
+    def agregar_turnos(self, turnos: Iterable[Turno]):
+        self.__repositorio.guardar_turnos(list(turnos))
+    
+    def se_superpone(self, inicio: datetime, fin: datetime, excluir: Optional[int] = None) -> bool:
+        return self.__repositorio.existe_superposicion(self.medico.obtener_matricula(), inicio, fin, excluir)
+    
+    def obtener_turnos_entre(self, desde: Optional[datetime] = None, hasta: Optional[datetime] = None) -> List[Turno]:
+        return self.__repositorio.listar_turnos_medico(self.medico.obtener_matricula(), desde, hasta)
+    
+    def __len__(self) -> int:
+        return self.__repositorio.contar_turnos_medico(self.medico.obtener_matricula())
+
+
+class RepositorioSQLite(RepositorioClinica):
+    MINUTO = timedelta(minutes=1)
+    ESQUEMA = """
+        CREATE TABLE IF NOT EXISTS pacientes (
+            dni TEXT PRIMARY KEY,
+            nombre TEXT NOT NULL,
+            fecha_nacimiento TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS medicos (
+            matricula TEXT PRIMARY KEY,
+            nombre TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS especialidades (
+            id INTEGER PRIMARY KEY,
+            matricula TEXT NOT NULL REFERENCES medicos (matricula),
+            tipo TEXT NOT NULL,
+            dias TEXT NOT NULL,
+            duracion INTEGER NOT NULL DEFAULT 30
+        );
+        CREATE TABLE IF NOT EXISTS turnos (
+            id INTEGER PRIMARY KEY,
+            dni TEXT NOT NULL REFERENCES pacientes (dni),
+            matricula TEXT NOT NULL REFERENCES medicos (matricula),
+            especialidad TEXT NOT NULL,
+            fecha_hora TEXT NOT NULL,
+            UNIQUE (matricula, fecha_hora)
+        );
+        CREATE TABLE IF NOT EXISTS recetas (
+            id INTEGER PRIMARY KEY,
+            dni TEXT NOT NULL REFERENCES pacientes (dni),
+            matricula TEXT NOT NULL REFERENCES medicos (matricula),
+            fecha TEXT NOT NULL,
+            medicamentos TEXT NOT NULL
+        );
+        CREATE TABLE IF NOT EXISTS contadores (
+            nombre TEXT PRIMARY KEY,
+            valor INTEGER NOT NULL
+        );
+        CREATE INDEX IF NOT EXISTS idx_especialidades_matricula ON especialidades (matricula);
+        CREATE INDEX IF NOT EXISTS idx_turnos_dni ON turnos (dni, fecha_hora);
+        CREATE INDEX IF NOT EXISTS idx_recetas_dni ON recetas (dni);
+    """
+    
+    def __init__(self, ruta: str = ":memory:"):
+        import sqlite3
+        import weakref
+        
+        self.__bloqueo = threading.RLock()
+        self.__conexion = sqlite3.connect(ruta, check_same_thread=False)
+        self.__conexion.execute("PRAGMA foreign_keys = ON")
+        if ruta != ":memory:":
+            self.__conexion.execute("PRAGMA journal_mode = WAL")
+            self.__conexion.execute("PRAGMA synchronous = NORMAL")
+        self.__conexion.executescript(self.ESQUEMA)
+        # Bases creadas antes de que las especialidades tuvieran duración
+        columnas = {fila[1] for fila in self.__conexion.execute("PRAGMA table_info(especialidades)")}
+        if "duracion" not in columnas:
+            self.__conexion.execute("ALTER TABLE especialidades ADD COLUMN duracion INTEGER NOT NULL DEFAULT 30")
+        self.__error_integridad = sqlite3.IntegrityError
+        self.__pacientes = weakref.WeakValueDictionary()
+        self.__medicos = {}
+        # (version, generacion) de cada historia: las historias se arman en cada consulta, así que la caché de la CLI
+        # no puede tomar la versión del objeto
+        self.__versiones_historias = {}
+        self.__cargar_medicos()
+    
+    # Pacientes
+    def existe_paciente(self, dni: str) -> bool:
+        if dni in self.__pacientes:
+            return True
+        return self.__consultar_uno("SELECT 1 FROM pacientes WHERE dni = ?", (dni,)) is not None
+    
+    def obtener_paciente(self, dni: str) -> Optional[Paciente]:
+        paciente = self.__pacientes.get(dni)
+        if paciente is not None:
+            return paciente
+        
+        fila = self.__consultar_uno(
+            "SELECT nombre, dni, fecha_nacimiento FROM pacientes WHERE dni = ?", (dni,)
+        )
+        return self.__paciente_desde_fila(fila) if fila else None
+    
+    def listar_pacientes(self) -> List[Paciente]:
+        filas = self.__consultar("SELECT nombre, dni, fecha_nacimiento FROM pacientes ORDER BY rowid")
+        return [self.__paciente_desde_fila(fila) for fila in filas]
+    
+    def guardar_pacientes(self, pacientes: List[Paciente]):
+        try:
+            with self.__bloqueo, self.__conexion:
+                self.__conexion.executemany(
+                    "INSERT INTO pacientes (nombre, dni, fecha_nacimiento) VALUES (?, ?, ?)",
+                    ((p.nombre, p.obtener_dni(), p.fecha_nacimiento) for p in pacientes)
+                )
+        except self.__error_integridad as e:
+            raise ValueError(f"Ya existe un paciente con ese DNI: {e}") from e
+        for paciente in pacientes:
+            self.__pacientes[paciente.obtener_dni()] = paciente
+    
+    # Médicos y especialidades
+    def existe_medico(self, matricula: str) -> bool:
+        return matricula in self.__medicos
+    
+    def obtener_medico(self, matricula: str) -> Optional[Medico]:
+        return self.__medicos.get(matricula)
+    
+    def listar_medicos(self) -> List[Medico]:
+        return list(self.__medicos.values())
+    
+    def guardar_medicos(self, medicos: List[Medico]):
+        try:
+            with self.__bloqueo, self.__conexion:
+                self.__conexion.executemany(
+                    "INSERT INTO medicos (nombre, matricula) VALUES (?, ?)",
+                    ((m.nombre, m.obtener_matricula()) for m in medicos)
+                )
+                self.__conexion.executemany(
+                    "INSERT INTO especialidades (matricula, tipo, dias, duracion) VALUES (?, ?, ?, ?)",
+                    ((m.obtener_matricula(), e.tipo, "|".join(e.dias), e.duracion // self.MINUTO)
+                     for m in medicos for e in m.especialidades)
+                )
+        except self.__error_integridad as e:
+            raise ValueError(f"Ya existe un médico con esa matrícula: {e}") from e
+        for medico in medicos:
+            self.__medicos[medico.obtener_matricula()] = medico
+    
+    def guardar_especialidad(self, matricula: str, especialidad: Especialidad):
+        with self.__bloqueo, self.__conexion:
+            self.__conexion.execute(
+                "INSERT INTO especialidades (matricula, tipo, dias, duracion) VALUES (?, ?, ?, ?)",
+                (matricula, especialidad.tipo, "|".join(especialidad.dias), especialidad.duracion // self.MINUTO)
+            )
+    
+    # Turnos
+    def existe_superposicion(self, matricula: str, inicio: datetime, fin: datetime,
+                             excluir: Optional[int] = None) -> bool:
+        # Igual que la agenda en memoria: el índice único (matricula, fecha_hora) lleva directo al último turno
+        # que empieza antes del final pedido, y su duración sale de la especialidad
+        fila = self.__consultar_uno(
+            "SELECT especialidad, fecha_hora FROM turnos WHERE matricula = ? AND fecha_hora " +
+            ("<" if fin > inicio else "<=") + " ? AND id IS NOT ? ORDER BY fecha_hora DESC LIMIT 1",
+            (matricula, self.__formatear_fecha(fin), excluir)
+        )
+        if fila is None:
+            return False
+        return datetime.fromisoformat(fila[1]) + self.__medicos[matricula].obtener_duracion(fila[0]) > inicio
+    
+    def guardar_turnos(self, turnos: List[Turno]):
+        try:
+            with self.__bloqueo, self.__conexion:
+                self.__conexion.executemany(
+                    "INSERT INTO turnos (id, dni, matricula, especialidad, fecha_hora) VALUES (?, ?, ?, ?, ?)",
+                    ((t.id, t.paciente.obtener_dni(), t.medico.obtener_matricula(), t.especialidad,
+                      self.__formatear_fecha(t.fecha_hora)) for t in turnos)
+                )
+                for turno in turnos:
+                    self.__modificar_historia(turno.paciente.obtener_dni())
+        except self.__error_integridad as e:
+            raise ValueError("Ya existe un turno para ese médico en esa fecha y hora") from e
+    
+    def listar_turnos(self, offset: int = 0, limite: Optional[int] = None) -> Sequence:
+        return self.__consultar_turnos("ORDER BY t.id LIMIT ? OFFSET ?", (-1 if limite is None else limite, offset))
+    
+    def obtener_turno(self, id_turno: int) -> Optional[Turno]:
+        turnos = self.__consultar_turnos("WHERE t.id = ?", (id_turno,))
+        return turnos[0] if turnos else None
+    
+    def cancelar_turno(self, turno: Turno):
+        # Si era el último id, MAX(id) bajaría: el contador lo conserva para que no se vuelva a entregar
+        with self.__bloqueo, self.__conexion:
+            self.__conexion.execute("INSERT INTO contadores (nombre, valor) VALUES ('ultimo_id_turno', ?) "
+                                    "ON CONFLICT (nombre) DO UPDATE SET valor = MAX(valor, excluded.valor)",
+                                    (turno.id,))
+            self.__conexion.execute("DELETE FROM turnos WHERE id = ?", (turno.id,))
+            self.__modificar_historia(turno.paciente.obtener_dni(), reordena=True)
+    
+    def reemplazar_turno(self, anterior: Turno, nuevo: Turno):
+        try:
+            with self.__bloqueo, self.__conexion:
+                self.__conexion.execute("UPDATE turnos SET fecha_hora = ? WHERE id = ?",
+                                        (self.__formatear_fecha(nuevo.fecha_hora), anterior.id))
+                self.__modificar_historia(anterior.paciente.obtener_dni(), reordena=True)
+        except self.__error_integridad as e:
+            raise ValueError("Ya existe un turno para ese médico en esa fecha y hora") from e
+    
+    def ultimo_id_turno(self) -> int:
+        return self.__consultar_uno("SELECT MAX(COALESCE((SELECT MAX(id) FROM turnos), 0), "
+                                    "COALESCE((SELECT valor FROM contadores WHERE nombre = 'ultimo_id_turno'), 0))")[0]
+    
+    def listar_turnos_medico(self, matricula: str, desde: Optional[datetime] = None,
+                             hasta: Optional[datetime] = None) -> List[Turno]:
+        condiciones = "WHERE t.matricula = ?"
+        parametros = [matricula]
+        if desde is not None:
+            condiciones += " AND t.fecha_hora >= ?"
+            parametros.append(self.__formatear_fecha(desde))
+        if hasta is not None:
+            condiciones += " AND t.fecha_hora < ?"
+            parametros.append(self.__formatear_fecha(hasta))
+        return self.__consultar_turnos(condiciones + " ORDER BY t.fecha_hora", parametros)
+    
+    def contar_turnos_medico(self, matricula: str) -> int:
+        return self.__consultar_uno("SELECT COUNT(*) FROM turnos WHERE matricula = ?", (matricula,))[0]
+    
+    def obtener_agenda(self, matricula: str) -> Optional[AgendaMedico]:
+        medico = self.__medicos.get(matricula)
+        return AgendaSQLite(medico, self) if medico is not None else None
+    
+    # Recetas e historias clínicas
+    def guardar_receta(self, receta: Receta):
+        with self.__bloqueo, self.__conexion:
+            self.__conexion.execute(
+                "INSERT INTO recetas (dni, matricula, fecha, medicamentos) VALUES (?, ?, ?, ?)",
+                (receta.paciente.obtener_dni(), receta.medico.obtener_matricula(),
+                 self.__formatear_fecha(receta.fecha), json.dumps(list(receta.medicamentos), ensure_ascii=False))
+            )
+            self.__modificar_historia(receta.paciente.obtener_dni())
+    
+    def obtener_historia_clinica(self, dni: str) -> Optional[HistoriaClinica]:
+        paciente = self.obtener_paciente(dni)
+        if paciente is None:
+            return None
+        
+        historia = HistoriaClinica(paciente)
+        for turno in self.__consultar_turnos("WHERE t.dni = ? ORDER BY t.id", (dni,)):
+            historia.agregar_turno(turno)
+        
+        filas = self.__consultar(
+            "SELECT matricula, fecha, medicamentos FROM recetas WHERE dni = ? ORDER BY id", (dni,)
+        )
+        for matricula, fecha, medicamentos in filas:
+            historia.agregar_receta(Receta(paciente, self.__medicos[matricula], json.loads(medicamentos),
+                                           datetime.fromisoformat(fecha)))
+        with self.__bloqueo:
+            historia.asignar_version(*self.__versiones_historias.get(dni, (0, 0)))
+        return historia
+    
+    def contar_pacientes(self) -> int:
+        return self.__consultar_uno("SELECT COUNT(*) FROM pacientes")[0]
+    
+    def contar_medicos(self) -> int:
+        return len(self.__medicos)
+    
+    def contar_turnos(self) -> int:
+        return self.__consultar_uno("SELECT COUNT(*) FROM turnos")[0]
+    
+    # La base ya guarda los turnos en disco: el archivo histórico solo existe para el repositorio en memoria
+    def archivar_turnos(self, ruta: str, antes_de: datetime) -> int:
+        raise ValueError("El archivo histórico de turnos no está disponible con el repositorio SQLite")
+    
+    def cerrar(self):
+        with self.__bloqueo:
+            self.__conexion.close()
+    
+    def __modificar_historia(self, dni: str, reordena: bool = False):
+        version, generacion = self.__versiones_historias.get(dni, (0, 0))
+        self.__versiones_historias[dni] = (version + 1, generacion + 1 if reordena else generacion)
+    
+    def __consultar(self, sql: str, parametros=()) -> list:
+        with self.__bloqueo:
+            return self.__conexion.execute(sql, parametros).fetchall()
+    
+    def __consultar_uno(self, sql: str, parametros=()):
+        with self.__bloqueo:
+            return self.__conexion.execute(sql, parametros).fetchone()
+    
+    def __cargar_medicos(self):
+        for matricula, nombre in self.__consultar("SELECT matricula, nombre FROM medicos ORDER BY rowid"):
+            self.__medicos[matricula] = Medico(nombre, matricula)
+        filas = self.__consultar("SELECT matricula, tipo, dias, duracion FROM especialidades ORDER BY id")
+        for matricula, tipo, dias, duracion in filas:
+            self.__medicos[matricula].agregar_especialidad(Especialidad(tipo, dias.split("|"), duracion * self.MINUTO))
+    
+    def __consultar_turnos(self, condiciones: str, parametros) -> List[Turno]:
+        filas = self.__consultar(
+            "SELECT p.nombre, p.dni, p.fecha_nacimiento, t.matricula, t.especialidad, t.fecha_hora, t.id "
+            "FROM turnos t JOIN pacientes p ON p.dni = t.dni " + condiciones, parametros
+        )
+        return [Turno(self.__paciente_desde_fila(fila[:3]), self.__medicos[fila[3]],
+                      datetime.fromisoformat(fila[5]), fila[4], fila[6]) for fila in filas]
+    
+    def __paciente_desde_fila(self, fila) -> Paciente:
+        nombre, dni, fecha_nacimiento = fila
+        paciente = self.__pacientes.get(dni)
+        if paciente is None:
+            paciente = Paciente(nombre, dni, fecha_nacimiento)
+            self.__pacientes[dni] = paciente
+        return paciente
+    
+    @staticmethod
+    def __formatear_fecha(fecha: datetime) -> str:
+        return fecha.isoformat(sep=" ", timespec="microseconds")
@@ -0,0 +1,189 @@
+from collections.abc import Sequence
+from datetime import datetime, timedelta
+from typing import List, Optional
+import asyncio
+import json
+
+from .entidades import DURACION_TURNO, Especialidad, HistoriaClinica, Medico, Paciente, Receta, Turno
+from .nucleo import Clinica
+
+
+class ServicioClinica:
+    OPERACIONES = ("agregar_paciente", "agregar_medico", "agregar_especialidad", "agendar_turno", "agendar_serie",
+                   "cancelar_turno", "reprogramar_turno", "emitir_receta", "obtener_historia_clinica",
+                   "obtener_turnos", "obtener_pacientes", "obtener_medicos", "obtener_estadisticas",
+                   "pacientes_con_medicamento")
+    # Tipos que llegan en JSON para cada argumento conocido; los demás los rechaza la firma de la operación
+    TEXTOS = ("nombre", "dni", "fecha_nacimiento", "matricula", "tipo", "especialidad", "fecha_hora", "medicamento")
+    TEXTOS_OPCIONALES = ("desde", "hasta")
+    LISTAS_DE_TEXTOS = ("dias", "medicamentos")
+    ENTEROS = ("duracion", "repeticiones", "cada_semanas", "id_turno", "offset")
+    ENTEROS_OPCIONALES = ("limite",)
+    
+    def __init__(self, clinica: Optional[Clinica] = None, en_hilos: bool = False):
+        self.__clinica = clinica if clinica is not None else Clinica()
+        # Con un repositorio bloqueante (SQLite) las operaciones se delegan a hilos para no frenar el loop
+        self.__en_hilos = en_hilos
+        self.__bloqueos_medicos = {}
+    
+    async def agregar_paciente(self, nombre: str, dni: str, fecha_nacimiento: str) -> Paciente:
+        paciente = Paciente(nombre, dni, fecha_nacimiento)
+        await self._ejecutar(self.__clinica.agregar_paciente, paciente)
+        return paciente
+    
+    async def agregar_medico(self, nombre: str, matricula: str) -> Medico:
+        medico = Medico(nombre, matricula)
+        await self._ejecutar(self.__clinica.agregar_medico, medico)
+        return medico
+    
+    async def agregar_especialidad(self, matricula: str, tipo: str, dias: List[str],
+                                   duracion: int = DURACION_TURNO // timedelta(minutes=1)) -> Especialidad:
+        especialidad = Especialidad(tipo, dias, timedelta(minutes=duracion))
+        async with self._bloqueo_medico(matricula):
+            await self._ejecutar(self.__clinica.agregar_especialidad, matricula, especialidad)
+        return especialidad
+    
+    async def agendar_turno(self, dni: str, matricula: str, especialidad: str, fecha_hora: datetime) -> Turno:
+        async with self._bloqueo_medico(matricula):
+            return await self._ejecutar(self.__clinica.agendar_turno, dni, matricula, especialidad, fecha_hora)
+    
+    async def agendar_serie(self, dni: str, matricula: str, especialidad: str, fecha_hora: datetime,
+                            repeticiones: int, cada_semanas: int = 1) -> List[Turno]:
+        async with self._bloqueo_medico(matricula):
+            resultado = await self._ejecutar(self.__clinica.agendar_serie, dni, matricula, especialidad, fecha_hora,
+                                             repeticiones, cada_semanas)
+        if not resultado.exitoso:
+            raise ValueError("; ".join(mensaje for _, mensaje in resultado.errores))
+        return resultado.registros
+    
+    async def cancelar_turno(self, id_turno: int) -> Turno:
+        async with self._bloqueo_medico(await self._matricula_del_turno(id_turno)):
+            return await self._ejecutar(self.__clinica.cancelar_turno, id_turno)
+    
+    async def reprogramar_turno(self, id_turno: int, fecha_hora: datetime) -> Turno:
+        async with self._bloqueo_medico(await self._matricula_del_turno(id_turno)):
+            return await self._ejecutar(self.__clinica.reprogramar_turno, id_turno, fecha_hora)
+    
+    async def emitir_receta(self, dni: str, matricula: str, medicamentos: List[str]) -> Receta:
+        return await self._ejecutar(self.__clinica.emitir_receta, dni, matricula, medicamentos)
+    
+    async def obtener_historia_clinica(self, dni: str) -> Optional[HistoriaClinica]:
+        return await self._ejecutar(self.__clinica.obtener_historia_clinica, dni)
+    
+    async def obtener_turnos(self, offset: int = 0, limite: Optional[int] = None) -> Sequence:
+        return await self._ejecutar(self.__clinica.obtener_turnos, offset, limite)
+    
+    async def obtener_pacientes(self) -> List[Paciente]:
+        return await self._ejecutar(self.__clinica.obtener_pacientes)
+    
+    async def obtener_medicos(self) -> List[Medico]:
+        return await self._ejecutar(self.__clinica.obtener_medicos)
+    
+    async def obtener_estadisticas(self, desde: Optional[str] = None) -> dict:
+        estadisticas = await self._ejecutar(self.__clinica.obtener_estadisticas)
+        return estadisticas.resumen(datetime.fromisoformat(desde) if desde else None)
+    
+    async def pacientes_con_medicamento(self, medicamento: str, desde: Optional[str] = None,
+                                        hasta: Optional[str] = None) -> List[Paciente]:
+        return await self._ejecutar(self.__clinica.pacientes_con_medicamento, medicamento,
+                                    datetime.fromisoformat(desde) if desde else None,
+                                    datetime.fromisoformat(hasta) if hasta else None)
+    
+    # Protocolo JSON: una solicitud {"op": ..., "args": {...}} y una respuesta por línea
+    async def atender(self, solicitud: dict) -> dict:
+        if not isinstance(solicitud, dict):
+            return {"ok": False, "error": "La solicitud debe ser un objeto JSON"}
+        operacion = solicitud.get("op")
+        if operacion not in self.OPERACIONES:
+            return {"ok": False, "error": f"Operación desconocida: {operacion}"}
+        
+        argumentos = solicitud.get("args", {})
+        if not isinstance(argumentos, dict):
+            return {"ok": False, "error": "Los argumentos deben ser un objeto JSON"}
+        argumentos = dict(argumentos)
+        # Cualquier error de una solicitud se responde: no debe cortar un lote ni la conexión
+        try:
+            self.validar_argumentos(argumentos)
+            if "fecha_hora" in argumentos:
+                argumentos["fecha_hora"] = datetime.fromisoformat(argumentos["fecha_hora"])
+            resultado = await getattr(self, operacion)(**argumentos)
+        except Exception as e:
+            return {"ok": False, "error": str(e)}
+        return {"ok": True, "resultado": self.serializar(resultado)}
+    
+    @classmethod
+    def validar_argumentos(cls, argumentos: dict):
+        for nombre, valor in argumentos.items():
+            if valor is None and (nombre in cls.TEXTOS_OPCIONALES or nombre in cls.ENTEROS_OPCIONALES):
+                continue
+            if nombre in cls.TEXTOS or nombre in cls.TEXTOS_OPCIONALES:
+                if not isinstance(valor, str):
+                    raise ValueError(f"El argumento {nombre} debe ser texto")
+            elif nombre in cls.LISTAS_DE_TEXTOS:
+                if not isinstance(valor, list) or not all(isinstance(elemento, str) for elemento in valor):
+                    raise ValueError(f"El argumento {nombre} debe ser una lista de textos")
+            elif nombre in cls.ENTEROS or nombre in cls.ENTEROS_OPCIONALES:
+                # bool es subclase de int, pero true/false no son un número válido
+                if not isinstance(valor, int) or isinstance(valor, bool):
+                    raise ValueError(f"El argumento {nombre} debe ser un número entero")
+    
+    async def servir(self, host: str = "127.0.0.1", puerto: int = 8765):
+        return await asyncio.start_server(self._atender_conexion, host, puerto, limit=2 ** 20)
+    
+    async def _atender_conexion(self, lector, escritor):
+        try:
+            while True:
+                linea = await lector.readline()
+                if not linea:
+                    break
+                try:
+                    respuesta = await self.atender(json.loads(linea))
+                except json.JSONDecodeError as e:
+                    respuesta = {"ok": False, "error": f"JSON inválido: {e}"}
+                escritor.write(json.dumps(respuesta, ensure_ascii=False).encode("utf-8") + b"\n")
+                await escritor.drain()
+        except ConnectionError:
+            pass
+        finally:
+            escritor.close()
+    
+    async def _ejecutar(self, funcion, *argumentos):
+        if self.__en_hilos:
+            return await asyncio.to_thread(funcion, *argumentos)
+        return funcion(*argumentos)
+    
+    async def _matricula_del_turno(self, id_turno: int) -> str:
+        turno = await self._ejecutar(self.__clinica.obtener_turno, id_turno)
+        if turno is None:
+            raise ValueError(f"No existe turno con id {id_turno}")
+        return turno.medico.obtener_matricula()
+    
+    def _bloqueo_medico(self, matricula: str) -> asyncio.Lock:
+        bloqueo = self.__bloqueos_medicos.get(matricula)
+        if bloqueo is None:
+            bloqueo = self.__bloqueos_medicos[matricula] = asyncio.Lock()
+        return bloqueo
+    
+    @classmethod
+    def serializar(cls, valor):
+        if isinstance(valor, Paciente):
+            return {"nombre": valor.nombre, "dni": valor.obtener_dni(), "fecha_nacimiento": valor.fecha_nacimiento}
+        if isinstance(valor, Medico):
+            return {"nombre": valor.nombre, "matricula": valor.obtener_matricula(),
+                    "especialidades": [cls.serializar(especialidad) for especialidad in valor.especialidades]}
+        if isinstance(valor, Especialidad):
+            return {"tipo": valor.tipo, "dias": list(valor.dias), "duracion": valor.duracion // timedelta(minutes=1)}
+        if isinstance(valor, Turno):
+            return {"id": valor.id, "dni": valor.paciente.obtener_dni(), "matricula": valor.medico.obtener_matricula(),
+                    "especialidad": valor.especialidad, "fecha_hora": valor.fecha_hora.isoformat(),
+                    "duracion": valor.duracion // timedelta(minutes=1)}
+        if isinstance(valor, Receta):
+            return {"dni": valor.paciente.obtener_dni(), "matricula": valor.medico.obtener_matricula(),
+                    "fecha": valor.fecha.isoformat(), "medicamentos": list(valor.medicamentos)}
+        if isinstance(valor, HistoriaClinica):
+            return {"paciente": cls.serializar(valor.paciente),
+                    "turnos": [cls.serializar(turno) for turno in valor.turnos],
+                    "recetas": [cls.serializar(receta) for receta in valor.recetas]}
+        if isinstance(valor, Sequence) and not isinstance(valor, str):
+            return [cls.serializar(elemento) for elemento in valor]
+        return valor